@@ -0,0 +1,299 @@
+/*
+    Heap allocation tracker for memory profiling (Linux, loaded with LD_PRELOAD).
+    Build: g++ -O2 -shared -fPIC -o bin/alloc_tracker.so include/alloc_tracker.cpp -ldl
+
+    Interposes malloc / calloc / realloc / free (and with them every operator new
+    and STL container growth), charges live bytes to the call site in the solution
+    binary and, at exit, writes to the file named by $CP_ALLOC_REPORT:
+
+        peak <bytes> <allocations>
+        static <bytes>                                  .data + .bss of the executable
+        site <bytes at peak> <allocations> <bytes allocated> <offset> [<offset> ...]
+
+    Offsets are return addresses relative to the executable's load base, innermost
+    first, for addr2line. Never included by solutions: scripts/alloc_tracker.py
+    builds and loads it.
+*/
+#include <dlfcn.h>
+#include <execinfo.h>
+#include <link.h>
+#include <pthread.h>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <unordered_map>
+#include <vector>
+
+namespace
+{
+    const int MAX_FRAMES = 32;
+    const int SITE_FRAMES = 6; // solution frames kept per site, enough to get past inlined STL code
+
+    void *(*realMalloc)(size_t);
+    void *(*realCalloc)(size_t, size_t);
+    void *(*realRealloc)(void *, size_t);
+    void (*realFree)(void *);
+    int (*realPosixMemalign)(void **, size_t, size_t);
+    void *(*realAlignedAlloc)(size_t, size_t);
+
+    /* dlsym itself may calloc before the real allocator is known */
+    alignas(16) char bootstrap[1 << 16];
+    size_t bootstrapUsed;
+    bool resolving;
+
+    /* Set while the tracker runs, so its own allocations go straight to libc */
+    __thread bool inside __attribute__((tls_model("initial-exec")));
+
+    struct Site
+    {
+        uintptr_t frames[SITE_FRAMES];
+        int depth;
+        size_t live, atPeak, count, total;
+    };
+
+    struct Tracker
+    {
+        pthread_mutex_t lock = PTHREAD_MUTEX_INITIALIZER;
+        bool ready = false;
+        uintptr_t base = 0, codeStart = 0, codeEnd = 0;
+        size_t staticBytes = 0;
+        std::unordered_map<uint64_t, size_t> siteIndex;
+        std::vector<Site> sites;
+        std::unordered_map<void *, std::pair<size_t, size_t>> live; // pointer -> (size, site)
+        size_t liveBytes = 0, peak = 0, snapshotPeak = 0, allocations = 0;
+    };
+    Tracker *tracker;
+
+    void *bootstrapAlloc(size_t n)
+    {
+        n = (n + 15) & ~size_t(15);
+        if (bootstrapUsed + n > sizeof bootstrap)
+            return nullptr;
+        void *p = bootstrap + bootstrapUsed;
+        bootstrapUsed += n;
+        return p;
+    }
+
+    bool fromBootstrap(void *p) { return p >= (void *)bootstrap && p < (void *)(bootstrap + sizeof bootstrap); }
+
+    void resolve()
+    {
+        if (realMalloc || resolving)
+            return;
+        resolving = true;
+        realCalloc = (void *(*)(size_t, size_t))dlsym(RTLD_NEXT, "calloc");
+        realRealloc = (void *(*)(void *, size_t))dlsym(RTLD_NEXT, "realloc");
+        realFree = (void (*)(void *))dlsym(RTLD_NEXT, "free");
+        realPosixMemalign = (int (*)(void **, size_t, size_t))dlsym(RTLD_NEXT, "posix_memalign");
+        realAlignedAlloc = (void *(*)(size_t, size_t))dlsym(RTLD_NEXT, "aligned_alloc");
+        realMalloc = (void *(*)(size_t))dlsym(RTLD_NEXT, "malloc");
+        resolving = false;
+    }
+
+    int findExecutable(dl_phdr_info *info, size_t, void *)
+    {
+        /* The first object reported is the executable */
+        tracker->base = info->dlpi_addr;
+        for (int i = 0; i < info->dlpi_phnum; i++)
+        {
+            const ElfW(Phdr) &segment = info->dlpi_phdr[i];
+            if (segment.p_type != PT_LOAD)
+                continue;
+            uintptr_t start = info->dlpi_addr + segment.p_vaddr;
+            if (segment.p_flags & PF_X)
+            {
+                if (!tracker->codeStart || start < tracker->codeStart)
+                    tracker->codeStart = start;
+                if (start + segment.p_memsz > tracker->codeEnd)
+                    tracker->codeEnd = start + segment.p_memsz;
+            }
+            else if (segment.p_flags & PF_W)
+                tracker->staticBytes += segment.p_memsz;
+        }
+        return 1;
+    }
+
+    /* Charge-at-peak snapshot: taken when the heap first drops from a new high */
+    void snapshot()
+    {
+        for (Site &site : tracker->sites)
+            site.atPeak = site.live;
+        tracker->snapshotPeak = tracker->peak;
+    }
+
+    size_t siteOf()
+    {
+        void *frames[MAX_FRAMES];
+        int n = backtrace(frames, MAX_FRAMES);
+        Site site{};
+        uint64_t hash = 1469598103934665603ull;
+        for (int i = 0; i < n && site.depth < SITE_FRAMES; i++)
+        {
+            uintptr_t address = (uintptr_t)frames[i];
+            if (address < tracker->codeStart || address >= tracker->codeEnd)
+                continue;
+            site.frames[site.depth++] = address - tracker->base;
+            hash = (hash ^ address) * 1099511628211ull;
+        }
+        auto found = tracker->siteIndex.find(hash);
+        if (found != tracker->siteIndex.end())
+            return found->second;
+        tracker->sites.push_back(site);
+        tracker->siteIndex[hash] = tracker->sites.size() - 1;
+        return tracker->sites.size() - 1;
+    }
+
+    void recordAlloc(void *p, size_t size)
+    {
+        if (!p || inside || !tracker)
+            return;
+        inside = true;
+        pthread_mutex_lock(&tracker->lock);
+        if (!tracker->ready)
+        {
+            dl_iterate_phdr(findExecutable, nullptr);
+            tracker->ready = true;
+        }
+        size_t index = siteOf();
+        Site &site = tracker->sites[index];
+        site.live += size;
+        site.count++;
+        site.total += size;
+        tracker->live[p] = {size, index};
+        tracker->allocations++;
+        tracker->liveBytes += size;
+        if (tracker->liveBytes > tracker->peak)
+            tracker->peak = tracker->liveBytes;
+        pthread_mutex_unlock(&tracker->lock);
+        inside = false;
+    }
+
+    void recordFree(void *p)
+    {
+        if (!p || inside || !tracker)
+            return;
+        inside = true;
+        pthread_mutex_lock(&tracker->lock);
+        auto found = tracker->live.find(p);
+        if (found != tracker->live.end())
+        {
+            /* Leaving a high that is 1% above the last snapshot: that is the new peak's breakdown */
+            if (tracker->liveBytes == tracker->peak && tracker->peak > tracker->snapshotPeak + tracker->snapshotPeak / 100)
+                snapshot();
+            tracker->sites[found->second.second].live -= found->second.first;
+            tracker->liveBytes -= found->second.first;
+            tracker->live.erase(found);
+        }
+        pthread_mutex_unlock(&tracker->lock);
+        inside = false;
+    }
+
+    __attribute__((constructor)) void start()
+    {
+        resolve();
+        inside = true;
+        tracker = new Tracker();
+        inside = false;
+    }
+
+    __attribute__((destructor)) void finish()
+    {
+        const char *path = getenv("CP_ALLOC_REPORT");
+        if (!tracker || !path)
+            return;
+        inside = true;
+        pthread_mutex_lock(&tracker->lock);
+        if (tracker->liveBytes == tracker->peak && tracker->peak > tracker->snapshotPeak)
+            snapshot();
+        if (FILE *out = fopen(path, "w"))
+        {
+            fprintf(out, "peak %zu %zu\nstatic %zu\n", tracker->peak, tracker->allocations, tracker->staticBytes);
+            for (const Site &site : tracker->sites)
+            {
+                fprintf(out, "site %zu %zu %zu", site.atPeak, site.count, site.total);
+                for (int i = 0; i < site.depth; i++)
+                    fprintf(out, " %zx", (size_t)site.frames[i]);
+                fputc('\n', out);
+            }
+            fclose(out);
+        }
+        pthread_mutex_unlock(&tracker->lock);
+    }
+}
+
+extern "C"
+{
+    void *malloc(size_t size)
+    {
+        if (!realMalloc)
+        {
+            resolve();
+            if (!realMalloc)
+                return bootstrapAlloc(size);
+        }
+        void *p = realMalloc(size);
+        recordAlloc(p, size);
+        return p;
+    }
+
+    void *calloc(size_t count, size_t size)
+    {
+        if (!realCalloc)
+        {
+            resolve();
+            if (!realCalloc)
+                return bootstrapAlloc(count * size); /* static storage, already zeroed */
+        }
+        void *p = realCalloc(count, size);
+        recordAlloc(p, count * size);
+        return p;
+    }
+
+    void *realloc(void *old, size_t size)
+    {
+        if (fromBootstrap(old))
+        {
+            void *p = malloc(size);
+            size_t available = bootstrap + sizeof bootstrap - (char *)old;
+            if (p)
+                memcpy(p, old, size < available ? size : available);
+            return p;
+        }
+        if (!realRealloc)
+            resolve();
+        recordFree(old);
+        void *p = realRealloc(old, size);
+        recordAlloc(p, size);
+        return p;
+    }
+
+    void free(void *p)
+    {
+        if (!p || fromBootstrap(p))
+            return;
+        if (!realFree)
+            resolve();
+        recordFree(p);
+        realFree(p);
+    }
+
+    int posix_memalign(void **out, size_t alignment, size_t size)
+    {
+        if (!realPosixMemalign)
+            resolve();
+        int error = realPosixMemalign(out, alignment, size);
+        if (!error)
+            recordAlloc(*out, size);
+        return error;
+    }
+
+    void *aligned_alloc(size_t alignment, size_t size)
+    {
+        if (!realAlignedAlloc)
+            resolve();
+        void *p = realAlignedAlloc(alignment, size);
+        recordAlloc(p, size);
+        return p;
+    }
+}
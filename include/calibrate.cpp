@@ -0,0 +1,54 @@
+/*
+    Calibration benchmark for machine fingerprints (scripts/fingerprint.py).
+    A fixed, single-threaded mix of what CP solutions spend time on: modular
+    arithmetic, cache-missing memory reads and sorting. Prints its own run time
+    in milliseconds, so it also works in a judge's custom invocation (standard
+    C++ only, ~70 MB): paste it there and record the result with
+
+        python scripts/fingerprint.py --set-reference=<ms> --name=<judge>
+
+    Never included by solutions.
+*/
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <vector>
+
+int main()
+{
+    auto start = std::chrono::steady_clock::now();
+    uint64_t state = 88172645463325252ull;
+    auto next = [&]
+    {
+        state ^= state << 13;
+        state ^= state >> 7;
+        state ^= state << 17;
+        return state;
+    };
+
+    // Arithmetic: a dependent chain of 64-bit multiplications and modulo
+    uint64_t acc = 1;
+    for (uint64_t i = 0; i < 5000000; i++)
+        acc = (acc * 6364136223846793005ull + i) % 1000000007ull;
+
+    // Memory: dependent random reads over a 64 MB table
+    const uint32_t mask = (1u << 24) - 1;
+    std::vector<uint32_t> table(mask + 1);
+    for (uint32_t &value : table)
+        value = (uint32_t)next();
+    uint32_t position = 0;
+    for (uint32_t i = 0; i < 1000000; i++)
+        position = table[(position ^ i) & mask];
+
+    // Sorting: a million random integers
+    std::vector<uint32_t> values(1000000);
+    for (uint32_t &value : values)
+        value = (uint32_t)next();
+    std::sort(values.begin(), values.end());
+
+    double elapsed = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+    // The checksum keeps the optimizer from dropping any of the work
+    printf("%.1f ms (checksum %llu)\n", elapsed, (unsigned long long)(acc ^ position ^ values[values.size() / 2]));
+    return 0;
+}
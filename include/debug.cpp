@@ -6,7 +6,12 @@
 namespace __DEBUG_UTIL__
 {
     using namespace std;
+#ifdef DEBUG_RECORDS
+    /* Structured mode: debug() and TIME_BLOCK write one-line "@@cp ..." records for the test runner */
+    inline bool I_want_colored_output = false;
+#else
     inline bool I_want_colored_output = true; /* ONLY WORKS WITH TERMINAL */
+#endif
     inline string white = I_want_colored_output ? "\033[0;m" : "";
     inline string outer = I_want_colored_output ? "\033[0;31m" : "";    // red
     inline string varName = I_want_colored_output ? "\033[1;34m" : "";  // blue
@@ -25,6 +30,12 @@ namespace __DEBUG_UTIL__
 #ifdef LOCAL
             auto end = chrono::high_resolution_clock::now();
             chrono::duration<long double> elapsed = (end - start);
+#ifdef DEBUG_RECORDS
+            /* @@cp time <seconds> <limit> <label>, written at once so records never interleave */
+            ostringstream record;
+            record << "@@cp time " << setprecision(9) << elapsed.count() << ' ' << timeLimit << ' ' << name << '\n';
+            cerr << record.str();
+#else
             cerr << outer << "[TIMER] " << varName << name << outer
                  << " took: " << varValue << fixed << elapsed.count()
                  << " s" << white;
@@ -33,6 +44,7 @@ namespace __DEBUG_UTIL__
                 cerr << " \033[1;31m[WARNING: Exceeded TL of " << timeLimit << " s!]\033[0;m";
 
             cerr << "\n";
+#endif
 #endif
         }
     };
@@ -246,7 +258,10 @@ namespace __DEBUG_UTIL__
                  << white;
     }
 }
-#ifdef LOCAL
+#if defined(LOCAL) && defined(DEBUG_RECORDS)
+#define debug(...) std::cerr << "@@cp debug " << __LINE__ << " [", __DEBUG_UTIL__::printer(#__VA_ARGS__, __VA_ARGS__)
+#define debugArr(...) std::cerr << "@@cp debug " << __LINE__ << " [", __DEBUG_UTIL__::printerArr(#__VA_ARGS__, __VA_ARGS__)
+#elif defined(LOCAL)
 #define debug(...) std::cerr << __DEBUG_UTIL__::outer << __LINE__ << ": [", __DEBUG_UTIL__::printer(#__VA_ARGS__, __VA_ARGS__)
 #define debugArr(...) std::cerr << __DEBUG_UTIL__::outer << __LINE__ << ": [", __DEBUG_UTIL__::printerArr(#__VA_ARGS__, __VA_ARGS__)
 #else
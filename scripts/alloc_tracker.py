@@ -0,0 +1,161 @@
+"""
+Heap allocation tracking for memory-limit investigations (Linux).
+Runs a solution with include/alloc_tracker.cpp preloaded (LD_PRELOAD), which
+charges live heap bytes to call sites and reports the breakdown at the heap's
+peak. Sites are symbolized with addr2line and folded onto the first line of the
+solution's own source, so vector growth in solve() shows up as `C.cpp:42 solve`
+rather than as std::allocator internals. Static arrays (.data + .bss) are
+counted separately from the heap.
+"""
+import os
+import re
+import sys
+import shutil
+import tempfile
+import subprocess
+
+import build
+import profiler
+
+TRACKER_SRC = os.path.join("include", "alloc_tracker.cpp")
+TRACKER_TARGET = "alloc_tracker.so"
+TRACKER_FLAGS = ["-O2", "-shared", "-fPIC"]
+# Call sites need debug info for file:line and frame pointers for cheap, reliable backtraces
+SOLUTION_FLAGS = ["-g", "-fno-omit-frame-pointer"]
+TOP_SITES = 8
+
+_SYSTEM_PATHS = ("/usr/", "??")
+# addr2line -p appends " (discriminator N)" to locations inside one line's basic blocks
+_DISCRIMINATOR = re.compile(r"\s+\(discriminator \d+\)$")
+_CONTAINER = re.compile(r"^std::(?:__cxx11::)?(\w+)<…>::(~?\w+|operator\S+)")
+
+
+def supported():
+    """Preloading a malloc interposer needs glibc's dynamic loader; symbolizing needs addr2line."""
+    return sys.platform.startswith("linux") and shutil.which("addr2line") is not None
+
+
+def buildTracker():
+    """Compile the preload library into bin/ when stale. Returns (path or None, compiler output)."""
+    library = os.path.join("bin", TRACKER_TARGET)
+    if build.isUpToDate(TRACKER_SRC, library, TRACKER_FLAGS):
+        return os.path.abspath(library), ""
+    os.makedirs("bin", exist_ok=True)
+    result = subprocess.run(
+        [build.CXX, *TRACKER_FLAGS, "-o", library, TRACKER_SRC, "-ldl"],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    if result.returncode != 0:
+        return None, (result.stdout or "") + (result.stderr or "")
+    build.markBuilt(library, TRACKER_FLAGS)
+    return os.path.abspath(library), ""
+
+
+def symbolize(executable, offsets):
+    """{offset: [(function, file, line), ...]} innermost inlined frame first, for return-address offsets."""
+    if not offsets:
+        return {}
+    offsets = sorted(offsets)
+    # A return address points after the call; step back into the call instruction
+    result = subprocess.run(
+        ["addr2line", "-a", "-f", "-C", "-i", "-p", "-e", executable, *(hex(o - 1) for o in offsets)],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    symbols = {}
+    chain = None
+    for line in result.stdout.splitlines():
+        if line.startswith(" (inlined by) "):
+            text = line[len(" (inlined by) "):]
+        else:
+            address, _, text = line.partition(": ")
+            try:
+                chain = symbols.setdefault(int(address, 16) + 1, [])
+            except ValueError:
+                continue
+        if chain is None:
+            continue
+        function, _, location = text.rpartition(" at ")
+        path, _, number = _DISCRIMINATOR.sub("", location).rpartition(":")
+        chain.append((function or text, path, number))
+    return symbols
+
+
+def _displayPath(path):
+    try:
+        relative = os.path.relpath(path)
+    except ValueError:
+        return os.path.basename(path)
+    return os.path.basename(path) if relative.startswith("..") else relative
+
+
+def attribute(frames, symbols):
+    """
+    (where, kind) for one allocation site: the first solution source line on its
+    stack, and the outermost standard-library call below it (e.g. std::vector::push_back).
+    """
+    library = None
+    for offset in frames:
+        for function, path, number in symbols.get(offset, []):
+            if path and not path.startswith(_SYSTEM_PATHS):
+                name = profiler.shortName(function).split("(", 1)[0]
+                return f"{_displayPath(path)}:{number} {name}", library or "new / malloc"
+            container = _CONTAINER.match(profiler.shortName(function))
+            if container:
+                library = f"std::{container.group(1)}::{container.group(2)}"
+    return "runtime", library or "libstdc++ / libc"
+
+
+class AllocProbe:
+    """One run's allocation report: pass env() to the process, then read summary() after it exits."""
+
+    def __init__(self, library):
+        self.library = library
+        fd, self.reportPath = tempfile.mkstemp(prefix="cp-alloc-", suffix=".txt")
+        os.close(fd)
+
+    def env(self):
+        preload = os.environ.get("LD_PRELOAD")
+        return {
+            "LD_PRELOAD": f"{self.library}:{preload}" if preload else self.library,
+            "CP_ALLOC_REPORT": self.reportPath,
+        }
+
+    def discard(self):
+        try:
+            os.remove(self.reportPath)
+        except OSError:
+            pass
+
+    def summary(self, executable):
+        """details["alloc"]: heap peak, static bytes and the top call sites at the peak, or None."""
+        try:
+            with open(self.reportPath, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        finally:
+            self.discard()
+        if not lines:
+            return None  # killed before exit (TLE) or crashed: the tracker never wrote its report
+
+        peak = allocations = static = 0
+        sites = []
+        for line in lines:
+            parts = line.split()
+            if parts[0] == "peak":
+                peak, allocations = int(parts[1]), int(parts[2])
+            elif parts[0] == "static":
+                static = int(parts[1])
+            elif parts[0] == "site":
+                sites.append((int(parts[1]), int(parts[2]), int(parts[3]), [int(o, 16) for o in parts[4:]]))
+
+        symbols = symbolize(executable, {offset for *_, frames in sites for offset in frames})
+        grouped = {}
+        for atPeak, count, total, frames in sites:
+            where, kind = attribute(frames, symbols)
+            site = grouped.setdefault((where, kind), {"where": where, "kind": kind, "bytes": 0, "count": 0, "total": 0})
+            site["bytes"] += atPeak
+            site["count"] += count
+            site["total"] += total
+        top = sorted(grouped.values(), key=lambda s: (s["bytes"], s["total"]), reverse=True)[:TOP_SITES]
+        return {"peak": peak, "static": static, "allocations": allocations, "sites": top}
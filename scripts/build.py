@@ -0,0 +1,220 @@
+"""
+Direct compiler invocation mirroring the Makefile's `all` and `debug` targets.
+Used by long-lived processes (the interactive shell) so a compile costs one g++
+process instead of make plus the Python interpreters behind its colored prints.
+"""
+import os
+import hashlib
+import threading
+import subprocess
+
+import diagnostics
+
+CXX = os.environ.get("CXX", "g++")
+CXXFLAGS = ["-std=c++2b", "-O3", "-DLOCAL", "-Iinclude"]
+
+if os.name == "nt":
+    # MSYS2/ucrt64 does not ship libasan/libubsan - sanitizers skipped on Windows
+    DEBUG_FLAGS = ["-std=c++2b", "-g", "-O0", "-Wall", "-Wextra", "-DDEBUG", "-DLOCAL", "-Iinclude",
+                   "-fno-omit-frame-pointer"]
+else:
+    DEBUG_FLAGS = ["-std=c++2b", "-g", "-O0", "-Wall", "-Wextra", "-DDEBUG", "-DLOCAL", "-Iinclude",
+                   "-fsanitize=address,undefined", "-fno-omit-frame-pointer"]
+
+
+# Solutions built with this define talk over stdin/stdout only (the template skips its freopen)
+PIPE_DEFINE = "-DJUDGE_PIPE"
+# debug.cpp writes debug() / TIME_BLOCK output as records the runner aggregates (see debug_records)
+RECORDS_DEFINE = "-DDEBUG_RECORDS"
+
+
+def honorsPipe(src):
+    """A source can be built for pipe mode if it guards its freopen with JUDGE_PIPE (or has none)."""
+    try:
+        with open(src, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return False
+    return "JUDGE_PIPE" in text or "freopen" not in text
+
+
+def flagsFor(src, debug=False, extraFlags=(), baseFlags=None):
+    """baseFlags (e.g. a build_matrix profile) replace the release / debug flags."""
+    flags = [*(baseFlags if baseFlags is not None else DEBUG_FLAGS if debug else CXXFLAGS), *extraFlags]
+    return [*flags, PIPE_DEFINE] if honorsPipe(src) else flags
+
+
+# Precompiled <bits/stdc++.h>, one per flag set: bin/pch/<key>/bits/stdc++.h(.gch)
+PCH_DIR = os.path.join("bin", "pch")
+PCH_HEADER = os.path.join("bits", "stdc++.h")
+# The wrapper sits first on the include path: g++ takes the .gch for the first
+# #include and falls through to the real header for later ones (or if the .gch is stale)
+_PCH_WRAPPER = "#include_next <bits/stdc++.h>\n"
+_locks = {}  # path -> lock, so concurrent jobs never build the same file twice at once
+_locksGuard = threading.Lock()
+
+
+def _lockFor(path):
+    with _locksGuard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def pchDir(flags):
+    # These defines are not seen by any standard header, so builds that differ only in them share a PCH
+    key = " ".join([CXX, *(f for f in flags if f not in (PIPE_DEFINE, RECORDS_DEFINE))])
+    return os.path.join(PCH_DIR, hashlib.sha256(key.encode()).hexdigest()[:12])
+
+
+def hasPch(flags):
+    return os.path.exists(os.path.join(pchDir(flags), PCH_HEADER + ".gch"))
+
+
+def warmPch(flags):
+    """
+    Precompile <bits/stdc++.h> for these flags so later compiles skip parsing it.
+    Takes several seconds the first time; returns True when a PCH is ready.
+    """
+    directory = pchDir(flags)
+    with _lockFor(directory):
+        if hasPch(flags):
+            return True
+        header = os.path.join(directory, PCH_HEADER)
+        os.makedirs(os.path.dirname(header), exist_ok=True)
+        with open(header, "w", encoding="utf-8") as f:
+            f.write(_PCH_WRAPPER)
+        tmpPath = f"{header}.{os.getpid()}.gch.tmp"
+        try:
+            result = subprocess.run([CXX, *flags, "-x", "c++-header", header, "-o", tmpPath], capture_output=True)
+            if result.returncode != 0:
+                return False
+            os.replace(tmpPath, header + ".gch")
+        except OSError:
+            return False
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+        return True
+
+
+def exePath(target):
+    """bin/<target>, with .exe on Windows (g++ appends it there automatically)."""
+    path = os.path.join("bin", target)
+    if os.name == "nt" and not path.endswith(".exe"):
+        path += ".exe"
+    return path
+
+
+def _stampPath(exe):
+    return os.path.join(os.path.dirname(exe), f".{os.path.basename(exe)}.flags")
+
+
+def _binaryId(exe):
+    """mtime and size of the binary: a stamp only describes the exact file it was written for."""
+    info = os.stat(exe)
+    return f"{info.st_mtime_ns} {info.st_size}"
+
+
+def _stampedFlags(exe):
+    """Flags from the stamp as written, or None when there is none or the binary changed since."""
+    try:
+        with open(_stampPath(exe), "r", encoding="utf-8") as f:
+            flags, _, binaryId = f.read().partition("\n")
+        # make (or anything else) may have rebuilt the binary without touching the stamp
+        return flags if binaryId.strip() == _binaryId(exe) else None
+    except OSError:
+        return None
+
+
+def isUpToDate(src, exe, flags):
+    """Make-style freshness check, plus a flag stamp so a debug build is never reused as release."""
+    try:
+        if os.path.getmtime(exe) < os.path.getmtime(src):
+            return False
+    except OSError:
+        return False
+    return _stampedFlags(exe) == " ".join(flags)
+
+
+def builtFlags(exe):
+    """The flags a binary was built with (from its stamp), or None if it was built elsewhere."""
+    flags = _stampedFlags(exe)
+    return flags.split() if flags is not None else None
+
+
+def isPipeBuild(exe):
+    """True if the binary was built with PIPE_DEFINE, i.e. it needs no input.txt/Output.txt."""
+    return PIPE_DEFINE in (builtFlags(exe) or [])
+
+
+def markBuilt(exe, flags):
+    """Record the flags a binary was built with, tied to the binary as it is now (see isUpToDate)."""
+    try:
+        with open(_stampPath(exe), "w", encoding="utf-8") as f:
+            f.write(" ".join(flags) + "\n" + _binaryId(exe))
+    except OSError:
+        pass
+
+
+class CompileResult:
+    """Outcome of a compile: parsed diagnostics plus any non-diagnostic compiler output."""
+
+    def __init__(self, success, diagnostics=None, output="", cached=False):
+        self.success = success
+        self.diagnostics = diagnostics or []
+        self.output = output
+        self.cached = cached
+
+
+def compileSource(src, target, debug=False, force=False, extraFlags=(), baseFlags=None):
+    """
+    Compile src into bin/<target>.
+    Skips the compiler when the binary is fresh, and replays cached diagnostics
+    when the exact same source already failed to compile. Uses the precompiled
+    header for these flags when warmPch has built one. extraFlags (e.g. RECORDS_DEFINE)
+    go after the release or debug flags, or after baseFlags when given.
+    """
+    # A background pre-build and a foreground compile of the same target take turns
+    with _lockFor(exePath(target)):
+        return _compileSource(src, target, debug, force, extraFlags, baseFlags)
+
+
+def _compileSource(src, target, debug, force, extraFlags, baseFlags):
+    flags = flagsFor(src, debug, extraFlags, baseFlags)
+    exe = exePath(target)
+    if not os.path.exists(src):
+        return CompileResult(False, output=f"Source file not found: {src}")
+
+    key = diagnostics.sourceKey(src, flags, CXX)
+    cached = diagnostics.lookup(key)
+    if not force:
+        if isUpToDate(src, exe, flags):
+            return CompileResult(True, cached["diagnostics"] if cached else [], cached=True)
+        if cached and not cached["success"]:
+            return CompileResult(False, cached["diagnostics"], cached["output"], cached=True)
+
+    useJson = diagnostics.supportsJson(CXX)
+    pchFlags = ["-I", pchDir(flags)] if hasPch(flags) else []
+    os.makedirs("bin", exist_ok=True)
+    try:
+        result = subprocess.run(
+            [CXX, *flags, *pchFlags, *([diagnostics.JSON_FLAG] if useJson else []), "-o", os.path.join("bin", target), src],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+    except FileNotFoundError:
+        return CompileResult(False, output=f"{CXX} not found! Install build tools.")
+
+    output = (result.stdout or "") + (result.stderr or "")
+    if useJson:
+        diags, output = diagnostics.parseDiagnostics(output, src)
+    else:
+        diags = []
+    success = result.returncode == 0
+    diagnostics.store(key, success, diags, output)
+    if not success:
+        return CompileResult(False, diags, output)
+
+    markBuilt(exe, flags)
+    return CompileResult(True, diags, output)
@@ -0,0 +1,152 @@
+"""
+Build-profile matrix testing.
+Judges do not build with the Makefile's flags, and some bugs only show up under
+another profile: -O2 instead of -O3, libstdc++ debug mode (_GLIBCXX_DEBUG checks
+every container access), or a 32-bit long. Named profiles live in
+build_matrix.json; the solution is built under all of them in parallel, the
+suite runs once per profile, and verdicts and times are shown side by side.
+"""
+import os
+import re
+import sys
+import json
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+
+import build
+import run_tests
+import tui
+from utils import RED, RESET
+
+PROFILES_PATH = "build_matrix.json"
+
+
+def loadProfiles():
+    """{name: [flags]} in the config's order. Raises ValueError when the config is missing or malformed."""
+    try:
+        with open(PROFILES_PATH, "r", encoding="utf-8") as f:
+            profiles = json.load(f)["profiles"]
+        return {name: shlex.split(flags) if isinstance(flags, str) else list(flags) for name, flags in profiles.items()}
+    except OSError as e:
+        raise ValueError(f"{PROFILES_PATH} not found") from e
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"{PROFILES_PATH} should hold {{\"profiles\": {{name: flags}}}}: {e}") from e
+
+
+def targetFor(target, profile):
+    """bin/ name of one profile's build, e.g. C@O2."""
+    return f"{target}@{re.sub(r'[^A-Za-z0-9_.-]', '_', profile)}"
+
+
+def buildAll(src, target, profiles, executor=None):
+    """Compile src under every profile at once. Returns {name: CompileResult} in profile order."""
+    ownExecutor = None
+    if executor is None:
+        executor = ownExecutor = ThreadPoolExecutor(max_workers=max(1, len(profiles)), thread_name_prefix="matrix")
+    try:
+        futures = {name: executor.submit(build.compileSource, src, targetFor(target, name), baseFlags=flags)
+                   for name, flags in profiles.items()}
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        if ownExecutor is not None:
+            ownExecutor.shutdown(wait=True)
+
+
+def failureNote(reporter):
+    """`test: verdict - first diagnostic line` for the first failing test of a run, or None."""
+    for success, testCase, _, _, message, _ in reporter.results:
+        if success:
+            continue
+        details = reporter.details.get(testCase, {})
+        # Debug-mode and sanitizer aborts explain themselves on stderr
+        lines = [line.strip() for line in details.get("stderr", "").splitlines() if line.strip()]
+        reason = next((line for line in lines if "error" in line.lower()), details.get("error"))
+        return f"{testCase}: {message}" + (f" - {reason}" if reason and reason != message else "")
+    return None
+
+
+def _buildError(flags, result):
+    errors = [f"{os.path.basename(d['file'])}:{d['line']}: {d['message']}" if d["file"] else d["message"]
+              for d in result.diagnostics if d["kind"] in ("error", "fatal error")]
+    lines = errors + [line for line in result.output.strip().splitlines() if line.strip()]
+    if "-m32" in flags and any("cannot find" in line or "bits/" in line for line in lines):
+        return "no 32-bit toolchain (install g++-multilib)"
+    return next((line for line in lines if "error" in line), lines[0] if lines else "compile failed")
+
+
+def runMatrix(src, problem, names=None, reporter=None, executor=None, fresh=False, repeat=1):
+    """
+    Build src under each profile (all, or the given names, in any case) and run the problem's
+    suite once per profile. Prints the side-by-side table; returns True when
+    every profile built and passed every test.
+    """
+    reporter = reporter or tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+    try:
+        profiles = loadProfiles()
+    except ValueError as e:
+        reporter.printError(str(e))
+        return False
+    if names:
+        byName = {name.lower(): name for name in profiles}
+        unknown = [name for name in names if name.lower() not in byName]
+        if unknown:
+            reporter.printError(f"Unknown profile(s) {', '.join(unknown)}; {PROFILES_PATH} has {', '.join(profiles)}")
+            return False
+        profiles = {byName[name.lower()]: profiles[byName[name.lower()]] for name in names}
+
+    target = os.path.splitext(os.path.basename(src))[0]
+    with reporter.console.status(f"[#666666]Compiling {src} under {len(profiles)} profiles...[/]"):
+        builds = buildAll(src, target, profiles, executor)
+
+    runs = {}
+    notes = []
+    allPassed = True
+    quiet = tui.QuietReporter(hasPsutil=run_tests._hasPsutil)
+    for name, result in builds.items():
+        if not result.success:
+            runs[name] = []
+            notes.append(f"{name}: build failed - {_buildError(profiles[name], result)}")
+            allPassed = False
+            continue
+        with reporter.console.status(f"[#666666]Running {problem} tests under {name}...[/]"):
+            # Matrix runs are experiments: they stay out of the run history the default build schedules from
+            passed = run_tests.runTestsForProblem(problem, build.exePath(targetFor(target, name)), reporter=quiet,
+                                                  fresh=fresh, repeat=repeat, recordHistory=False)
+        runs[name] = list(quiet.results)
+        if not quiet.results:
+            notes.append(f"{name}: no tests ran")
+        elif not passed:
+            notes.append(f"{name}: {failureNote(quiet)}")
+        allPassed = allPassed and passed and bool(quiet.results)
+
+    reporter.console.print(tui.buildMatrixTable(runs))
+    for name in runs:
+        reporter.printInfo(f"{name}: {' '.join(profiles[name])}")
+    for note in notes:
+        reporter.printWarning(note)
+    if allPassed:
+        reporter.console.print(f"[bold #0a0a0a on #00ff41] ✔ All tests pass under all {len(runs)} profiles [/]")
+    return allPassed
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    if len(args) != 2:
+        print("Usage: python build_matrix.py <file.cpp> <PROBLEM> [--profiles=a,b] [--fresh] [--repeat=N]")
+        print("Example: python build_matrix.py src/C.cpp C --profiles=O2,glibcxx-debug")
+        print(f"Profiles are defined in {PROFILES_PATH}.")
+        sys.exit(1)
+
+    src, problem = args
+    if not os.path.exists(src):
+        print(f"{RED}ERROR{RESET}: {src} not found")
+        sys.exit(1)
+    names = next((f.split("=", 1)[1].split(",") for f in flags if f.startswith("--profiles=")), None)
+    repeat = next((int(f.split("=", 1)[1]) for f in flags if f.startswith("--repeat=")), 1)
+    passed = runMatrix(src, problem.upper(), names, fresh="--fresh" in flags, repeat=max(1, repeat))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compile-time and binary-size profiling for solution builds.
+Runs g++ with -ftime-report, measures the marginal cost of every #include of the
+solution, and keeps a per-solution history so build trends are visible.
+"""
+import os
+import re
+import json
+import time
+import subprocess
+
+import build
+from utils import CACHE_DIR
+
+PROFILE_DIR = os.path.join(CACHE_DIR, "build_profiles")
+_INCLUDE = re.compile(r'^\s*#\s*include\s*([<"][^>"]+[>"])')
+_TIME_ROW = re.compile(r"^\s*(\|?[^:]+?)\s*:\s*([\d.]+)\s*\(\s*\d+%\)\s*([\d.]+)\s*\(\s*\d+%\)\s*([\d.]+)\s*\(")
+_TOP_ITEMS = 8
+
+
+def parseTimeReport(stderr):
+    """
+    Parse g++ -ftime-report into (phases, items): {name: wallSeconds}.
+    'phase ...' rows are the coarse breakdown, the rest are the fine-grained
+    time variables (template instantiation, parser, optimizer passes, ...).
+    """
+    phases, items = {}, {}
+    for line in stderr.splitlines():
+        m = _TIME_ROW.match(line)
+        if not m:
+            continue
+        name, wall = m.group(1).strip(), float(m.group(4))
+        if name.startswith("phase "):
+            phases[name[len("phase "):]] = wall
+        elif not name.startswith("|"):
+            items[name] = wall
+    return phases, items
+
+
+def _timedSyntaxCheck(flags, source, cwd=None):
+    start = time.perf_counter()
+    subprocess.run(
+        [build.CXX, *flags, "-fsyntax-only", "-x", "c++", "-"],
+        input=source, capture_output=True, text=True, cwd=cwd,
+    )
+    return time.perf_counter() - start
+
+
+def headerCosts(src, flags):
+    """
+    Marginal parse cost of each #include of src, in include order.
+    Header i is charged the time of parsing includes [0..i] minus [0..i-1],
+    so a header that only re-includes something already pulled in costs ~0.
+    """
+    with open(src, "r", encoding="utf-8", errors="replace") as f:
+        includes = [m.group(1) for m in map(_INCLUDE.match, f) if m]
+
+    # Quoted includes resolve relative to the solution's directory
+    srcDir = os.path.dirname(os.path.abspath(src))
+    flags = [*flags, f"-I{srcDir}"]
+
+    costs = []
+    baseline = _timedSyntaxCheck(flags, "")
+    previous = baseline
+    for i, header in enumerate(includes):
+        tu = "".join(f"#include {h}\n" for h in includes[:i + 1])
+        cumulative = _timedSyntaxCheck(flags, tu)
+        costs.append((header, max(0.0, cumulative - previous)))
+        previous = max(previous, cumulative)
+    return costs
+
+
+def _historyPath(src):
+    name = os.path.splitext(os.path.basename(src))[0]
+    return os.path.join(PROFILE_DIR, f"{name}.jsonl")
+
+
+def loadHistory(src, limit=10):
+    """Most recent profile records of a solution, oldest first."""
+    try:
+        with open(_historyPath(src), "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+    return records[-limit:]
+
+
+def profileBuild(src, target, debug=False):
+    """
+    Build src into bin/<target> with -ftime-report and record the profile.
+    Returns (record, compilerOutput); record is None when the build failed.
+    """
+    flags = build.flagsFor(src, debug)
+    exe = build.exePath(target)
+    os.makedirs("bin", exist_ok=True)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [build.CXX, *flags, "-ftime-report", "-o", os.path.join("bin", target), src],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        return None, (result.stdout or "") + (result.stderr or "")
+    build.markBuilt(exe, flags)
+
+    phases, items = parseTimeReport(result.stderr)
+    top = dict(sorted(items.items(), key=lambda kv: kv[1], reverse=True)[:_TOP_ITEMS])
+    record = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "src": src,
+        "flags": flags,
+        "wall": round(wall, 3),
+        "phases": phases,
+        "top": top,
+        "headers": [[h, round(t, 3)] for h, t in headerCosts(src, flags)],
+        "binarySize": os.path.getsize(exe) if os.path.exists(exe) else 0,
+    }
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(_historyPath(src), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record, ""
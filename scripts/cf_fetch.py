@@ -4,16 +4,19 @@ Handles HTML parsing, Cloudflare evasion, and metadata extraction.
 """
 import sys
 import os
-import re
-import json
-import glob
 import time
+import test_writer
 from utils import GREEN, RED, YELLOW, BLUE, RESET
 
-def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount: int = 0):
-    """Fetch sample tests from Codeforces problem page using Scrapling.
-    Retries up to 3 times on transient network errors with a 1-second backoff."""
-    _maxRetries = 2
+def fetchPage(typeParam: str, contestId: str, problemLetter: str, _retryCount: int = 0, maxRetries: int = 2,
+              raiseNotFound: bool = False):
+    """Download a Codeforces problem page using Scrapling, falling back past Cloudflare.
+    Retries up to maxRetries times on transient network errors with a linear backoff
+    (the contest-start scheduler passes 0 and does its own backing off).
+    Returns the page, or None when it could not be fetched or has no samples.
+    With raiseNotFound, a missing problem or contest raises fetchers.NotFoundError instead."""
+    from fetchers import NotFoundError
+
     typeParam = typeParam.lower()
     problemLetter = problemLetter.upper()
     if typeParam == "problemset":
@@ -28,7 +31,7 @@ def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount:
     except ImportError:
         print(f"{RED}ERROR{RESET}: Scrapling library not found.")
         print("Please install it by running: pip install \"scrapling[all]\"")
-        return False
+        return None
         
     try:
         print(f"{BLUE}Attempting fast fetch...{RESET}")
@@ -70,27 +73,33 @@ def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount:
                     else "Please run: pip install curl_cffi."
                 )
                 print(f"{RED}ERROR{RESET}: {hint} Exact error: {e}")
-                return False
+                return None
             
         # Check title and visible text (Soft 404s)
         if "Error" in title or "No such problem" in pageText or "Problem not found" in pageText:
+            if raiseNotFound:
+                raise NotFoundError(f"Problem {contestId}{problemLetter} not found")
             print(f"{RED}ERROR{RESET}: Problem {contestId}{problemLetter} not found!")
-            return False
+            return None
             
         elif "Contest not found" in pageText:
+            if raiseNotFound:
+                raise NotFoundError(f"Contest {contestId} not found or not public")
             print(f"{RED}ERROR{RESET}: Contest {contestId} not found or not public!")
-            return False 
+            return None 
              
         # Cloudflare might still show a challenge page even after StealthyFetcher
         elif "Just a moment" in title or "cf-browser-verification" in pageText:
             print(f"{RED}ERROR{RESET}: Blocked by Cloudflare challenge page!")
-            return False
+            return None
             
         elif not page.css(".sample-test") and not page.css(".input"):
             print(f"{RED}ERROR{RESET}: Problem {contestId}{problemLetter} found but has no sample tests!")
             print("This might be an output-only or interactive problem")
-            return False
+            return None
             
+    except NotFoundError:
+        raise
     except Exception as e:
         errorMsg = str(e).lower()
         if "playwright" in errorMsg or "executable doesn't exist" in errorMsg or "chromium" in errorMsg:
@@ -99,44 +108,34 @@ def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount:
             print(f"Run this command to fix it: {GREEN}npx playwright install chromium --with-deps{RESET}\n")
 
         # Retry on transient network errors
-        if _retryCount < _maxRetries:
+        if _retryCount < maxRetries:
             waitSecs = _retryCount + 1
-            print(f"{YELLOW}Network error ({e}). Retrying in {waitSecs}s... ({_retryCount + 1}/{_maxRetries}){RESET}")
+            print(f"{YELLOW}Network error ({e}). Retrying in {waitSecs}s... ({_retryCount + 1}/{maxRetries}){RESET}")
             time.sleep(waitSecs)
-            return fetchTests(typeParam, contestId, problemLetter, _retryCount + 1)
+            return fetchPage(typeParam, contestId, problemLetter, _retryCount + 1, maxRetries, raiseNotFound)
 
         print(f"{RED}ERROR{RESET}: Unexpected error while fetching: {e}")
+        return None
+
+    return page
+
+def pageHtml(page) -> str:
+    """Raw HTML of a page returned by fetchPage."""
+    return getattr(page, 'html_content', getattr(page, 'html', str(page)))
+
+def fetchTests(typeParam: str, contestId: str, problemLetter: str):
+    """Fetch sample tests from a Codeforces problem page and write them to tests/."""
+    from fetchers import CodeforcesFetcher
+
+    typeParam = typeParam.lower()
+    problemLetter = problemLetter.upper()
+    page = fetchPage(typeParam, contestId, problemLetter)
+    if page is None:
         return False
 
     try:
-        # Target sample test <pre> blocks inside input/output containers
-        inputNodes = page.css(".input pre")
-        outputNodes = page.css(".output pre")
-        
-        # Helper to safely clean Codeforces <pre> blocks
-        def extractTestText(node) -> str:
-            # Get the raw HTML of just this small <pre> block
-            rawHtml = node.html_content
-            
-            # Codeforces sometimes uses <br> or <div class="test-example-line"> for newlines inside <pre>
-            text = re.sub(r'<br\s*/?>', '\n', rawHtml, flags=re.IGNORECASE)
-            text = re.sub(r'</div>', '\n', text, flags=re.IGNORECASE)
-            text = re.sub(r'<[^>]+>', '', text) # Strip remaining tags
-            
-            # Scrapling usually handles entities, but just to be safe:
-            text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
-            text = text.replace('&quot;', '"').replace('&#39;', "'").replace('&nbsp;', ' ')
-            
-            return text.strip()
-
-        inputs = [extractTestText(node) for node in inputNodes]
-        outputs = [extractTestText(node) for node in outputNodes]
-        
-        timeLimit = "Unknown"
-        rawPageHtml = getattr(page, "html_content", getattr(page, "html", str(page)))        
-        timeMatch = re.search(r'<div class="time-limit"[^>]*>.*?(\d+(?:\.\d+)?)\s*second', rawPageHtml, re.DOTALL | re.IGNORECASE)
-        if timeMatch:
-            timeLimit = timeMatch.group(1)
+        rawPageHtml = pageHtml(page)
+        inputs, outputs, timeLimit = CodeforcesFetcher(typeParam).parseSamples(rawPageHtml)
         
         if not inputs or not outputs:
             print(f"{RED}ERROR{RESET}: No sample tests found!")
@@ -150,7 +149,7 @@ def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount:
             os.makedirs(debugDir, exist_ok=True)
             debugPath = os.path.join(debugDir, f"debug_{contestId}_{problemLetter}.html")
             with open(debugPath, "w", encoding="utf-8") as f:
-                f.write(getattr(page, 'html_content', getattr(page, 'html', str(page))))
+                f.write(rawPageHtml)
             print(f"  - HTML saved to {debugPath} for inspection")
             return False
             
@@ -160,33 +159,13 @@ def fetchTests(typeParam: str, contestId: str, problemLetter: str, _retryCount:
             inputs = inputs[:minCount]
             outputs = outputs[:minCount]
 
-        os.makedirs("tests", exist_ok=True)
-        
-        # Remove existing test files for this problem to prevent stale data
-        for oldFile in glob.glob(f"tests/{problemLetter}*.in") + glob.glob(f"tests/{problemLetter}*.out"):
-            try:
-                os.remove(oldFile)
-            except OSError:
-                pass
-        
-        for i, (inp, out) in enumerate(zip(inputs, outputs), 1):
-            inputFile = f"tests/{problemLetter}{i}.in"
-            outputFile = f"tests/{problemLetter}{i}.out"
-            
-            with open(inputFile, "w", encoding="utf-8") as f:
-                f.write(inp.rstrip() + "\n")
-                
-            with open(outputFile, "w", encoding="utf-8") as f:
-                f.write(out.rstrip() + "\n")
-        metadataFile = f"tests/{problemLetter}_metadata.json"
         metadata = {
             "contestId": contestId,
             "problemLetter": problemLetter,
             "timeLimit": timeLimit,
             "testCount": len(inputs)
         }
-        with open(metadataFile, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        test_writer.writeProblemTests(problemLetter, list(zip(inputs, outputs)), metadata)
         
         print(f"{GREEN}Downloaded{RESET} {len(inputs)} sample tests for {typeParam} {contestId} problem {problemLetter}")
         print(f"   Time limit: {timeLimit}")
@@ -1,19 +1,29 @@
 """
 Listens for JSON payloads from the Competitive Companion browser extension.
 Extracts problem data, sets time limits, and creates test files.
+With --auto, every received problem is then compiled and tested, or created
+from the template and pre-built when it has no source yet.
 """
 import http.server
 import socketserver
-import itertools
 import json
 import os
-import glob
 import sys
 import re
 import time
-from utils import GREEN, RED, YELLOW, BLUE, RESET
+import queue
+import threading
+import build
+import run_tests
+import test_writer
+import tui
+from utils import GREEN, RED, YELLOW, BLUE, RESET, TEMPLATE
 
 PORT = 10043
+# fsync every written test before reporting success (python companion_listen.py --sync)
+SYNC_WRITES = "--sync" in sys.argv[1:]
+# Compile + test (or create + pre-build) each problem once its tests are saved
+AUTO_PIPELINE = "--auto" in sys.argv[1:]
 
 def extractProblemIdentifier(data):
     """
@@ -76,6 +86,95 @@ def extractProblemIdentifier(data):
     # Tier 4: Timestamp fallback
     return f"UNKNOWN_{int(time.time())}"
 
+def _isTemplate(src):
+    """An untouched template has nothing to test yet."""
+    try:
+        with open(src, "r", encoding="utf-8") as f:
+            return f.read() == TEMPLATE
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+class PostReceiveQueue:
+    """
+    Post-receive jobs for --auto, one at a time in arrival order: parsing a whole
+    contest sends every problem at once, and serial runs keep their timings from
+    competing for the CPU. A problem received again before its turn runs once,
+    on the newest tests. The worker is a daemon thread, so Ctrl+C stops the
+    listener at once instead of waiting for the job in progress.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.reporter = tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+        self.worker = threading.Thread(target=self._work, name="post-receive", daemon=True)
+        self.worker.start()
+
+    def submit(self, problem):
+        """Queue a problem; False if it is already waiting for its turn."""
+        with self.lock:
+            if problem in self.pending:
+                return False
+            self.pending.add(problem)
+        self.jobs.put(problem)
+        return True
+
+    def _work(self):
+        while True:
+            problem = self.jobs.get()
+            if self.stopped.is_set():
+                return
+            with self.lock:
+                self.pending.discard(problem)
+            try:
+                self.process(problem)
+            except Exception as e:
+                print(f"{RED}ERROR{RESET}: post-receive pipeline for {problem} failed: {e}")
+
+    def process(self, problem):
+        src = os.path.join("src", f"{problem}.cpp")
+        if not os.path.exists(src):
+            os.makedirs("src", exist_ok=True)
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(TEMPLATE)
+            print(f"{GREEN}Created {src} from the template{RESET}, pre-building...")
+        elif _isTemplate(src):
+            print(f"{src} is still the template, pre-building...")
+        else:
+            self.compileAndTest(problem, src)
+            return
+        # Warm the PCH too, so the first real compile of the solution is fast
+        build.warmPch(build.flagsFor(src))
+        result = build.compileSource(src, problem)
+        if result.success:
+            print(f"{GREEN}bin/{problem} ready.{RESET}\n")
+        else:
+            print(f"{RED}Pre-building {src} failed{RESET}\n{result.output}")
+
+    def compileAndTest(self, problem, src):
+        print(f"{YELLOW}Compiling{RESET} {src}...")
+        result = build.compileSource(src, problem)
+        if result.diagnostics:
+            self.reporter.console.print(tui.buildDiagnosticsTable(result.diagnostics))
+        if result.output.strip():
+            self.reporter.console.print(result.output.rstrip(), highlight=False, markup=False)
+        if not result.success:
+            print(f"{RED}Compilation failed; fix {src} and run the tests with `make test-only PROBLEM={problem}`.{RESET}\n")
+            return
+        run_tests.runTestsForProblem(problem, build.exePath(problem), reporter=self.reporter)
+
+    def shutdown(self):
+        """Drop queued problems; the job in progress dies with the process."""
+        self.stopped.set()
+        self.jobs.put(None)
+
+
+postReceive = PostReceiveQueue() if AUTO_PIPELINE else None
+
+
 class CompanionHandler(http.server.BaseHTTPRequestHandler):
     def do_POST(self):
         contentLength = int(self.headers["Content-Length"])
@@ -109,30 +208,10 @@ class CompanionHandler(http.server.BaseHTTPRequestHandler):
         print(f"Problem Letter: {problemLetter}")
         print(f"Time Limit: {timeLimit}")
         
-        os.makedirs("tests", exist_ok=True)
-        
-        # Remove existing test files for this problem to prevent stale data
-        for oldFile in itertools.chain(glob.glob(f"tests/{problemLetter}*.in"), glob.glob(f"tests/{problemLetter}*.out")):
-            try:
-                os.remove(oldFile)
-            except OSError:
-                pass
-                
         tests = data.get('tests', [])
         testCount = len(tests)
         print(f"Writing {testCount} tests...")
-        
-        for i, test in enumerate(tests, 1):
-            inputFile = f"tests/{problemLetter}{i}.in"
-            outputFile = f"tests/{problemLetter}{i}.out"
-            
-            with open(inputFile, "w", encoding="utf-8") as f:
-                f.write(test.get('input', '').rstrip() + "\n")
-                
-            with open(outputFile, "w", encoding="utf-8") as f:
-                f.write(test.get('output', '').rstrip() + "\n")
-                
-        metadataFile = f"tests/{problemLetter}_metadata.json"
+
         metadata = {
             "contestId": data.get('group', 'Unknown'),
             "problemLetter": problemLetter,
@@ -140,11 +219,18 @@ class CompanionHandler(http.server.BaseHTTPRequestHandler):
             "testCount": testCount,
             "url": url
         }
-        with open(metadataFile, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        # Staged and swapped in under the suite lock: a test run in progress never sees half a problem
+        test_writer.writeProblemTests(problemLetter,
+                                      [(t.get('input', ''), t.get('output', '')) for t in tests],
+                                      metadata, sync=SYNC_WRITES)
             
         print(f"{GREEN}Successfully saved {testCount} tests for {problemLetter}!{RESET}")
-        print("Ready for testing.\n")
+        if postReceive is None:
+            print("Ready for testing.\n")
+        elif postReceive.submit(problemLetter):
+            print(f"Queued {problemLetter} for compile + test.\n")
+        else:
+            print(f"{problemLetter} is already queued; it will run on these tests.\n")
 
     def log_message(self, format, *args):
         # Override BaseHTTPRequestHandler's stderr logging to keep output clean
@@ -155,10 +241,14 @@ def startServer():
     try:
         with socketserver.TCPServer(("", PORT), CompanionHandler) as httpd:
             print(f"{GREEN}Listening on port {PORT} for Competitive Companion...{RESET}")
+            if postReceive is not None:
+                print(f"{BLUE}Auto mode:{RESET} received problems are compiled and tested (new ones created from the template).")
             try:
                 httpd.serve_forever()
             except KeyboardInterrupt:
                 print(f"\n{YELLOW}Shutting down listener.{RESET}")
+                if postReceive is not None:
+                    postReceive.shutdown()
                 sys.exit(0)
     except OSError:
         print(f"{RED}ERROR{RESET}: Port {PORT} is already in use. Is another listener running?")
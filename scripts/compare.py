@@ -0,0 +1,219 @@
+"""
+Differential testing of two solutions to the same problem.
+Both binaries run on every test of the problem, plus max tests produced by an
+optional generator src/<prob>_gen.cpp (called as `<prob>_gen <seed>`, a max
+size input on stdout; complexity.py also passes a size n). Runs are interleaved
+A B B A ... so drifting machine load hits both sides equally. Outputs that
+disagree are flagged, and speedup and memory ratios are reported per test and
+overall with 95% confidence intervals.
+"""
+import os
+import sys
+import math
+import shutil
+import tempfile
+import statistics
+import subprocess
+
+import build
+import fingerprint
+import isolation
+import run_tests
+import test_catalog
+import tui
+from utils import RED, RESET
+
+DEFAULT_REPEAT = 5
+DEFAULT_GENERATED = 3
+
+
+class Side:
+    """One solution under comparison: its binary and the runs collected so far."""
+
+    def __init__(self, label, executable):
+        self.label = label
+        self.executable = executable
+        self.pipe = build.isPipeBuild(executable)
+        self.times = []
+        self.memory = 0
+        self.status = None
+        self.output = None
+
+    def run(self, test, timeout, policy):
+        status, output, execTime, details, memory = run_tests.runSolution(
+            self.executable, test, timeout, pipe=self.pipe, policy=policy
+        )
+        # The first failing round decides the status: a later TLE or crash must not read as OK
+        if self.status is None or (self.status == "OK" and status != "OK"):
+            self.status, self.output = status, output
+        self.times.append(execTime)
+        self.memory = max(self.memory, memory)
+        return status == "OK"
+
+
+def _verdict(side, expected):
+    if side.status != "OK":
+        return side.status
+    return "ACCEPTED" if run_tests.outputsMatch(expected, side.output) else "WRONG ANSWER"
+
+
+class TestComparison:
+    """Result of comparing both sides on one test."""
+
+    def __init__(self, test, a, b, expected=None):
+        self.name = test.name
+        self.a = a
+        self.b = b
+        self.agree = a.status == b.status and (a.status != "OK" or run_tests.outputsMatch(a.output, b.output) is not None)
+        # Against the expected output, when the test has one
+        self.verdicts = (_verdict(a, expected), _verdict(b, expected)) if expected is not None else None
+        # Paired log-ratios: round i ran both sides back to back
+        self.logRatios = [math.log(ta / tb) for ta, tb in zip(a.times, b.times) if ta > 0 and tb > 0]
+
+    @property
+    def speedup(self):
+        """(B's speedup over A, CI low, CI high) from the paired rounds."""
+        if not self.logRatios:
+            return None
+        mean, halfWidth = isolation.meanInterval(self.logRatios)
+        return math.exp(mean), math.exp(mean - halfWidth), math.exp(mean + halfWidth)
+
+    @property
+    def memoryRatio(self):
+        if not self.a.memory or not self.b.memory:
+            return None
+        return self.b.memory / self.a.memory
+
+
+def generateTests(problem, count, directory):
+    """
+    Max tests from src/<problem>_gen.cpp, seeds 1..count, as TestEntry objects
+    without expected output. Returns [] when the problem has no generator.
+    """
+    src = os.path.join("src", f"{problem}_gen.cpp")
+    if count <= 0 or not os.path.exists(src):
+        return []
+    target = f"{problem}_gen"
+    result = build.compileSource(src, target)
+    if not result.success:
+        raise RuntimeError(f"Generator {src} failed to compile:\n{result.output}")
+    tests = []
+    for seed in range(1, count + 1):
+        path = os.path.join(directory, f"gen{seed}.in")
+        with open(path, "wb") as f:
+            subprocess.run([os.path.abspath(build.exePath(target)), str(seed)], stdout=f, check=True)
+        tests.append(test_catalog.TestEntry(f"gen{seed}", 10000 + seed, path, None, os.path.getsize(path), 0))
+    return tests
+
+
+def compareOnTest(solutions, test, timeout, repeat, policy):
+    """Run both solutions [(label, executable)] `repeat` times on one test, alternating which goes first."""
+    a, b = (Side(label, executable) for label, executable in solutions)
+    for i in range(repeat):
+        first, second = (a, b) if i % 2 == 0 else (b, a)
+        firstOk = first.run(test, timeout, policy)
+        secondOk = second.run(test, timeout, policy)
+        # Timing only means something while both still produce an answer
+        if not (firstOk and secondOk):
+            break
+    expected = test.readOutput().strip() if test.hasOutput else None
+    return TestComparison(test, a, b, expected)
+
+
+def overallSpeedup(comparisons):
+    """Geometric-mean speedup across tests with a 95% CI over tests (over rounds for a single test)."""
+    perTest = [statistics.fmean(c.logRatios) for c in comparisons if c.logRatios]
+    if not perTest:
+        return None
+    if len(perTest) == 1:
+        return comparisons[0].speedup
+    mean, halfWidth = isolation.meanInterval(perTest)
+    return math.exp(mean), math.exp(mean - halfWidth), math.exp(mean + halfWidth)
+
+
+def compare(srcA, srcB, problem, repeat=DEFAULT_REPEAT, generated=DEFAULT_GENERATED, isolate=True, reporter=None):
+    """
+    Build both sources, compare them on every test and print the report.
+    Returns True when the outputs agree everywhere.
+    """
+    reporter = reporter or tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+    solutions = []
+    for src in (srcA, srcB):
+        target = os.path.splitext(os.path.basename(src))[0]
+        result = build.compileSource(src, target)
+        if not result.success:
+            reporter.printError(f"{src} failed to compile")
+            if result.output.strip():
+                reporter.console.print(result.output.rstrip(), highlight=False, markup=False)
+            return False
+        solutions.append((target, build.exePath(target)))
+    (labelA, _), (labelB, _) = solutions
+
+    timeout = run_tests.loadTimeLimit(problem)
+    policy = isolation.IsolationPolicy() if isolate else None
+    genDir = tempfile.mkdtemp(prefix="cp-gen-")
+    try:
+        tests = list(test_catalog.getCatalog().tests(problem))
+        try:
+            tests += generateTests(problem, generated, genDir)
+        except (RuntimeError, subprocess.CalledProcessError, OSError) as e:
+            reporter.printWarning(f"Skipping generated tests: {e}")
+        if not tests:
+            reporter.printError(f"No tests for {problem}")
+            return False
+
+        comparisons = []
+        with reporter.console.status(f"[#666666]Comparing {labelA} and {labelB}...[/]") as status:
+            for test in tests:
+                status.update(f"[#666666]Comparing {labelA} and {labelB} on {test.name} ({repeat} rounds)...[/]")
+                comparisons.append(compareOnTest(solutions, test, timeout, repeat, policy))
+    finally:
+        shutil.rmtree(genDir, ignore_errors=True)
+
+    reporter.console.print(tui.buildCompareTable(comparisons, labelA, labelB))
+    overall = overallSpeedup(comparisons)
+    if overall:
+        speedup, low, high = overall
+        faster, factor, bounds = (labelB, speedup, (low, high)) if speedup >= 1 else (labelA, 1 / speedup, (1 / high, 1 / low))
+        reporter.printInfo(f"Overall: {faster} is {factor:.2f}x faster (95% CI {bounds[0]:.2f}x - {bounds[1]:.2f}x), "
+                           f"geometric mean over {sum(1 for c in comparisons if c.logRatios)} tests")
+    ratios = [c.memoryRatio for c in comparisons if c.memoryRatio]
+    if ratios:
+        reporter.printInfo(f"Memory {labelB}/{labelA}: {math.exp(statistics.fmean(map(math.log, ratios))):.2f}x "
+                           f"(geometric mean over {len(ratios)} tests)")
+    if policy is not None and policy.describe():
+        reporter.printInfo(f"Isolation: {policy.describe()}")
+    reporter.printInfo(f"Machine: {fingerprint.describe(fingerprint.current(solutions[0][1]))}")
+
+    disagreements = [c.name for c in comparisons if not c.agree]
+    if disagreements:
+        reporter.printError(f"Outputs differ on {len(disagreements)} test(s): {', '.join(disagreements)}")
+        return False
+    reporter.console.print(f"[bold #0a0a0a on #00ff41] ✔ Outputs agree on all {len(comparisons)} tests [/]")
+    return True
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    if len(args) != 3:
+        print("Usage: python compare.py <fileA.cpp> <fileB.cpp> <PROBLEM> [--repeat=N] [--gen=N] [--no-isolate]")
+        print("Example: python compare.py src/C.cpp src/C2.cpp C")
+        print("Max tests come from src/<PROBLEM>_gen.cpp if present (run as '<PROBLEM>_gen <seed>').")
+        sys.exit(1)
+
+    def flagValue(name, default):
+        return next((int(f.split("=", 1)[1]) for f in flags if f.startswith(f"{name}=")), default)
+
+    srcA, srcB, problem = args
+    for src in (srcA, srcB):
+        if not os.path.exists(src):
+            print(f"{RED}ERROR{RESET}: {src} not found")
+            sys.exit(1)
+    agree = compare(srcA, srcB, problem.upper(), repeat=max(1, flagValue("--repeat", DEFAULT_REPEAT)),
+                    generated=max(0, flagValue("--gen", DEFAULT_GENERATED)), isolate="--no-isolate" not in flags)
+    sys.exit(0 if agree else 1)
+
+
+if __name__ == "__main__":
+    main()
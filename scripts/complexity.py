@@ -0,0 +1,222 @@
+"""
+Empirical complexity estimation.
+Runs a solution on generated inputs of geometrically increasing size (the
+generator src/<prob>_gen.cpp is called as `<prob>_gen <seed> <n>`), fits wall
+time and peak memory to the usual complexity classes, and extrapolates the best
+fit to the problem's maximum n to compare against the time limit.
+"""
+import os
+import sys
+import math
+import shutil
+import tempfile
+import statistics
+import subprocess
+
+import build
+import fingerprint
+import run_tests
+import test_catalog
+import tui
+from utils import RED, RESET
+
+# name -> growth function; every model is  t(n) = a * f(n) + b
+CLASSES = {
+    "O(log n)": lambda n: math.log2(n),
+    "O(√n)": lambda n: math.sqrt(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n log² n)": lambda n: n * math.log2(n) ** 2,
+    "O(n√n)": lambda n: n * math.sqrt(n),
+    "O(n²)": lambda n: n ** 2,
+    "O(n² log n)": lambda n: n ** 2 * math.log2(n),
+    "O(n³)": lambda n: n ** 3,
+}
+MEMORY_CLASSES = ("O(log n)", "O(n)", "O(n log n)", "O(n²)")
+
+DEFAULT_START = 1000
+DEFAULT_REPEAT = 3
+GROWTH = 2
+# Stop growing once a run takes this fraction of the time limit: the fit has what it needs
+BUDGET_FRACTION = 0.5
+
+
+class Fit:
+    """A least-squares fit of measurements to one class: value(n) = a * f(n) + b."""
+
+    def __init__(self, name, a, b, error):
+        self.name = name
+        self.a = a
+        self.b = b
+        self.error = error  # RMS relative error of the fit
+
+    def predict(self, n):
+        return self.a * CLASSES[self.name](n) + self.b
+
+
+def fitClass(name, sizes, values):
+    """
+    Fit one class by weighted least squares on relative error (so small sizes count
+    as much as large ones), with a, b >= 0. Returns a Fit or None.
+    """
+    f = CLASSES[name]
+    xs = [f(n) for n in sizes]
+    weights = [1 / v ** 2 if v > 0 else 0 for v in values]
+    sw = sum(weights)
+    if sw == 0:
+        return None
+    swx = sum(w * x for w, x in zip(weights, xs))
+    swy = sum(w * y for w, y in zip(weights, values))
+    swxx = sum(w * x * x for w, x in zip(weights, xs))
+    swxy = sum(w * x * y for w, x, y in zip(weights, xs, values))
+    det = sw * swxx - swx * swx
+    a = (sw * swxy - swx * swy) / det if det > 0 else 0.0
+    b = (swy - a * swx) / sw
+    # A negative intercept or slope has no physical meaning: refit with it pinned to 0
+    if a < 0:
+        a, b = 0.0, swy / sw
+    elif b < 0:
+        a, b = (swxy / swxx if swxx > 0 else 0.0), 0.0
+    error = math.sqrt(statistics.fmean(((a * x + b - y) / y) ** 2 for x, y in zip(xs, values) if y > 0))
+    return Fit(name, a, b, error)
+
+
+def bestFits(sizes, values, names=CLASSES):
+    """Fits for the given classes, best first. Near-ties go to the slower-growing class."""
+    fits = [fit for fit in (fitClass(name, sizes, values) for name in names) if fit]
+    order = list(CLASSES)
+    return sorted(fits, key=lambda fit: (round(fit.error, 2), order.index(fit.name)))
+
+
+def loglogSlope(sizes, values):
+    """Exponent k of value ~ n^k between the two largest sizes (the least startup-dominated)."""
+    if len(sizes) < 2 or values[-1] <= 0 or values[-2] <= 0:
+        return None
+    return math.log(values[-1] / values[-2]) / math.log(sizes[-1] / sizes[-2])
+
+
+class Measurement:
+    def __init__(self, n, times, memory):
+        self.n = n
+        self.time = statistics.median(times)
+        self.memory = memory
+
+
+def measure(executable, generator, n, repeat, timeout, directory):
+    """Generate one input of size n (seed 1, so runs are reproducible) and time the solution on it `repeat` times."""
+    pipe = build.isPipeBuild(executable)
+    path = os.path.join(directory, f"n{n}.in")
+    with open(path, "wb") as f:
+        subprocess.run([os.path.abspath(generator), "1", str(n)], stdout=f, check=True)
+    test = test_catalog.TestEntry(f"n{n}", n, path, None, os.path.getsize(path), 0)
+    times = []
+    memory = 0
+    for _ in range(repeat):
+        status, _, execTime, details, memoryUsed = run_tests.runSolution(executable, test, timeout, pipe=pipe)
+        if status != "OK":
+            raise RuntimeError(f"{status} at n={n}" + (f": {details['error']}" if details and details.get("error") else ""))
+        times.append(execTime)
+        memory = max(memory, memoryUsed)
+    os.remove(path)
+    return Measurement(n, times, memory)
+
+
+def estimate(problem, maxN, start=DEFAULT_START, repeat=DEFAULT_REPEAT, reporter=None):
+    """
+    Build src/<problem>.cpp and its generator, measure at start, 2*start, ... and
+    print the fitted classes and the extrapolation to maxN. Returns the best time Fit.
+    """
+    reporter = reporter or tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+    genSrc = os.path.join("src", f"{problem}_gen.cpp")
+    if not os.path.exists(genSrc):
+        reporter.printError(f"{genSrc} not found. It should print a test of size n for `{problem}_gen <seed> <n>`.")
+        return None
+    builds = {}
+    for src, target in ((os.path.join("src", f"{problem}.cpp"), problem), (genSrc, f"{problem}_gen")):
+        result = build.compileSource(src, target)
+        if not result.success:
+            reporter.printError(f"{src} failed to compile")
+            if result.output.strip():
+                reporter.console.print(result.output.rstrip(), highlight=False, markup=False)
+            return None
+        builds[target] = build.exePath(target)
+
+    timeLimit = run_tests.loadTimeLimit(problem)
+    measurements = []
+    workDir = tempfile.mkdtemp(prefix="cp-scale-")
+    try:
+        with reporter.console.status("[#666666]Measuring...[/]") as status:
+            n = max(1, min(start, maxN))
+            while True:
+                status.update(f"[#666666]Measuring n={n} ({repeat} runs)...[/]")
+                try:
+                    measurements.append(measure(builds[problem], builds[f"{problem}_gen"], n, repeat, timeLimit, workDir))
+                except (RuntimeError, subprocess.CalledProcessError, OSError) as e:
+                    reporter.printWarning(f"Stopped growing n: {e}")
+                    break
+                if n >= maxN or measurements[-1].time >= timeLimit * BUDGET_FRACTION:
+                    break
+                n = min(maxN, n * GROWTH)
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+    if len(measurements) < 3:
+        reporter.printError("Need at least 3 sizes to fit a curve (lower --from or raise --max)")
+        return None
+
+    sizes = [m.n for m in measurements]
+    timeFits = bestFits(sizes, [m.time for m in measurements])
+    # Very fast runs can end before their memory is sampled
+    sampled = [m for m in measurements if m.memory]
+    memoryFits = bestFits([m.n for m in sampled], [m.memory for m in sampled], MEMORY_CLASSES) if len(sampled) >= 3 else []
+    best = timeFits[0]
+    reporter.console.print(tui.buildScaleTable(measurements, best, maxN, timeLimit))
+
+    slope = loglogSlope(sizes, [m.time for m in measurements])
+    runnerUp = f", next {timeFits[1].name} ({timeFits[1].error:.0%})" if len(timeFits) > 1 else ""
+    reporter.printInfo(f"Time: best fit {best.name} (RMS error {best.error:.0%}{runnerUp})"
+                       + (f", measured exponent n^{slope:.2f}" if slope is not None else ""))
+    if memoryFits:
+        reporter.printInfo(f"Memory: best fit {memoryFits[0].name} "
+                           f"({tui.formatMemory(memoryFits[0].predict(maxN))} predicted at n={maxN})")
+
+    predicted = best.predict(maxN)
+    machine = fingerprint.current(builds[problem])
+    reporter.printInfo(f"Machine: {fingerprint.describe(machine)}")
+    scale = fingerprint.scaleTo(machine, fingerprint.loadReference())
+    if scale:
+        reporter.printInfo(f"On {scale[0]}: ≈ {predicted * scale[1]:.2f}s at n={maxN} (from calibration scores)")
+    if predicted > timeLimit:
+        reporter.printError(f"Predicted {predicted:.2f}s at n={maxN}: over the {timeLimit:g}s limit")
+    elif predicted > timeLimit / 2:
+        reporter.printWarning(f"Predicted {predicted:.2f}s at n={maxN}: within the {timeLimit:g}s limit, but close")
+    else:
+        reporter.console.print(f"[bold #0a0a0a on #00ff41] ✔ Predicted {predicted:.2f}s at n={maxN} "
+                               f"(limit {timeLimit:g}s) [/]")
+    return best
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+
+    def flagValue(name, default):
+        return next((int(float(f.split("=", 1)[1])) for f in flags if f.startswith(f"{name}=")), default)
+
+    maxN = flagValue("--max", None)
+    if len(args) != 1 or not maxN:
+        print("Usage: python complexity.py <PROBLEM> --max=N [--from=N] [--repeat=N]")
+        print("Example: python complexity.py C --max=2e5")
+        print("Needs src/<PROBLEM>_gen.cpp printing a test of size n for '<PROBLEM>_gen <seed> <n>'.")
+        sys.exit(1)
+    try:
+        best = estimate(args[0].upper(), maxN, start=flagValue("--from", DEFAULT_START),
+                        repeat=max(1, flagValue("--repeat", DEFAULT_REPEAT)))
+    except KeyboardInterrupt:
+        print(f"\n{RED}Cancelled{RESET}")
+        sys.exit(1)
+    sys.exit(0 if best else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Structured output from include/debug.cpp.
+Built with -DDEBUG_RECORDS, debug() and TIME_BLOCK write uncolored one-line
+records to stderr instead of terminal text:
+
+    @@cp debug <line> [<name> = <value> || ...]
+    @@cp time <seconds> <limit> <label>
+
+parse() turns a run's stderr back into readable text plus per-block timings, and
+aggregate() adds up the blocks of every test, so TIME_BLOCK works as a poor
+man's profiler across the whole test set.
+"""
+
+PREFIX = "@@cp "
+
+
+def parse(stderr):
+    """
+    (text, blocks) for one run: stderr with debug records shown as `line: [...]`
+    and time records taken out, and {label: [calls, total, max, limit]}.
+    """
+    lines = []
+    blocks = {}
+    for line in stderr.splitlines():
+        # A record can follow unterminated output of the solution's own on the same line
+        start = line.find(PREFIX)
+        if start < 0:
+            lines.append(line)
+            continue
+        if start > 0:
+            lines.append(line[:start])
+        kind, _, rest = line[start + len(PREFIX):].partition(" ")
+        if kind == "debug":
+            number, _, payload = rest.partition(" ")
+            lines.append(f"{number}: {payload}")
+            continue
+        parts = rest.split(" ", 2)
+        try:
+            seconds, limit, label = float(parts[0]), float(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            lines.append(line[start:])
+            continue
+        block = blocks.setdefault(label, [0, 0.0, 0.0, limit])
+        block[0] += 1
+        block[1] += seconds
+        block[2] = max(block[2], seconds)
+    return "\n".join(lines), blocks
+
+
+class BlockStats:
+    """One TIME_BLOCK label summed over every test that ran it."""
+
+    def __init__(self, label, limit):
+        self.label = label
+        self.limit = limit
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.tests = 0
+        self.slowestTest = None
+
+    @property
+    def mean(self):
+        return self.total / self.calls if self.calls else 0.0
+
+
+def aggregate(blocksByTest):
+    """[BlockStats] from {testCase: details["blocks"]}, largest total first."""
+    stats = {}
+    for testCase, blocks in blocksByTest.items():
+        for label, (calls, total, longest, limit) in blocks.items():
+            block = stats.setdefault(label, BlockStats(label, limit))
+            block.calls += calls
+            block.total += total
+            block.tests += 1
+            if longest >= block.max:
+                block.max, block.slowestTest = longest, testCase
+    return sorted(stats.values(), key=lambda block: block.total, reverse=True)
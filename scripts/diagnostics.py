@@ -0,0 +1,128 @@
+"""
+Compiler diagnostics parsing and caching.
+Turns g++'s -fdiagnostics-format=json output into compact records and caches
+them per source hash, so an unchanged broken file reports its errors without
+being recompiled.
+"""
+import os
+import json
+import hashlib
+import threading
+import subprocess
+
+from utils import CACHE_DIR
+
+JSON_FLAG = "-fdiagnostics-format=json"
+_CACHE_FILE = os.path.join(CACHE_DIR, "diagnostics.json")
+_MAX_ENTRIES = 200
+_lock = threading.Lock()
+_jsonSupport = {}  # compiler -> whether it accepted JSON_FLAG
+
+
+def supportsJson(cxx):
+    """
+    Whether the compiler accepts JSON_FLAG, probed once per compiler: the name
+    says little (macOS's g++ is Apple clang, and GCC 15 dropped the format).
+    """
+    with _lock:
+        if cxx in _jsonSupport:
+            return _jsonSupport[cxx]
+    try:
+        result = subprocess.run([cxx, JSON_FLAG, "-fsyntax-only", "-x", "c++", "-"], input="",
+                                capture_output=True, text=True, timeout=30)
+        supported = result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        supported = False
+    with _lock:
+        _jsonSupport[cxx] = supported
+    return supported
+
+
+def _record(diag, kind=None):
+    locations = diag.get("locations") or [{}]
+    caret = locations[0].get("caret", {})
+    return {
+        "kind": kind or diag.get("kind", "error"),
+        "file": caret.get("file", ""),
+        "line": caret.get("line", 0),
+        "column": caret.get("column", 0),
+        "message": diag.get("message", ""),
+        "option": diag.get("option", ""),
+    }
+
+
+def parseDiagnostics(stderr, sourceFile=None):
+    """
+    Split compiler stderr into (diagnostics, otherOutput).
+    Notes attached to a diagnostic are kept only when they point into the
+    source file itself; template backtraces through system headers are dropped.
+    Lines that are not JSON (linker errors, etc.) are returned as otherOutput.
+    """
+    diagnostics = []
+    other = []
+    for line in stderr.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("["):
+            try:
+                parsed = json.loads(stripped)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, list):
+                for diag in parsed:
+                    diagnostics.append(_record(diag))
+                    for child in diag.get("children", []):
+                        note = _record(child, kind=child.get("kind", "note"))
+                        if sourceFile is None or os.path.normpath(note["file"]) == os.path.normpath(sourceFile):
+                            diagnostics.append(note)
+                continue
+        other.append(line)
+    return diagnostics, "\n".join(other).strip()
+
+
+def sourceKey(src, flags, cxx):
+    """Hash of the source, local headers, flags and compiler that fully determines the diagnostics."""
+    h = hashlib.sha256()
+    h.update(cxx.encode())
+    h.update("\0".join(flags).encode())
+    with open(src, "rb") as f:
+        h.update(f.read())
+    # Local headers (include/) can break a build too; their stat is enough
+    if os.path.isdir("include"):
+        for name in sorted(os.listdir("include")):
+            try:
+                st = os.stat(os.path.join("include", name))
+            except OSError:
+                continue
+            h.update(f"{name}:{st.st_mtime_ns}:{st.st_size}".encode())
+    return h.hexdigest()
+
+
+def _loadCache():
+    try:
+        with open(_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def lookup(key):
+    """Cached {'success', 'diagnostics', 'output'} for a source key, or None."""
+    return _loadCache().get(key)
+
+
+def store(key, success, diagnostics, output):
+    with _lock:
+        cache = _loadCache()
+        cache.pop(key, None)
+        cache[key] = {"success": success, "diagnostics": diagnostics, "output": output}
+        # dicts keep insertion order: drop the oldest entries first
+        while len(cache) > _MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmpPath = _CACHE_FILE + ".tmp"
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmpPath, _CACHE_FILE)
+        except OSError:
+            pass
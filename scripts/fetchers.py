@@ -0,0 +1,327 @@
+"""
+Pluggable sample-test fetchers for online judges.
+Every backend shares one connection-pooled HTTP client and the same tests/
+writer; Codeforces keeps its Cloudflare-aware download path from cf_fetch.py.
+"""
+import sys
+import re
+import gzip
+import html
+import json
+import time
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin
+
+import test_writer
+from utils import GREEN, RED, YELLOW, BLUE, RESET
+
+_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+               "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+
+class FetchError(Exception):
+    """A problem page could not be downloaded or did not contain sample tests."""
+
+
+class NotFoundError(FetchError):
+    """The judge answered that the problem (or its contest) does not exist: retrying will not help."""
+
+
+class HttpClient:
+    """
+    Minimal keep-alive HTTP(S) client.
+    Idle connections are pooled per (scheme, host) and shared across threads,
+    so fetching a whole contest reuses one TLS session per judge.
+    """
+
+    def __init__(self, maxIdlePerHost=4, timeout=15):
+        self.maxIdlePerHost = maxIdlePerHost
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme, host):
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                return idle.pop()
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, timeout=self.timeout)
+
+    def _release(self, scheme, host, conn):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.maxIdlePerHost:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def get(self, url, headers=None, maxRedirects=5):
+        """GET a URL, following redirects. Returns (status, text)."""
+        for _ in range(maxRedirects + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            requestHeaders = {"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip", **(headers or {})}
+
+            # A pooled connection may have been closed by the server: retry once on a fresh one
+            for attempt in range(2):
+                conn = self._acquire(parts.scheme, parts.netloc)
+                try:
+                    conn.request("GET", path, headers=requestHeaders)
+                    resp = conn.getresponse()
+                    body = resp.read()
+                    break
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    if attempt == 1:
+                        raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(parts.scheme, parts.netloc, conn)
+
+            if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+                url = urljoin(url, resp.getheader("Location"))
+                continue
+
+            if resp.getheader("Content-Encoding", "") == "gzip":
+                body = gzip.decompress(body)
+            charset = resp.headers.get_content_charset() or "utf-8"
+            return resp.status, body.decode(charset, errors="replace")
+
+        raise FetchError(f"Too many redirects for {url}")
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+# One client for every backend (and every thread)
+sharedClient = HttpClient()
+
+
+class ProblemData:
+    """Parsed problem page: sample tests as (input, output) pairs and the time limit in seconds."""
+
+    def __init__(self, tests, timeLimit="Unknown", url=""):
+        self.tests = tests
+        self.timeLimit = timeLimit
+        self.url = url
+
+
+def _preText(fragment):
+    """Text of a <pre> block: <br> and line <div>s become newlines, tags are stripped, entities decoded."""
+    text = re.sub(r'<br\s*/?>', '\n', fragment, flags=re.IGNORECASE)
+    text = re.sub(r'</div>', '\n', text, flags=re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).replace('\xa0', ' ').strip()
+
+
+class JudgeFetcher:
+    """
+    Base class for a judge backend.
+    Subclasses build the problem URL and parse the downloaded page; downloading
+    and writing to tests/ are shared.
+    """
+    name = ""
+
+    def problemUrl(self, contestId, problemId):
+        raise NotImplementedError
+
+    def download(self, url):
+        status, text = sharedClient.get(url)
+        if status == 404:
+            raise NotFoundError(f"HTTP 404 for {url}")
+        if status != 200:
+            raise FetchError(f"HTTP {status} for {url}")
+        return text
+
+    def parse(self, page):
+        """Extract a ProblemData from the raw page text."""
+        raise NotImplementedError
+
+    def fetchProblem(self, contestId, problemId):
+        url = self.problemUrl(contestId, problemId)
+        print(f"{YELLOW}Fetching{RESET} from: {url}")
+        data = self.parse(self.download(url))
+        data.url = url
+        if not data.tests:
+            raise FetchError(f"No sample tests found at {url}")
+        return data
+
+
+class CodeforcesFetcher(JudgeFetcher):
+    name = "codeforces"
+    _INPUT = re.compile(r'<div class="input">\s*<div class="title">.*?</div>\s*<pre[^>]*>(.*?)</pre>', re.DOTALL)
+    _OUTPUT = re.compile(r'<div class="output">\s*<div class="title">.*?</div>\s*<pre[^>]*>(.*?)</pre>', re.DOTALL)
+    _TIME = re.compile(r'<div class="time-limit"[^>]*>.*?(\d+(?:\.\d+)?)\s*second', re.DOTALL | re.IGNORECASE)
+
+    def __init__(self, typeParam="contest"):
+        self.typeParam = typeParam
+        self.pageRetries = 2
+
+    def problemUrl(self, contestId, problemId):
+        if self.typeParam == "problemset":
+            return f"https://codeforces.com/problemset/problem/{contestId}/{problemId}"
+        return f"https://codeforces.com/{self.typeParam}/{contestId}/problem/{problemId}"
+
+    def fetchProblem(self, contestId, problemId):
+        # Plain HTTP gets the Cloudflare challenge; reuse cf_fetch's evasion path
+        import cf_fetch
+        page = cf_fetch.fetchPage(self.typeParam, contestId, problemId, maxRetries=self.pageRetries,
+                                  raiseNotFound=True)
+        if page is None:
+            raise FetchError(f"Could not fetch Codeforces {contestId}{problemId}")
+        data = self.parse(cf_fetch.pageHtml(page))
+        data.url = self.problemUrl(contestId, problemId)
+        if not data.tests:
+            raise FetchError(f"No sample tests found at {data.url}")
+        return data
+
+    def parseSamples(self, page):
+        """(inputs, outputs, timeLimit) exactly as found; counts may differ on malformed pages."""
+        inputs = [_preText(m) for m in self._INPUT.findall(page)]
+        outputs = [_preText(m) for m in self._OUTPUT.findall(page)]
+        timeMatch = self._TIME.search(page)
+        return inputs, outputs, timeMatch.group(1) if timeMatch else "Unknown"
+
+    def parse(self, page):
+        inputs, outputs, timeLimit = self.parseSamples(page)
+        return ProblemData(list(zip(inputs, outputs)), timeLimit)
+
+
+class AtCoderFetcher(JudgeFetcher):
+    name = "atcoder"
+    _SAMPLE = re.compile(r'<h3>Sample (Input|Output) (\d+)</h3>\s*<pre[^>]*>(.*?)</pre>', re.DOTALL)
+    _TIME = re.compile(r'Time Limit:\s*(\d+(?:\.\d+)?)\s*sec')
+
+    def problemUrl(self, contestId, problemId):
+        contestId = contestId.lower()
+        return f"https://atcoder.jp/contests/{contestId}/tasks/{contestId}_{problemId.lower()}"
+
+    def parse(self, page):
+        inputs, outputs = {}, {}
+        for kind, index, body in self._SAMPLE.findall(page):
+            (inputs if kind == "Input" else outputs).setdefault(int(index), _preText(body))
+        tests = [(inputs[i], outputs[i]) for i in sorted(inputs) if i in outputs]
+        timeMatch = self._TIME.search(page)
+        return ProblemData(tests, timeMatch.group(1) if timeMatch else "Unknown")
+
+
+class CodeChefFetcher(JudgeFetcher):
+    """CodeChef pages are rendered client-side, so this backend reads the JSON the page itself loads."""
+    name = "codechef"
+
+    def problemUrl(self, contestId, problemId):
+        contestId = (contestId or "PRACTICE").upper()
+        return f"https://www.codechef.com/api/contests/{contestId}/problems/{problemId.upper()}"
+
+    def parse(self, page):
+        try:
+            payload = json.loads(page)
+        except ValueError as e:
+            raise FetchError(f"Unexpected CodeChef response: {e}")
+        components = payload.get("problem_components") or {}
+        tests = [(t.get("input", "").strip(), t.get("output", "").strip())
+                 for t in components.get("sampleTestCases", [])]
+        return ProblemData(tests, str(payload.get("max_timelimit", "Unknown")))
+
+
+class CsesFetcher(JudgeFetcher):
+    name = "cses"
+    _SAMPLE = re.compile(r'<p>Input:</p>\s*<pre>(.*?)</pre>\s*<p>Output:</p>\s*<pre>(.*?)</pre>', re.DOTALL)
+    _TIME = re.compile(r'Time limit:</b>\s*(\d+(?:\.\d+)?)\s*s')
+
+    def problemUrl(self, contestId, problemId):
+        # CSES has a single problem set; contestId is ignored
+        return f"https://cses.fi/problemset/task/{problemId}"
+
+    def parse(self, page):
+        tests = [(_preText(i), _preText(o)) for i, o in self._SAMPLE.findall(page)]
+        timeMatch = self._TIME.search(page)
+        return ProblemData(tests, timeMatch.group(1) if timeMatch else "Unknown")
+
+
+FETCHERS = {
+    "contest": lambda: CodeforcesFetcher("contest"),
+    "gym": lambda: CodeforcesFetcher("gym"),
+    "problemset": lambda: CodeforcesFetcher("problemset"),
+    "atcoder": AtCoderFetcher,
+    "codechef": CodeChefFetcher,
+    "cses": CsesFetcher,
+}
+
+
+def getFetcher(judge):
+    try:
+        return FETCHERS[judge.lower()]()
+    except KeyError:
+        raise FetchError(f"Unknown judge '{judge}'. Choose from: {', '.join(FETCHERS)}")
+
+
+def fetchAndWrite(judge, contestId, problemId):
+    """Fetch one problem with the judge's backend and write it to tests/. Returns True on success."""
+    problemLetter = problemId.upper()
+    try:
+        data = getFetcher(judge).fetchProblem(contestId, problemId)
+    except (FetchError, OSError, http.client.HTTPException) as e:
+        print(f"{RED}ERROR{RESET}: {e}")
+        return False
+
+    metadata = {
+        "contestId": contestId,
+        "problemLetter": problemLetter,
+        "timeLimit": data.timeLimit,
+        "testCount": len(data.tests),
+        "url": data.url,
+    }
+    names = test_writer.writeProblemTests(problemLetter, data.tests, metadata)
+
+    print(f"{GREEN}Downloaded{RESET} {len(names)} sample tests for {judge} {contestId} problem {problemLetter}")
+    print(f"   Time limit: {data.timeLimit}")
+    for name in names:
+        print(f"   {name}.in, {name}.out")
+    print(f"   {problemLetter}_metadata.json")
+    return True
+
+
+def benchmarkParse(judge, htmlPath, repeat=200):
+    """Parse a saved page repeatedly (no network). Returns (ProblemData, seconds per parse)."""
+    fetcher = getFetcher(judge)
+    with open(htmlPath, "r", encoding="utf-8") as f:
+        page = f.read()
+    data = fetcher.parse(page)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fetcher.parse(page)
+    return data, (time.perf_counter() - start) / repeat
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == "bench":
+        repeat = int(args[3]) if len(args) > 3 else 200
+        data, perParse = benchmarkParse(args[1], args[2], repeat)
+        print(f"{BLUE}{args[1]}{RESET}: {len(data.tests)} tests, time limit {data.timeLimit}, "
+              f"{perParse * 1e6:.1f} us/parse over {repeat} runs")
+        sys.exit(0 if data.tests else 1)
+
+    if len(args) != 3:
+        print("Usage: python fetchers.py <judge> <contestId> <problemId>")
+        print("       python fetchers.py bench <judge> <saved_page.html> [repeat]")
+        print(f"Judges: {', '.join(FETCHERS)}")
+        print("Example: python fetchers.py atcoder abc300 A")
+        sys.exit(1)
+
+    success = fetchAndWrite(args[0], args[1].strip(), args[2].strip())
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Machine fingerprint for run reports and history.
+A time means little without the machine behind it, so every report carries the
+CPU model and frequency governor, compiler version, the binary's flags, kernel,
+and a calibration score: the run time of include/calibrate.cpp, a fixed CP-style
+workload. The ratio of two machines' scores converts times between them; with a
+reference machine set (a teammate's box, or the judge through its custom
+invocation) local times are also shown as estimates for that machine.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import subprocess
+
+import build
+from utils import CACHE_DIR, RED, RESET
+
+CALIBRATION_SRC = os.path.join("include", "calibrate.cpp")
+CALIBRATION_TARGET = "calibrate"
+# -O2, as judges build: the score should move with the judge's compiler, not with -O3 tricks
+CALIBRATION_FLAGS = ["-std=c++2b", "-O2"]
+CALIBRATION_RUNS = 3
+CALIBRATION_MAX_AGE = 6 * 3600  # seconds; thermal and load drift make older scores stale
+CALIBRATION_PATH = os.path.join(CACHE_DIR, "calibration.json")
+# Committed with the repo so the whole team normalizes to the same machine
+REFERENCE_PATH = "reference_machine.json"
+
+_machine = None  # the static part, read once per process
+
+
+def cpuModel():
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.strip() in ("model name", "Model", "Hardware", "cpu"):
+                    return " ".join(value.split())
+    except OSError:
+        pass
+    return platform.processor() or platform.machine() or "unknown"
+
+
+def governor():
+    """The cpufreq scaling governor (e.g. performance, powersave), or None where there is none."""
+    try:
+        with open("/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor", "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def compilerVersion():
+    try:
+        result = subprocess.run([build.CXX, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return build.CXX
+    lines = result.stdout.splitlines()
+    return lines[0].strip() if lines else build.CXX
+
+
+def machine():
+    """Everything but flags and calibration: fixed for the life of the process."""
+    global _machine
+    if _machine is None:
+        _machine = {
+            "cpu": cpuModel(),
+            "governor": governor(),
+            "compiler": compilerVersion(),
+            "kernel": f"{platform.system()} {platform.release()}",
+        }
+    return _machine
+
+
+def _machineKey():
+    return hashlib.sha256(json.dumps(machine(), sort_keys=True).encode()).hexdigest()[:12]
+
+
+def measureCalibration():
+    """Best-of-N run time of the calibration benchmark in ms, or None if it cannot be built or run."""
+    target = build.exePath(CALIBRATION_TARGET)
+    if not build.isUpToDate(CALIBRATION_SRC, target, CALIBRATION_FLAGS):
+        os.makedirs("bin", exist_ok=True)
+        result = subprocess.run([build.CXX, *CALIBRATION_FLAGS, "-o", target, CALIBRATION_SRC], capture_output=True)
+        if result.returncode != 0:
+            return None
+        build.markBuilt(target, CALIBRATION_FLAGS)
+    best = None
+    for _ in range(CALIBRATION_RUNS):
+        try:
+            result = subprocess.run([os.path.abspath(target)], capture_output=True, text=True, timeout=60)
+            ms = float(result.stdout.split()[0])
+        except (OSError, subprocess.TimeoutExpired, ValueError, IndexError):
+            return None
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def calibration(force=False):
+    """This machine's calibration score in ms, measured at most every CALIBRATION_MAX_AGE seconds."""
+    key = _machineKey()
+    if not force:
+        try:
+            with open(CALIBRATION_PATH, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["key"] == key and time.time() - cached["measuredAt"] < CALIBRATION_MAX_AGE:
+                return cached["ms"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    ms = measureCalibration()
+    if ms is not None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(CALIBRATION_PATH, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "ms": ms, "measuredAt": time.time()}, f)
+        except OSError:
+            pass
+    return ms
+
+
+def current(executable=None):
+    """
+    The fingerprint of runs of this executable on this machine: machine(), the
+    build flags (from the binary's stamp, else the release CXXFLAGS), the
+    calibration score and an id over everything but the score.
+    """
+    flags = build.builtFlags(executable) if executable else None
+    fingerprint = {**machine(), "flags": " ".join(flags if flags is not None else build.CXXFLAGS)}
+    fingerprint["id"] = hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:12]
+    fingerprint["calibrationMs"] = calibration()
+    return fingerprint
+
+
+def describe(fingerprint):
+    """One line for report footers."""
+    parts = [fingerprint["cpu"]]
+    if fingerprint.get("governor"):
+        parts.append(f"governor {fingerprint['governor']}")
+    parts += [fingerprint["compiler"], fingerprint["flags"], fingerprint["kernel"]]
+    if fingerprint.get("calibrationMs"):
+        parts.append(f"calibration {fingerprint['calibrationMs']:.0f} ms")
+    return " · ".join(parts)
+
+
+def loadReference():
+    """{'name', 'calibrationMs', 'fingerprint'?} of the reference machine, or None."""
+    try:
+        with open(REFERENCE_PATH, "r", encoding="utf-8") as f:
+            reference = json.load(f)
+        return reference if reference.get("calibrationMs") else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def saveReference(name, calibrationMs, fingerprint=None):
+    reference = {"name": name, "calibrationMs": calibrationMs}
+    if fingerprint:
+        reference["fingerprint"] = fingerprint
+    with open(REFERENCE_PATH, "w", encoding="utf-8") as f:
+        json.dump(reference, f, indent=2)
+        f.write("\n")
+
+
+def scaleTo(fingerprint, reference):
+    """(reference name, factor) that turns local seconds into seconds on the reference, or None."""
+    if not reference or not fingerprint.get("calibrationMs"):
+        return None
+    return reference["name"], reference["calibrationMs"] / fingerprint["calibrationMs"]
+
+
+def main():
+    args = sys.argv[1:]
+    flags = {a.split("=", 1)[0]: (a.split("=", 1)[1] if "=" in a else None) for a in args if a.startswith("--")}
+    if any(a for a in args if not a.startswith("--")) or set(flags) - {"--recalibrate", "--set-reference",
+                                                                          "--name", "--clear-reference"}:
+        print("Usage: python fingerprint.py [--recalibrate] [--set-reference[=MS] [--name=NAME]] [--clear-reference]")
+        print("  --set-reference       make this machine the one times are normalized to")
+        print("  --set-reference=MS    use a score measured elsewhere, e.g. include/calibrate.cpp in the judge's custom invocation")
+        sys.exit(1)
+
+    if "--clear-reference" in flags:
+        if os.path.exists(REFERENCE_PATH):
+            os.remove(REFERENCE_PATH)
+        print("Reference machine cleared")
+        return
+
+    calibration(force="--recalibrate" in flags)
+    fingerprint = current()
+    print(describe(fingerprint))
+    if fingerprint["calibrationMs"] is None:
+        print(f"{RED}ERROR{RESET}: could not build or run {CALIBRATION_SRC}")
+        sys.exit(1)
+
+    if "--set-reference" in flags:
+        measured = flags["--set-reference"]
+        try:
+            ms = float(measured) if measured else fingerprint["calibrationMs"]
+        except ValueError:
+            print(f"{RED}ERROR{RESET}: --set-reference expects a score in ms, got '{measured}'")
+            sys.exit(1)
+        name = flags.get("--name") or ("judge" if measured else platform.node() or "reference")
+        saveReference(name, ms, None if measured else fingerprint)
+        print(f"Reference machine: {name} ({ms:.0f} ms), saved to {REFERENCE_PATH}")
+
+    scale = scaleTo(fingerprint, loadReference())
+    if scale:
+        name, factor = scale
+        print(f"1.000s here ≈ {factor:.3f}s on {name}")
+
+
+if __name__ == "__main__":
+    main()
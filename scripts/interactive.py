@@ -5,22 +5,38 @@ Acts as a continuous shell to compile, fetch, and test problems without re-typin
 import os
 import sys
 import glob
+import json
 import subprocess
 import time
-from pathlib import Path
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
 
-import run_tests
+import alloc_tracker
+import build
+import build_matrix
+import build_profile
+import compare
+import complexity
+import fingerprint
+import profiler
+import fetchers
+import sampler
+import test_catalog
+import test_pack
+import test_writer
+import tui
+import workers
+from utils import TEMPLATE
 
 # Path to persist command history across sessions
 _HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".cp_history")
 
 console = Console()
 commandHistory = []
+workerPool = None
 
 
 def _loadHistory():
@@ -43,42 +59,6 @@ def _saveHistory():
     except Exception:
         pass
 
-TEMPLATE = """\
-#include <bits/stdc++.h>
-#ifdef LOCAL
-#include "debug.cpp"
-#define TIME_BLOCK(name, t) \\
-    if (bool _once = false) \\
-    {                       \\
-    }                       \\
-    else                    \\
-        for (__DEBUG_UTIL__::LabeledTimer _t(name, t); !_once; _once = true)
-#else
-#define debug(...) void(0)
-#define debugArr(...) void(0)
-#define TIME_BLOCK(name, t) if (true)
-#endif // Debugging locally
-using namespace std;
-#define ll long long int
-#define endl "\\n"
-
-int main()
-{
-    ios_base::sync_with_stdio(false);
-    cin.tie(nullptr);
-#ifdef LOCAL
-    freopen("input.txt", "r", stdin);
-    freopen("Output.txt", "w", stdout);
-#endif
-    int t = 1;
-    // cin >> t;
-    while (t--)
-    {
-    }
-    return 0;
-}
-"""
-
 
 def clearScreen():
     os.system("cls" if os.name == "nt" else "clear")
@@ -116,19 +96,27 @@ def printStatus():
         table = Table(box=box.SIMPLE, show_header=False)
         table.add_column("Problem", style="bold #e0e0e0")
         table.add_column("Status", style="#84967e")
+        catalog = test_catalog.getCatalog()
         for p in probs:
             exeName = f"bin/{p}" + (".exe" if os.name == "nt" else "")
             status = "[#00ff41]Compiled[/]" if os.path.exists(exeName) else "[#666666]Uncompiled[/]"
 
-            testFiles = glob.glob(f"tests/{p}*.in")
-            if testFiles:
-                status += f" | [#00e5ff]{len(testFiles)} tests found[/]"
+            testCount = catalog.testCount(p.upper())
+            if testCount:
+                status += f" | [#00e5ff]{testCount} tests found[/]"
             else:
                 status += " | [#ff1744]No tests[/]"
 
             table.add_row(f"Problem {p}", status)
         console.print(table)
 
+    jobs = workerPool.jobStatus() if workerPool else []
+    if jobs:
+        console.print("[bold #00ff41]Background:[/]")
+        for label, ok, text in jobs:
+            icon = "[#ff9100]…[/]" if ok is None else "[#00ff41]✔[/]" if ok else "[#ff1744]✖[/]"
+            console.print(f"  {icon} [#e0e0e0]{label}[/] [#666666]{text}[/]")
+
     console.print()
     console.print("[bold #00ff41]Commands:[/]")
     console.print("  [#00e5ff]new \\[prob][/]               - Create src/\\[prob].cpp from template & clean old tests")
@@ -136,13 +124,20 @@ def printStatus():
     console.print("  [#00e5ff]run \\[file][/]               - Compile & run against input.txt (no test comparison)")
     console.print("  [#00e5ff]test \\[prob][/]              - Compile src/\\[prob].cpp & run tests for \\[prob]")
     console.print("  [#00e5ff]test \\[file] \\[prob][/]       - Compile src/\\[file] & run tests for \\[prob]")
-    console.print("  [#00e5ff]debug \\[file] \\[prob][/]      - Compile with sanitizers & run tests")
-    console.print("  [#00e5ff]compile \\[file][/]           - Compile only (e.g. compile C.cpp)")
+    console.print("  [#00e5ff]debug \\[file] \\[prob][/]      - Compile with sanitizers & run tests (--stop-on-sanitizer)")
+    console.print("  [#00e5ff]compare \\[A] \\[B] \\[prob][/]    - Run two solutions side by side: outputs, speedup, memory")
+    console.print("  [#00e5ff]matrix \\[file] \\[prob][/]      - Build under every profile in build_matrix.json & compare")
+    console.print("  [#00e5ff]complexity \\[prob] --max=N[/] - Fit time / memory growth and predict it at the max n")
+    console.print("  [#00e5ff]profile \\[prob] \\[test][/]    - Sample one test: hot functions + flame graph")
+    console.print("  [#00e5ff]fingerprint[/]              - Show this machine's fingerprint and the reference machine")
+    console.print("  [#00e5ff]compile \\[file][/]           - Compile only (e.g. compile C.cpp, add --profile for timings)")
     console.print("  [#00e5ff]addtest \\[prob][/]            - Add a custom test case via editor")
     console.print("  [#00e5ff]listtests \\[prob][/]          - List all test cases for a problem")
     console.print("  [#00e5ff]deltest \\[prob] \\[N][/]       - Delete test case N for a problem")
-    console.print("  [#00e5ff]fetch \\[prob][/]             - Fetch tests (contest / gym / problemset)")
-    console.print("  [#00e5ff]listen[/]                   - Start Competitive Companion listener")
+    console.print("  [#00e5ff]pack / unpack \\[prob][/]     - Pack tests into tests/\\[prob].pack or back into files")
+    console.print("  [#00e5ff]fetch \\[prob][/]             - Fetch tests (Codeforces, AtCoder, CodeChef, CSES)")
+    console.print("  [#00e5ff]schedule-fetch \\[id] \\[time][/] - Wait for a contest to start, then fetch every problem")
+    console.print("  [#00e5ff]listen \\[--auto][/]          - Start Competitive Companion listener (--auto: compile + test)")
     console.print("  [#00e5ff]history[/]                  - Show recent commands")
     console.print("  [#00e5ff]help[/]                     - Show detailed usage examples")
     console.print("  [#00e5ff]clear[/]                    - Clear screen and redraw dashboard")
@@ -150,6 +145,24 @@ def printStatus():
     console.print()
 
 
+def splitFlags(args):
+    """Separates --flags from positional arguments: (positional, set of flags)."""
+    positional = [a for a in args if not a.startswith("--")]
+    flags = {a.lower() for a in args if a.startswith("--")}
+    return positional, flags
+
+
+def flagValue(flags, name, default):
+    """Integer value of a --name=N flag, or default."""
+    for flag in flags:
+        if flag.startswith(name + "="):
+            try:
+                return max(1, int(flag.split("=", 1)[1]))
+            except ValueError:
+                pass
+    return default
+
+
 def parseFileAndProblem(args):
     """Parses arguments into (source_file, target_exe, prob_prefix)."""
     if len(args) == 0:
@@ -169,6 +182,52 @@ def parseFileAndProblem(args):
         return src, target, prob
 
 
+def compileOnPool(src, target, debug=False, extraFlags=()):
+    """Compile src/<src> into bin/<target> on the warm worker pool and echo compiler output."""
+    result = workerPool.compile(f"src/{src}", target, debug, extraFlags=extraFlags).result()
+    if result.diagnostics:
+        console.print(tui.buildDiagnosticsTable(result.diagnostics))
+        if result.cached:
+            console.print("[#666666](unchanged source - diagnostics from cache, not recompiled)[/]")
+    if result.output.strip():
+        console.print(result.output.rstrip(), highlight=False, markup=False)
+    return result.success
+
+
+# Codeforces types go through `make fetch`; the rest use the in-process judge backends
+FETCH_TYPES = ["contest", "gym", "problemset", "atcoder", "codechef", "cses"]
+_FETCH_ID_LABELS = {
+    "contest": "Contest ID",
+    "gym": "Gym ID",
+    "problemset": "Problemset ID",
+    "atcoder": "AtCoder contest (e.g. abc300)",
+    "codechef": "CodeChef contest code (e.g. START100 or PRACTICE)",
+    "cses": None,  # single problem set, no contest ID
+}
+
+
+def askFetchSource():
+    """Prompts for where to fetch from. Returns (fetchType, fetchId); fetchId is empty if none was given."""
+    fetchType = Prompt.ask(
+        "[#00e5ff]Fetch type[/]",
+        choices=FETCH_TYPES,
+        default="contest"
+    )
+    label = _FETCH_ID_LABELS[fetchType]
+    if label is None:
+        return fetchType, "problemset"
+    return fetchType, Prompt.ask(f"[#00e5ff]Enter {label}[/]").strip()
+
+
+def runFetch(fetchType, fetchId, prob):
+    console.print(f"\n[#666666]Fetching {fetchType} {fetchId} problem {prob}...[/]")
+    if fetchType in ("contest", "gym", "problemset"):
+        makeVar = fetchType.upper()  # CONTEST=, GYM=, PROBLEMSET=
+        subprocess.run(["make", "fetch", f"{makeVar}={fetchId}", f"PROBLEM={prob}"])
+    else:
+        fetchers.fetchAndWrite(fetchType, fetchId, prob)
+
+
 def openInVscode(filePath):
     """Open a file in VS Code (silent if 'code' CLI is unavailable)."""
     import shutil
@@ -180,6 +239,8 @@ def openInVscode(filePath):
 
 
 def mainLoop():
+    global workerPool
+
     # Make sure we are in the project root by going up if run inside scripts/
     if os.path.basename(os.getcwd()) == "scripts":
         os.chdir("..")
@@ -187,6 +248,9 @@ def mainLoop():
     # Load persisted history from previous sessions
     commandHistory.extend(_loadHistory())
 
+    # Compile/test workers and the reporter stay warm for the whole session
+    workerPool = workers.WorkerPool()
+
     clearScreen()
     try:
         while True:
@@ -227,30 +291,69 @@ def mainLoop():
                 console.print("\n[bold #00e5ff]CodeRunner Interactive Shell Help[/]")
                 console.print("\n[#00ff41]1. new \\[prob][/]")
                 console.print("   Creates a fresh C++ file and opens it in VS Code. (e.g. [#e0e0e0]new C[/])")
+                console.print("   The file is built (warming the precompiled header) and tests are fetched in the background.")
                 console.print("\n[#00ff41]2. open \\[prob][/]")
                 console.print("   Opens the problem's C++ file in VS Code. (e.g. [#e0e0e0]open C[/] or just [#e0e0e0]open[/])")
                 console.print("\n[#00ff41]3. run \\[file][/]")
                 console.print("   Compiles a file and runs it against input.txt. No test comparison. (e.g. [#e0e0e0]run[/] or [#e0e0e0]run C[/])")
                 console.print("\n[#00ff41]4. test \\[prob][/]")
                 console.print("   Compiles src/C.cpp and runs it against tests for problem C. (e.g. [#e0e0e0]test C[/])")
+                console.print("   Unchanged binary + test pairs reuse their cached verdict; [#e0e0e0]--fresh[/] re-runs everything.")
+                console.print("   Tests that failed last time run first; [#e0e0e0]--fail-fast[/] stops at the first failing test.")
+                console.print("   [#e0e0e0]--jobs=N[/] runs N tests at once (timings get noisier under load).")
+                console.print("   [#e0e0e0]--sample[=MS][/] records RSS / CPU / page faults every MS ms and shows them as sparklines.")
+                console.print("   [#e0e0e0]--isolate[/] pins each run to its own core at raised priority; [#e0e0e0]--repeat=N[/] reports median time ± 95% band.")
+                console.print("   [#e0e0e0]--records[/] builds with -DDEBUG_RECORDS and totals every TIME_BLOCK across all tests.")
+                console.print("   [#e0e0e0]--memprofile[/] tracks heap allocations: top allocating lines at the peak, static arrays apart (Linux).")
+                console.print("   [#e0e0e0]--normalize[/] adds each time as an estimate for the reference machine (see fingerprint).")
                 console.print("\n[#00ff41]5. test \\[file] \\[prob][/]")
                 console.print("   Compiles a specific file and runs tests. (e.g. [#e0e0e0]test C.cpp C[/])")
                 console.print("\n[#00ff41]6. debug \\[file] \\[prob][/]")
                 console.print("   Same as test, but compiles with sanitizer flags. (e.g. [#e0e0e0]debug C.cpp C[/])")
+                console.print("   ASan/UBSan reports are grouped into one table of unique findings.")
+                console.print("   Add [#e0e0e0]--stop-on-sanitizer[/] to stop the batch at the first sanitizer error.")
                 console.print("\n[#00ff41]7. compile \\[file][/]")
                 console.print("   Just compiles a file without running tests. (e.g. [#e0e0e0]compile C.cpp[/])")
+                console.print("   [#e0e0e0]compile C --profile[/] breaks the build time down by phase and #include,")
+                console.print("   records the binary size, and shows the trend across builds of src/C.cpp.")
                 console.print("\n[#00ff41]8. addtest \\[prob][/]")
                 console.print("   Opens a textual editor to write a custom test case (input + expected output). (e.g. [#e0e0e0]addtest C[/])")
                 console.print("\n[#00ff41]9. listtests \\[prob][/]")
                 console.print("   Lists all test files for a problem with sizes and status. (e.g. [#e0e0e0]listtests C[/])")
                 console.print("\n[#00ff41]10. deltest \\[prob] \\[N][/]")
                 console.print("   Deletes test case N for a problem (with confirmation). (e.g. [#e0e0e0]deltest C 3[/])")
-                console.print("\n[#00ff41]11. fetch \\[prob][/]")
-                console.print("   Fetches sample tests interactively (contest/gym/problemset). (e.g. [#e0e0e0]fetch C[/])")
-                console.print("\n[#00ff41]12. listen[/]")
+                console.print("\n[#00ff41]11. pack \\[prob] \\[--zstd|--gzip|--none][/]")
+                console.print("   Packs all tests of a problem into one indexed file, tests/\\[prob].pack. (e.g. [#e0e0e0]pack C[/])")
+                console.print("   Tests are read straight from the pack; loose files with the same name take precedence.")
+                console.print("\n[#00ff41]12. unpack \\[prob][/]")
+                console.print("   Exports a packed problem back to .in/.out files. (e.g. [#e0e0e0]unpack C[/])")
+                console.print("\n[#00ff41]13. fetch \\[prob][/]")
+                console.print("   Fetches sample tests interactively (contest/gym/problemset/atcoder/codechef/cses). (e.g. [#e0e0e0]fetch C[/])")
+                console.print("\n[#00ff41]14. schedule-fetch \\[contest] \\[time] \\[problems][/]")
+                console.print("   Sleeps until the contest starts, then fetches all problems at once, retrying with backoff.")
+                console.print("   (e.g. [#e0e0e0]schedule-fetch 2139 17:35 A-F[/], [#e0e0e0]schedule-fetch abc300 +5m --judge=atcoder[/])")
+                console.print("\n[#00ff41]15. listen[/]")
                 console.print("   Starts Competitive Companion listener to fetch tests from your browser.")
-                console.print("\n[#00ff41]13. history[/]")
+                console.print("   [#e0e0e0]--auto[/] compiles and tests each received problem, or creates src/\\[prob].cpp and pre-builds it.")
+                console.print("\n[#00ff41]16. history[/]")
                 console.print("   Shows a list of the last 20 commands you typed.")
+                console.print("\n[#00ff41]17. compare \\[fileA] \\[fileB] \\[prob][/]")
+                console.print("   Runs both solutions on every test (plus max tests from src/\\[prob]_gen.cpp), interleaved,")
+                console.print("   flags differing outputs and reports speedup / memory ratios with 95% CIs. (e.g. [#e0e0e0]compare C C2 C[/])")
+                console.print("   [#e0e0e0]--repeat=N[/] rounds per test (default 5), [#e0e0e0]--gen=N[/] generated tests (default 3), [#e0e0e0]--no-isolate[/].")
+                console.print("\n[#00ff41]18. complexity \\[prob] --max=N[/]")
+                console.print("   Times src/\\[prob].cpp on inputs from [#e0e0e0]\\[prob]_gen <seed> <n>[/] for n = 1000, 2000, 4000, ...,")
+                console.print("   fits O(n), O(n log n), O(n²), ... and predicts the time at n = max. (e.g. [#e0e0e0]complexity C --max=2e5[/])")
+                console.print("\n[#00ff41]19. profile \\[prob] \\[test][/]")
+                console.print("   Builds at -O2 with frame pointers, samples one test (the largest by default) with perf or gprof,")
+                console.print("   lists the hottest functions and writes a flame graph SVG. (e.g. [#e0e0e0]profile C C3 --top=10[/])")
+                console.print("\n[#00ff41]20. matrix \\[file] \\[prob][/]")
+                console.print("   Builds the solution under each profile of build_matrix.json (-O2, _GLIBCXX_DEBUG, -m32, ...) in parallel,")
+                console.print("   runs the tests under each and shows verdicts and times side by side. (e.g. [#e0e0e0]matrix C --profiles=O2,m32[/])")
+                console.print("\n[#00ff41]21. fingerprint[/]")
+                console.print("   Shows CPU, governor, compiler, flags, kernel and calibration score, as attached to every report.")
+                console.print("   [#e0e0e0]--recalibrate[/] re-measures the score. Set the reference machine with")
+                console.print("   [#e0e0e0]python scripts/fingerprint.py --set-reference\\[=MS] --name=NAME[/] (MS from include/calibrate.cpp on the judge).")
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
 
@@ -267,6 +370,10 @@ def mainLoop():
                         f.write(TEMPLATE)
                     console.print(f"\n[#00ff41]Created {cppFile} with template.[/]")
 
+                    # Warm the PCH and build the template while the statement is read and tests fetched
+                    workerPool.prebuild(cppFile, prob)
+                    console.print(f"[#666666]Building {cppFile} in the background...[/]")
+
                     console.print(f"[#666666]Opening {cppFile} in VS Code...[/]")
                     openInVscode(cppFile)
 
@@ -278,7 +385,7 @@ def mainLoop():
                     )
                     if fetchNow == "y":
                         # Only delete old tests when we are about to replace them
-                        oldTests = glob.glob(f"tests/{prob}*")
+                        oldTests = test_catalog.getCatalog().files(prob)
                         for testFile in oldTests:
                             try:
                                 os.remove(testFile)
@@ -287,19 +394,12 @@ def mainLoop():
                         if oldTests:
                             console.print(f"[#666666]Deleted {len(oldTests)} old test files for {prob}.[/]")
 
-                        fetchType = Prompt.ask(
-                            "[#00e5ff]Fetch type[/]",
-                            choices=["contest", "gym", "problemset"],
-                            default="contest"
-                        )
-                        labelMap = {"contest": "Contest ID", "gym": "Gym ID", "problemset": "Problemset ID"}
-                        fetchId = Prompt.ask(f"[#00e5ff]Enter {labelMap[fetchType]}[/]").strip()
+                        fetchType, fetchId = askFetchSource()
                         if not fetchId:
                             console.print("\n[bold #ff1744]No ID provided. Skipping fetch.[/]")
                         else:
-                            console.print(f"\n[#666666]Fetching {fetchType} {fetchId} problem {prob}...[/]")
-                            makeVar = fetchType.upper()
-                            subprocess.run(["make", "fetch", f"{makeVar}={fetchId}", f"PROBLEM={prob}"])
+                            workerPool.fetch(fetchType, fetchId, prob)
+                            console.print(f"\n[#666666]Fetching {fetchType} {fetchId} problem {prob} in the background...[/]")
 
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
@@ -332,8 +432,7 @@ def mainLoop():
                     target = src.replace(".cpp", "")
 
                 console.print(f"\n[#666666]Compiling src/{src}...[/]")
-                res = subprocess.run(["make", "all", f"SRC=src/{src}", f"TARGET=bin/{target}"])
-                if res.returncode != 0:
+                if not compileOnPool(src, target):
                     console.print("\n[bold #ff1744]Compilation failed.[/]")
                     Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                     clearScreen()
@@ -388,8 +487,102 @@ def mainLoop():
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
 
+            # ── compare ─────────────────────────────────────────────────────────
+            elif action == "compare":
+                positional, flags = splitFlags(args)
+                if len(positional) != 3:
+                    console.print("\n[bold #ff1744]Specify two files and a problem (e.g., compare C C2 C)[/]")
+                else:
+                    sources = [f"src/{name if name.endswith('.cpp') else name + '.cpp'}" for name in positional[:2]]
+                    missing = [src for src in sources if not os.path.exists(src)]
+                    if missing:
+                        console.print(f"\n[bold #ff1744]{', '.join(missing)} not found.[/]")
+                    else:
+                        compare.compare(
+                            *sources, positional[2].upper(),
+                            repeat=flagValue(flags, "--repeat", compare.DEFAULT_REPEAT),
+                            generated=flagValue(flags, "--gen", compare.DEFAULT_GENERATED),
+                            isolate="--no-isolate" not in flags,
+                            reporter=workerPool.reporter
+                        )
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
+            # ── matrix ──────────────────────────────────────────────────────────
+            elif action == "matrix":
+                positional, flags = splitFlags(args)
+                src, _, probPrefix = parseFileAndProblem(positional)
+                if not os.path.exists(f"src/{src}"):
+                    console.print(f"\n[bold #ff1744]src/{src} not found.[/]")
+                else:
+                    names = next((f.split("=", 1)[1].split(",") for f in flags if f.startswith("--profiles=")), None)
+                    build_matrix.runMatrix(
+                        f"src/{src}", probPrefix, names,
+                        reporter=workerPool.reporter,
+                        executor=workerPool.compileExecutor,
+                        fresh="--fresh" in flags,
+                        repeat=flagValue(flags, "--repeat", 1)
+                    )
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
+            # ── complexity ──────────────────────────────────────────────────────
+            elif action == "complexity":
+                positional, flags = splitFlags(args)
+                maxN = next((f.split("=", 1)[1] for f in flags if f.startswith("--max=")), None)
+                try:
+                    maxN = int(float(maxN)) if maxN else None
+                except ValueError:
+                    maxN = None
+                if not positional or not maxN:
+                    console.print("\n[bold #ff1744]Specify a problem and its max n (e.g., complexity C --max=2e5)[/]")
+                else:
+                    complexity.estimate(
+                        positional[0].upper(), maxN,
+                        start=flagValue(flags, "--from", complexity.DEFAULT_START),
+                        repeat=flagValue(flags, "--repeat", complexity.DEFAULT_REPEAT),
+                        reporter=workerPool.reporter
+                    )
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
+            # ── profile ─────────────────────────────────────────────────────────
+            elif action == "profile":
+                positional, flags = splitFlags(args)
+                if not positional:
+                    console.print("\n[bold #ff1744]Specify a problem and optionally a test (e.g., profile C C3)[/]")
+                else:
+                    profiler.profile(
+                        positional[0].upper(), positional[1] if len(positional) > 1 else None,
+                        top=flagValue(flags, "--top", profiler.TOP_N),
+                        backend="gprof" if "--gprof" in flags else None,
+                        reporter=workerPool.reporter
+                    )
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
+            # ── fingerprint ─────────────────────────────────────────────────────
+            elif action == "fingerprint":
+                _, flags = splitFlags(args)
+                with console.status("[#666666]Calibrating...[/]"):
+                    fingerprint.calibration(force="--recalibrate" in flags)
+                    machine = fingerprint.current()
+                console.print(f"\n[#e0e0e0]{fingerprint.describe(machine)}[/]")
+                if machine["calibrationMs"] is None:
+                    console.print(f"[bold #ff1744]Could not build or run {fingerprint.CALIBRATION_SRC}[/]")
+                reference = fingerprint.loadReference()
+                scale = fingerprint.scaleTo(machine, reference)
+                if scale:
+                    console.print(f"[#666666]Reference: {reference['name']} ({reference['calibrationMs']:.0f} ms), "
+                                  f"1.000s here ≈ {scale[1]:.3f}s there[/]")
+                else:
+                    console.print("[#666666]No reference machine set.[/]")
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
             # ── compile ─────────────────────────────────────────────────────────
             elif action == "compile":
+                args, flags = splitFlags(args)
                 if not args:
                     console.print("\n[bold #ff1744]Specify a file to compile (e.g., compile F.cpp)[/]")
                 else:
@@ -398,9 +591,18 @@ def mainLoop():
                     if not src.endswith(".cpp"):
                         src += ".cpp"
                     target = src.replace(".cpp", "")
-                    console.print(f"\n[#666666]Compiling src/{src}...[/]")
-                    res = subprocess.run(["make", "all", f"SRC=src/{src}", f"TARGET=bin/{target}"])
-                    if res.returncode == 0:
+                    if "--profile" in flags:
+                        console.print(f"\n[#666666]Profiling build of src/{src} (-ftime-report + per-header costs)...[/]")
+                        record, output = workerPool.compileExecutor.submit(
+                            build_profile.profileBuild, f"src/{src}", target
+                        ).result()
+                        if record is None:
+                            console.print(output.rstrip(), highlight=False, markup=False)
+                            console.print("\n[bold #ff1744]Compilation failed.[/]")
+                        else:
+                            for table in tui.buildProfileTables(record, build_profile.loadHistory(f"src/{src}")):
+                                console.print(table)
+                    elif compileOnPool(src, target):
                         console.print("\n[bold #00ff41]Compilation successful.[/]")
                     else:
                         console.print("\n[bold #ff1744]Compilation failed.[/]")
@@ -409,19 +611,40 @@ def mainLoop():
 
             # ── test / debug ─────────────────────────────────────────────────────────
             elif action in ["test", "debug"]:
+                args, flags = splitFlags(args)
                 src, target, probPrefix = parseFileAndProblem(args)
                 makeTarget = "debug" if action == "debug" else "all"
+                if workerPool.isRunning(f"fetch {probPrefix}"):
+                    console.print(f"\n[#666666]Waiting for the background fetch of {probPrefix}...[/]")
+                    workerPool.waitFor(f"fetch {probPrefix}")
 
                 console.print(f"\n[#666666]Compiling src/{src} ({makeTarget})...[/]")
-                res = subprocess.run(["make", makeTarget, f"SRC=src/{src}", f"TARGET=bin/{target}"])
-                if res.returncode != 0:
+                memProfile = "--memprofile" in flags
+                if memProfile and action == "debug":
+                    # ASan must be the first library loaded, so it cannot share the process with the tracker
+                    console.print("\n[#ff9100]--memprofile is ignored for sanitizer builds; use test instead.[/]")
+                    memProfile = False
+                extraFlags = [*([build.RECORDS_DEFINE] if "--records" in flags else []),
+                              *(alloc_tracker.SOLUTION_FLAGS if memProfile else [])]
+                if not compileOnPool(src, target, debug=(action == "debug"), extraFlags=extraFlags):
                     console.print("\n[bold #ff1744]Compilation failed. Aborting tests.[/]")
                     Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                     clearScreen()
                     continue
 
                 console.print(f"\n[#666666]Running tests for {probPrefix}...[/]")
-                run_tests.runTestsForProblem(probPrefix, f"bin/{target}")
+                workerPool.runTests(
+                    probPrefix, f"bin/{target}",
+                    stopOnSanitizer="--stop-on-sanitizer" in flags,
+                    fresh="--fresh" in flags,
+                    failFast="--fail-fast" in flags,
+                    jobs=flagValue(flags, "--jobs", 1),
+                    sampleInterval=sampler.DEFAULT_INTERVAL_MS if "--sample" in flags else flagValue(flags, "--sample", None),
+                    isolate="--isolate" in flags,
+                    repeat=flagValue(flags, "--repeat", 1),
+                    memProfile=memProfile,
+                    normalize="--normalize" in flags
+                )
 
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
@@ -439,13 +662,7 @@ def mainLoop():
 
                 prob = args[0].upper() if args else "CODE"
 
-                existingIns = glob.glob(f"tests/{prob}*.in")
-                indices = []
-                for inF in existingIns:
-                    suffix = Path(inF).stem[len(prob):]
-                    if suffix.isdigit():
-                        indices.append(int(suffix))
-                nextIdx = max(indices, default=0) + 1
+                nextIdx = test_catalog.getCatalog().nextIndex(prob)
                 testName = f"{prob}{nextIdx}"
 
                 console.print(f"\n[#00e5ff]Creating test case [bold]{testName}[/][/]")
@@ -479,6 +696,11 @@ def mainLoop():
                     f.write(inputApp.result)
                 with open(outFile, "w", encoding="utf-8") as f:
                     f.write(outputApp.result)
+                # Without metadata the catalog reads A11 as test 11 of A, not test 1 of A1
+                metaFile = f"tests/{prob}_metadata.json"
+                if not os.path.exists(metaFile) and test_catalog.getCatalog().packPath(prob) is None:
+                    with open(metaFile, "w", encoding="utf-8") as f:
+                        json.dump({"problemLetter": prob}, f, indent=2)
 
                 console.print(f"\n[bold #00ff41]\u2714 Saved:[/] [#e0e0e0]{inFile}[/]  [#666666]&[/]  [#e0e0e0]{outFile}[/]")
                 console.print(f"[#666666]Run [#00e5ff]test {prob}[/] to include this case in your test suite.[/]")
@@ -488,9 +710,9 @@ def mainLoop():
             # ── listtests ─────────────────────────────────────────────────────────────
             elif action == "listtests":
                 prob = args[0].upper() if args else "CODE"
-                inputFiles = sorted(glob.glob(f"tests/{prob}*.in"))
+                tests = test_catalog.getCatalog().tests(prob)
 
-                if not inputFiles:
+                if not tests:
                     console.print(f"\n[#ff1744]No test files found for problem {prob}.[/]")
                 else:
                     table = Table(
@@ -504,20 +726,21 @@ def mainLoop():
                     table.add_column(".out", justify="center", width=8)
                     table.add_column("Output Size", justify="right", style="#84967e")
 
-                    for inPath in inputFiles:
-                        stem    = Path(inPath).stem
-                        outPath = f"tests/{stem}.out"
-                        inSize  = f"{os.path.getsize(inPath)} B"
-                        if os.path.exists(outPath):
+                    for test in tests:
+                        inSize  = f"{test.inputSize} B"
+                        if test.hasOutput:
                             outBadge = "[#00ff41]\u2714[/]"
-                            outSize  = f"{os.path.getsize(outPath)} B"
+                            outSize  = f"{test.outputSize} B"
                         else:
                             outBadge = "[#ff1744]\u2716 missing[/]"
                             outSize  = "—"
-                        table.add_row(stem, inSize, outBadge, outSize)
+                        table.add_row(test.name, inSize, outBadge, outSize)
 
                     console.print()
                     console.print(table)
+                    packedCount = sum(1 for t in tests if t.isPacked)
+                    if packedCount:
+                        console.print(f"[#666666]{packedCount} of {len(tests)} tests are read from tests/{prob}.pack.[/]")
                     console.print(f"[#666666]Tip: [#00e5ff]deltest {prob} <N>[/] removes a test case.[/]")
 
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
@@ -536,7 +759,10 @@ def mainLoop():
 
                     toDelete = [f for f in [inFile, outFile] if os.path.exists(f)]
 
-                    if not toDelete:
+                    packed = any(t.name == testName and t.isPacked for t in test_catalog.getCatalog().tests(prob))
+                    if not toDelete and packed:
+                        console.print(f"\n[#ff1744]Test [bold]{testName}[/] is packed. Run [#00e5ff]unpack {prob}[/] first.[/]")
+                    elif not toDelete:
                         console.print(f"\n[#ff1744]No files found for test [bold]{testName}[/].[/]")
                     else:
                         console.print(f"\n[#ff9100]About to delete:[/]")
@@ -558,6 +784,31 @@ def mainLoop():
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
 
+            # ── pack / unpack ─────────────────────────────────────────────────────────
+            elif action in ("pack", "unpack"):
+                positional, flags = splitFlags(args)
+                prob = positional[0].upper() if positional else "CODE"
+                try:
+                    if action == "pack":
+                        codec = next((c for c in test_pack.CODECS if f"--{c}" in flags), None)
+                        count = test_writer.packProblem(prob, codec)
+                        done = f"Packed {count} tests into tests/{prob}.pack"
+                    else:
+                        count = test_writer.unpackProblem(prob)
+                        done = f"Unpacked {count} tests into tests/"
+                except (OSError, test_pack.PackError) as e:
+                    console.print(f"\n[bold #ff1744]✖ {e}[/]")
+                else:
+                    if count:
+                        console.print(f"\n[bold #00ff41]\u2714 {done}[/]")
+                    elif action == "pack":
+                        console.print(f"\n[#ff1744]No test files found for problem {prob}.[/]")
+                    else:
+                        console.print(f"\n[#ff1744]Problem {prob} has no packed tests.[/]")
+
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
             # ── fetch ─────────────────────────────────────────────────────────────────
             elif action == "fetch":
                 if not args:
@@ -567,31 +818,39 @@ def mainLoop():
                     continue
 
                 prob = args[0].upper()
-                fetchType = Prompt.ask(
-                    "[#00e5ff]Fetch type[/]",
-                    choices=["contest", "gym", "problemset"],
-                    default="contest"
-                )
-
-                labelMap = {"contest": "Contest ID", "gym": "Gym ID", "problemset": "Problemset ID"}
-                fetchId = Prompt.ask(f"[#00e5ff]Enter {labelMap[fetchType]}[/]").strip()
+                fetchType, fetchId = askFetchSource()
 
                 if not fetchId:
                     console.print("\n[bold #ff1744]No ID provided. Aborting.[/]")
                 else:
-                    console.print(f"\n[#666666]Fetching {fetchType} {fetchId} problem {prob}...[/]")
-                    makeVar = fetchType.upper()  # CONTEST=, GYM=, PROBLEMSET=
-                    subprocess.run(["make", "fetch", f"{makeVar}={fetchId}", f"PROBLEM={prob}"])
+                    runFetch(fetchType, fetchId, prob)
 
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
                 clearScreen()
 
+            # ── schedule-fetch ────────────────────────────────────────────────────────
+            elif action == "schedule-fetch":
+                positional, flags = splitFlags(args)
+                if len(positional) < 2:
+                    console.print("\n[bold #ff1744]Specify a contest and a start time (e.g., schedule-fetch 2139 17:35 A-F)[/]")
+                else:
+                    judge = next((f.split("=", 1)[1] for f in flags if f.startswith("--judge=")), "contest")
+                    console.print("[#666666]Press Ctrl+C to cancel.[/]\n")
+                    try:
+                        subprocess.run([sys.executable, "scripts/scheduler.py", judge, *positional[:3]])
+                    except KeyboardInterrupt:
+                        pass
+                Prompt.ask("\n[#666666]Press Enter to continue...[/]")
+                clearScreen()
+
             # ── listen ────────────────────────────────────────────────────────────────
             elif action == "listen":
+                _, flags = splitFlags(args)
+                auto = "--auto" in flags
                 console.print("\n[#666666]Starting Competitive Companion listener on port 10043...[/]")
                 console.print("[#666666]Press Ctrl+C to stop.[/]\n")
                 try:
-                    subprocess.run(["make", "listen"])
+                    subprocess.run(["make", "listen-auto" if auto else "listen"])
                 except KeyboardInterrupt:
                     pass
                 Prompt.ask("\n[#666666]Press Enter to continue...[/]")
@@ -606,6 +865,8 @@ def mainLoop():
     except (KeyboardInterrupt, EOFError):
         console.print("\n[#00e5ff]Exiting CodeRunner...[/]")
     finally:
+        if workerPool is not None:
+            workerPool.shutdown()
         _saveHistory()
 
 
@@ -0,0 +1,105 @@
+"""
+Per-test I/O accounting.
+Counts the bytes a solution reads and writes and how many read/write syscalls
+it makes, so slow I/O (endl, flush per line, unsynced streams) shows up as many
+tiny writes instead of as a mysterious TLE. Linux reads /proc/<pid>/io once the
+process has exited but before it is reaped, so the totals are exact; elsewhere
+psutil's counters are polled while it runs.
+"""
+import os
+
+try:
+    import psutil
+    _hasPsutil = True
+except ImportError:
+    _hasPsutil = False
+
+# Exit-time capture works wherever /proc/<pid>/io exists; polling is only the fallback
+_canCapture = hasattr(os, "waitid") and os.path.exists("/proc/self/io")
+
+# A run is flagged when it makes at least this many writes averaging fewer bytes than SMALL_WRITE
+MANY_WRITES = 1000
+SMALL_WRITE = 64
+
+
+def _readProcIo(pid):
+    counters = {}
+    with open(f"/proc/{pid}/io", "r") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            counters[key] = int(value)
+    return {"read": counters["rchar"], "written": counters["wchar"],
+            "reads": counters["syscr"], "writes": counters["syscw"]}
+
+
+def _readPsutilIo(process):
+    io = process.io_counters()
+    return {"read": getattr(io, "read_chars", io.read_bytes), "written": getattr(io, "write_chars", io.write_bytes),
+            "reads": io.read_count, "writes": io.write_count}
+
+
+class IoProbe:
+    """Collects one process's I/O counters: poll() while it runs, capture() right after it exits."""
+
+    def __init__(self):
+        self.counters = None
+        self.exact = False
+        self._process = None
+
+    def poll(self, pid):
+        """Latest counters of a running process (the fallback where exit-time capture is impossible)."""
+        if _canCapture or not _hasPsutil:
+            return
+        try:
+            if self._process is None:
+                self._process = psutil.Process(pid)
+            self.counters = _readPsutilIo(self._process)
+        except (psutil.Error, AttributeError, OSError):
+            pass
+
+    def capture(self, pid):
+        """Final counters of an exited, not yet reaped (zombie) process."""
+        try:
+            self.counters = _readProcIo(pid)
+            self.exact = True
+        except (OSError, KeyError, ValueError):
+            pass
+
+    def summary(self, execTime):
+        """details["io"] for the run: byte/syscall totals plus MB/s, or None when nothing was measured."""
+        if self.counters is None:
+            return None
+        io = dict(self.counters)
+        seconds = max(execTime, 1e-6)
+        io["readRate"] = io["read"] / seconds / 1e6
+        io["writeRate"] = io["written"] / seconds / 1e6
+        io["exact"] = self.exact
+        return io
+
+
+def exited(proc, probe, wait=False):
+    """
+    Popen.poll() (or wait() with wait=True) that first captures the probe's
+    counters when the process has exited: waitid(WNOWAIT) sees the exit without
+    reaping, so /proc/<pid>/io is still there.
+    """
+    if probe is not None and _canCapture:
+        try:
+            flags = os.WEXITED | os.WNOWAIT | (0 if wait else os.WNOHANG)
+            if os.waitid(os.P_PID, proc.pid, flags) is None:
+                return False
+            probe.capture(proc.pid)
+        except ChildProcessError:
+            pass
+    if wait:
+        proc.wait()
+        return True
+    return proc.poll() is not None
+
+
+def smallWrites(io):
+    """(writes, average bytes per write) when a run made many tiny writes, else None."""
+    if not io or io["writes"] < MANY_WRITES:
+        return None
+    average = io["written"] / io["writes"]
+    return (io["writes"], average) if average < SMALL_WRITE else None
@@ -0,0 +1,371 @@
+"""
+Sampling profiler for a single test.
+Builds the solution at -O2 with frame pointers and debug info and runs it on one
+test under `perf record`, or under gprof's SIGPROF sampling (a -pg build) where
+perf is missing or not permitted; neither attaches with ptrace. The samples are
+folded into `main;solve;dfs <weight>` stacks, rendered as a self-contained
+flame-graph SVG, and the hottest functions are ranked by self time.
+"""
+import os
+import re
+import sys
+import html
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from collections import Counter
+
+import build
+import run_tests
+import test_catalog
+import tui
+from utils import CACHE_DIR, RED, RESET
+
+PROFILE_DIR = os.path.join(CACHE_DIR, "profiles")
+# `make debug` keeps frame pointers too, but -O0 would profile code the judge never runs
+PROFILE_FLAGS = ["-std=c++2b", "-O2", "-g", "-fno-omit-frame-pointer", "-DLOCAL", "-Iinclude"]
+# gprof drops samples in a position-independent executable and in clones such as
+# foo.isra.0 or foo.cold (their time lands on a neighbour like frame_dummy)
+GPROF_FLAGS = ["-pg", "-no-pie", "-fno-ipa-sra", "-fno-ipa-cp-clone", "-fno-partial-inlining",
+               "-fno-reorder-blocks-and-partition"]
+PERF_FREQUENCY = 999
+TOP_N = 15
+# Profiled runs are slower than judged ones; never cut them off before this
+MIN_TIMEOUT = 10
+
+_PERF_OFFSET = re.compile(r"\+0x[0-9a-f]+$")
+_GPROF_PRIMARY = re.compile(r"^\[(\d+)\]\s+[\d.]+\s+([\d.]+)\s+([\d.]+)\s+(?:[\d+]+\s+)?(.+?)\s+\[\d+\]\s*$")
+_GPROF_PARENT = re.compile(r"^\s+[\d.]+\s+[\d.]+\s+(\d+)(?:/\d+)?\s+(.+?)\s+\[(\d+)\]\s*$")
+_MAX_DEPTH = 64
+
+
+def shortName(name):
+    """
+    Display name with template arguments and the return type dropped and long
+    parameter lists elided: void std::sort<int*>(int*, int*) -> std::sort<…>(int*, int*).
+    """
+    result = []
+    depth = 0
+    for ch in name:
+        if ch == "<":
+            if depth == 0:
+                result.append("<…>")
+            depth += 1
+        elif ch == ">" and depth:
+            depth -= 1
+        elif depth == 0:
+            result.append(ch)
+    short = "".join(result)
+    head, paren, params = short.partition("(")
+    words = head.split(" ")
+    # Function templates are printed with their return type; `operator new` keeps its space
+    if len(words) > 1 and not words[-2].endswith("operator"):
+        head = words[-1]
+    if len(params) > 30:
+        params = "…)"
+    return head + paren + params
+
+
+class Profile:
+    """Folded stacks {"main;solve;dfs": weight}, root first; weights are samples or seconds."""
+
+    def __init__(self, stacks, backend, unit):
+        self.stacks = stacks
+        self.backend = backend
+        self.unit = unit
+
+    @property
+    def total(self):
+        return sum(self.stacks.values())
+
+    def hotFunctions(self, limit=TOP_N):
+        """[(function, self weight, total weight)] by self weight; total counts a function once per stack."""
+        selfWeight = Counter()
+        totalWeight = Counter()
+        for stack, weight in self.stacks.items():
+            frames = stack.split(";")
+            selfWeight[frames[-1]] += weight
+            for frame in set(frames):
+                totalWeight[frame] += weight
+        return [(shortName(name), weight, totalWeight[name]) for name, weight in selfWeight.most_common(limit)]
+
+    def writeFolded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(self.stacks.items()):
+                f.write(f"{stack} {weight:g}\n")
+
+
+def perfUsable():
+    """perf is installed and perf_event_paranoid lets this user record its own processes."""
+    if not shutil.which("perf"):
+        return False
+    with tempfile.TemporaryDirectory(prefix="cp-perf-") as directory:
+        try:
+            probe = subprocess.run(["perf", "record", "-q", "-o", os.path.join(directory, "probe.data"), "--", "true"],
+                                   capture_output=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return probe.returncode == 0
+
+
+def buildProfiled(src, target, backend):
+    """Build src into bin/<target> for the backend. Returns (executable or None, compiler output)."""
+    flags = [*PROFILE_FLAGS, *(GPROF_FLAGS if backend == "gprof" else [])]
+    if build.honorsPipe(src):
+        flags.append(build.PIPE_DEFINE)
+    exe = build.exePath(target)
+    if build.isUpToDate(src, exe, flags):
+        return exe, ""
+    os.makedirs("bin", exist_ok=True)
+    result = subprocess.run(
+        [build.CXX, *flags, "-o", os.path.join("bin", target), src],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    output = (result.stdout or "") + (result.stderr or "")
+    if result.returncode != 0:
+        return None, output
+    build.markBuilt(exe, flags)
+    return exe, output
+
+
+def foldPerfScript(text):
+    """Fold `perf script` output (one block of frames per sample, leaf first) into root-first stacks."""
+    stacks = Counter()
+    frames = []
+    for line in text.splitlines() + [""]:
+        if not line.strip():
+            if frames:
+                stacks[";".join(reversed(frames))] += 1
+            frames = []
+        elif line[0].isspace():
+            # "\t  55d0c1 solve(int)+0x1f (/path/bin/C)"
+            parts = line.strip().split(None, 1)
+            if len(parts) == 2:
+                frames.append(_PERF_OFFSET.sub("", parts[1].rsplit(" (", 1)[0]))
+    return stacks
+
+
+def parseGprofGraph(text):
+    """gprof -b -q call graph -> ({function: self seconds}, {function: {parent: calls}})."""
+    selfTime = {}
+    parents = {}
+    pending = []
+    for line in text.splitlines():
+        if line.startswith("---"):
+            pending = []
+            continue
+        primary = _GPROF_PRIMARY.match(line)
+        if primary:
+            name = primary.group(4)
+            selfTime[name] = selfTime.get(name, 0.0) + float(primary.group(2))
+            callers = parents.setdefault(name, {})
+            for parent, calls in pending:
+                callers[parent] = callers.get(parent, 0) + calls
+            pending = None  # lines below the primary are its children
+            continue
+        parent = _GPROF_PARENT.match(line)
+        if parent and pending is not None:
+            pending.append((parent.group(2), int(parent.group(1))))
+    return selfTime, parents
+
+
+def foldGprof(selfTime, parents):
+    """
+    Spread each function's self time over its call paths in proportion to call
+    counts (gprof's own assumption). Recursion is cut where a path revisits a function.
+    """
+    stacks = Counter()
+
+    def paths(name, seen, depth):
+        callers = {p: c for p, c in parents.get(name, {}).items() if p not in seen}
+        calls = sum(callers.values())
+        if not calls or depth >= _MAX_DEPTH:
+            return [([name], 1.0)]
+        result = []
+        for parent, count in callers.items():
+            for prefix, share in paths(parent, seen | {name}, depth + 1):
+                result.append((prefix + [name], share * count / calls))
+        return result
+
+    for name, seconds in selfTime.items():
+        if seconds <= 0:
+            continue
+        for path, share in paths(name, {name}, 0):
+            stacks[";".join(path)] += seconds * share
+    return stacks
+
+
+def _writeInput(test, directory):
+    path = os.path.join(directory, "input.txt")
+    with open(path, "wb") as f:
+        for chunk in test.iterInput():
+            f.write(chunk)
+    return path
+
+
+def _runPerf(exe, inputPath, directory, timeout):
+    data = os.path.join(directory, "perf.data")
+    with open(inputPath, "rb") as stdin:
+        subprocess.run(["perf", "record", "-q", "-F", str(PERF_FREQUENCY), "--call-graph", "fp", "-o", data,
+                        "--", os.path.abspath(exe)],
+                       stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, cwd=directory,
+                       timeout=timeout, check=True)
+    script = subprocess.run(["perf", "script", "-i", data], capture_output=True, text=True,
+                            encoding="utf-8", errors="replace", check=True)
+    return Profile(foldPerfScript(script.stdout), "perf", "samples")
+
+
+def _runGprof(exe, inputPath, directory, timeout):
+    with open(inputPath, "rb") as stdin:
+        subprocess.run([os.path.abspath(exe)], stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       cwd=directory, timeout=timeout, check=True)
+    gmon = os.path.join(directory, "gmon.out")
+    if not os.path.exists(gmon):
+        raise RuntimeError("the -pg build wrote no gmon.out")
+    graph = subprocess.run(["gprof", "-b", "-q", os.path.abspath(exe), gmon], capture_output=True, text=True,
+                           encoding="utf-8", errors="replace", check=True)
+    return Profile(foldGprof(*parseGprofGraph(graph.stdout)), "gprof", "s")
+
+
+def _color(name):
+    """Stable warm color per function, as in the classic flame graphs."""
+    digest = hashlib.md5(name.encode()).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 230},{digest[2] % 55})"
+
+
+def renderSvg(profile, title, width=1200, frameHeight=16):
+    """A flame graph of the profile as a standalone SVG string (hover a frame for its weight)."""
+    root = {"children": {}, "value": 0.0}
+    for stack, weight in profile.stacks.items():
+        node = root
+        node["value"] += weight
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"children": {}, "value": 0.0})
+            node["value"] += weight
+
+    def depthOf(node):
+        return 1 + max((depthOf(child) for child in node["children"].values()), default=0)
+
+    total = root["value"] or 1
+    top = 40
+    height = top + depthOf(root) * frameHeight + 10
+    scale = width / total
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        '<rect width="100%" height="100%" fill="#fdf6e3"/>',
+        f'<text x="{width / 2}" y="22" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+    ]
+
+    def draw(name, node, x, depth):
+        w = node["value"] * scale
+        if w < 0.3:
+            return
+        y = height - 10 - (depth + 1) * frameHeight
+        label = f"{name} ({node['value']:g} {profile.unit}, {node['value'] / total:.1%})"
+        chars = int(w / 7)
+        short = shortName(name)
+        text = short if len(short) <= chars else (short[:chars - 2] + ".." if chars > 3 else "")
+        parts.append(f'<g><title>{html.escape(label)}</title>'
+                     f'<rect x="{x:.2f}" y="{y}" width="{w:.2f}" height="{frameHeight - 1}" fill="{_color(name)}" rx="2"/>'
+                     + (f'<text x="{x + 3:.2f}" y="{y + frameHeight - 4}">{html.escape(text)}</text>' if text else "")
+                     + "</g>")
+        offset = x
+        for childName, child in sorted(node["children"].items()):
+            draw(childName, child, offset, depth + 1)
+            offset += child["value"] * scale
+
+    offset = 0.0
+    for name, node in sorted(root["children"].items()):
+        draw(name, node, offset, 0)
+        offset += node["value"] * scale
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def findTest(problem, name=None):
+    """The test called `name` (D3, or just 3), or the problem's largest input when no name is given."""
+    tests = list(test_catalog.getCatalog().tests(problem))
+    if not tests:
+        return None
+    if name is None:
+        return max(tests, key=lambda t: t.inputSize)
+    name = name.upper()
+    return next((t for t in tests if t.name.upper() in (name, f"{problem}{name}")), None)
+
+
+def profile(problem, testName=None, top=TOP_N, backend=None, reporter=None):
+    """
+    Build src/<problem>.cpp, profile it on one test and print the hottest functions.
+    Returns the path of the flame-graph SVG, or None.
+    """
+    reporter = reporter or tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+    test = findTest(problem, testName)
+    if test is None:
+        reporter.printError(f"No test {testName or ''} for {problem}".replace("  ", " "))
+        return None
+    backend = backend or ("perf" if perfUsable() else "gprof")
+    if backend == "gprof" and not shutil.which("gprof"):
+        reporter.printError("Neither perf nor gprof is available (install linux-tools or binutils)")
+        return None
+
+    src = os.path.join("src", f"{problem}.cpp")
+    exe, output = buildProfiled(src, f"{problem}_prof", backend)
+    if exe is None:
+        reporter.printError(f"{src} failed to compile")
+        reporter.console.print(output.rstrip(), highlight=False, markup=False)
+        return None
+
+    timeout = max(MIN_TIMEOUT, 3 * run_tests.loadTimeLimit(problem))
+    workDir = tempfile.mkdtemp(prefix="cp-profile-")
+    try:
+        with reporter.console.status(f"[#666666]Profiling {problem} on {test.name} with {backend}...[/]"):
+            inputPath = _writeInput(test, workDir)
+            result = (_runPerf if backend == "perf" else _runGprof)(exe, inputPath, workDir, timeout)
+    except subprocess.TimeoutExpired:
+        reporter.printError(f"Profiled run did not finish within {timeout:g}s")
+        return None
+    except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+        reporter.printError(f"Profiling failed: {e}")
+        return None
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+    if not result.stacks:
+        reporter.printWarning("No samples: the run was too short to profile (gprof samples every 10ms)")
+        return None
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{problem}_{test.name}")
+    result.writeFolded(stem + ".folded")
+    with open(stem + ".svg", "w", encoding="utf-8") as f:
+        f.write(renderSvg(result, f"{problem} on {test.name} ({result.backend}, {result.total:g} {result.unit})"))
+
+    reporter.console.print(tui.buildHotTable(result.hotFunctions(top), result.total, result.unit))
+    if result.backend == "gprof" and result.total < 0.1:
+        reporter.printWarning(f"Only {result.total:g}s sampled: gprof ticks every 10ms, so percentages are rough")
+    reporter.printInfo(f"Flame graph: {stem}.svg (folded stacks: {stem}.folded)")
+    return stem + ".svg"
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    if len(args) not in (1, 2):
+        print("Usage: python profiler.py <PROBLEM> [TEST] [--top=N] [--gprof]")
+        print("Example: python profiler.py C C3")
+        print("Without TEST the largest input is profiled.")
+        sys.exit(1)
+    top = next((int(f.split("=", 1)[1]) for f in flags if f.startswith("--top=")), TOP_N)
+    try:
+        svg = profile(args[0].upper(), args[1] if len(args) == 2 else None, top=max(1, top),
+                      backend="gprof" if "--gprof" in flags else None)
+    except KeyboardInterrupt:
+        print(f"\n{RED}Cancelled{RESET}")
+        sys.exit(1)
+    sys.exit(0 if svg else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Per-problem test run history.
+Remembers which tests failed in previous runs so the runner can schedule the
+likeliest failures first and reach a verdict sooner when failing fast, along
+with each test's latest time and resource timeline, and the fingerprint of the
+machine that produced them (see fingerprint.py).
+"""
+import os
+import json
+import time
+
+from utils import CACHE_DIR
+
+HISTORY_DIR = os.path.join(CACHE_DIR, "history")
+
+
+def _historyPath(problem):
+    return os.path.join(HISTORY_DIR, f"{problem}.json")
+
+
+def _loadFile(problem):
+    try:
+        with open(_historyPath(problem), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def load(problem):
+    """
+    {testName: {'runs', 'fails', 'lastFailed', 'lastRun', 'lastTime'?, 'fingerprint'?, 'timeline'?}}
+    for a problem. 'fingerprint' is an id into fingerprints(problem).
+    """
+    return _loadFile(problem).get("tests", {})
+
+
+def fingerprints(problem):
+    """{id: fingerprint} of every machine setup that recorded a run of the problem."""
+    return _loadFile(problem).get("fingerprints", {})
+
+
+def prioritize(tests, history):
+    """
+    Order tests by failure likelihood: tests that failed last time first, then
+    by historical failure rate, then in their usual numeric order.
+    """
+    def score(test):
+        stats = history.get(test.name)
+        if not stats or not stats.get("runs"):
+            return (1, 0.0, test.index)
+        return (0 if stats.get("lastFailed") else 1, -stats["fails"] / stats["runs"], test.index)
+    return sorted(tests, key=score)
+
+
+def record(problem, results, timelines=None, fingerprint=None):
+    """
+    Merge a batch's [(testName, success, seconds)] into the problem's history.
+    timelines maps test names to their latest resource timeline (see sampler);
+    fingerprint is the machine the batch ran on (see fingerprint.current).
+    """
+    data = _loadFile(problem)
+    history = data.get("tests", {})
+    machines = data.get("fingerprints", {})
+    if fingerprint:
+        machines[fingerprint["id"]] = fingerprint
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    for name, success, seconds in results:
+        stats = history.setdefault(name, {"runs": 0, "fails": 0})
+        stats["runs"] += 1
+        stats["fails"] += 0 if success else 1
+        stats["lastFailed"] = not success
+        stats["lastRun"] = now
+        stats["lastTime"] = round(seconds, 4)
+        if fingerprint:
+            stats["fingerprint"] = fingerprint["id"]
+        if timelines and name in timelines:
+            stats["timeline"] = timelines[name]
+    try:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        tmpPath = _historyPath(problem) + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump({"problem": problem, "fingerprints": machines, "tests": history}, f, indent=2)
+        os.replace(tmpPath, _historyPath(problem))
+    except OSError:
+        pass
@@ -5,12 +5,26 @@ Runs compiled C++ executables against sample inputs, checks timeouts, and compar
 import sys
 import os
 import subprocess
-import glob
-import json
 import time
-from pathlib import Path
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from utils import GREEN, RED, YELLOW, BLUE, RESET
 import tui
+import build
+import test_catalog
+import test_pack
+import sanitizers
+import verdict_cache
+import run_history
+import sampler
+import isolation
+import io_stats
+import debug_records
+import alloc_tracker
+import fingerprint
 
 try:
     import psutil
@@ -20,14 +34,11 @@ except ImportError:
 
 def loadTimeLimit(problem):
     """Load time limit from metadata file, return default if not found"""
-    metadataFile = f"tests/{problem}_metadata.json"
     defaultTimeout = 6
     
     try:
-        if os.path.exists(metadataFile):
-            with open(metadataFile, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
+        metadata = test_catalog.getCatalog().metadata(problem)
+        if metadata:
             timeLimit = metadata.get('timeLimit', defaultTimeout)
             
             if timeLimit == "Unknown":
@@ -44,163 +55,339 @@ def loadTimeLimit(problem):
         print(f"{YELLOW}Warning: Could not parse time limit from metadata: {e}. Using default.{RESET}")
         return defaultTimeout
     
-def runTest(executable, inputFile, expectedOutputFile, timeout=6, onProgress=None):
-    """Run a single test case and return (success, message, execTime, details)"""
-    startTime = time.perf_counter()
-    execTime = 0
-    details = {}
+def _readMemory(p):
     try:
-        with open(inputFile, "r", encoding="utf-8") as f:
-            inputData = f.read()
-        
-        with open(expectedOutputFile, "r", encoding="utf-8") as f:
-            expectedOutput = f.read().strip()
-        
-        # Write test data to input.txt for C++ freopen compatibility
+        memInfo = p.memory_info()
+        return getattr(memInfo, 'peak_wset', memInfo.rss)
+    except Exception:
+        return 0
+
+def _feedStdin(stream, test):
+    """
+    Write a test's input into the child's stdin pipe. Runs on its own thread so a
+    child that writes before reading everything can't deadlock us; raw input goes
+    from the file into the pipe inside the kernel, compressed members chunk by chunk.
+    """
+    try:
+        if not test.sendInput(stream.fileno()):
+            for chunk in test.iterInput():
+                stream.write(chunk)
+    except (OSError, test_pack.PackError):
+        pass  # child exited without reading everything
+    finally:
         try:
-            with open("input.txt", "w", encoding='utf-8') as f:
-                f.write(inputData)
-        except Exception:
+            stream.close()
+        except OSError:
             pass
-        
-        # Clean up any existing Output.txt to prevent reading stale output
-        outputFilePath = "Output.txt"
-        if os.path.exists(outputFilePath):
-            try:
-                os.remove(outputFilePath)
-            except Exception:
-                pass
 
+def _drain(stream, sink):
+    """Read a child's output pipe to EOF on its own thread: past 64 KB a child blocks until someone reads."""
+    try:
+        sink.append(stream.read())
+    except (OSError, ValueError):
+        pass
+    finally:
+        stream.close()
+
+def executeProcess(executable, stdin, timeout, onProgress=None, cwd=None, inputTest=None, cancel=None,
+                   sampler=None, onStart=None, ioProbe=None, allocProbe=None):
+    """
+    Run the executable once and return (returncode, stdout, stderr, execTime, memory).
+    returncode is None when the time limit was exceeded or the cancel event was set.
+    stdin is a file object, or subprocess.PIPE together with inputTest (a TestEntry)
+    whose input is fed into the pipe. stdout and stderr are drained while the process
+    runs, so neither side ever waits on a full pipe. A sampler.ResourceSampler, if given, records the run's timeline,
+    and onStart(pid) is called as soon as the process exists (e.g. to pin it to a core).
+    An io_stats.IoProbe, if given, collects the run's read/write byte and syscall counts,
+    and an alloc_tracker.AllocProbe preloads the allocation tracker into the process.
+    """
+    startTime = time.perf_counter()
+    env = sanitizers.childEnv()
+    if allocProbe is not None:
+        env.update(allocProbe.env())
+    if not _hasPsutil and sampler is None and onStart is None and ioProbe is None:
         try:
-            if _hasPsutil:
-                proc = subprocess.Popen(
-                    [executable], 
-                    stdin=subprocess.PIPE, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE, 
-                    text=True, 
-                    encoding='utf-8'
-                )
-                try:
-                    p = psutil.Process(proc.pid)
-                except Exception:
-                    p = None
-                
-                maxMemory = 0
-                try:
-                    proc.stdin.write(inputData)
-                    proc.stdin.flush()
-                    proc.stdin.close()
-                except Exception:
-                    pass
-                
-                startPoll = time.perf_counter()
-                
-                # First immediate read (catches fast programs that exit in 15ms)
-                if p:
-                    try:
-                        memInfo = p.memory_info()
-                        mem = getattr(memInfo, 'peak_wset', memInfo.rss)
-                        if mem > maxMemory:
-                            maxMemory = mem
-                    except Exception:
-                        pass
-
-                while proc.poll() is None:
-                    if p:
-                        try:
-                            memInfo = p.memory_info()
-                            mem = getattr(memInfo, 'peak_wset', memInfo.rss)
-                            if mem > maxMemory:
-                                maxMemory = mem
-                        except Exception:
-                            pass
-                    if time.perf_counter() - startPoll > timeout:
-                        proc.kill()
-                        execTime = time.perf_counter() - startTime
-                        return False, "TIME LIMIT EXCEEDED", execTime, None, 0
-                    if onProgress:
-                        onProgress(time.perf_counter() - startTime, maxMemory)
-                    time.sleep(0.002) # Faster polling (2ms)
-                
-                # Check one last time if still zero
-                if p and maxMemory == 0:
-                    try:
-                        memInfo = p.memory_info()
-                        mem = getattr(memInfo, 'peak_wset', memInfo.rss)
-                        if mem > maxMemory:
-                            maxMemory = mem
-                    except Exception:
-                        pass
-                
-                resultStdout = proc.stdout.read() if proc.stdout else ""
-                resultStderr = proc.stderr.read() if proc.stderr else ""
-                resultReturncode = proc.returncode
-                memoryUsed = maxMemory
-            else:
-                result = subprocess.run(
-                    [executable], 
-                    input=inputData, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=timeout,
-                    encoding='utf-8'
-                )
-                resultStdout = result.stdout
-                resultStderr = result.stderr
-                resultReturncode = result.returncode
-                memoryUsed = 0
-                
+            result = subprocess.run(
+                [executable],
+                stdin=stdin if inputTest is None else None,
+                input=b"".join(inputTest.iterInput()) if inputTest is not None else None,
+                capture_output=True,
+                timeout=timeout,
+                cwd=cwd,
+                env=env
+            )
         except subprocess.TimeoutExpired:
-            execTime = time.perf_counter() - startTime
-            return False, "TIME LIMIT EXCEEDED", execTime, None, 0
+            return None, "", "", time.perf_counter() - startTime, 0
+        return (result.returncode, result.stdout.decode("utf-8", errors="replace"),
+                result.stderr.decode("utf-8", errors="replace"), time.perf_counter() - startTime, 0)
+
+    proc = subprocess.Popen(
+        [executable],
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env
+    )
+    if onStart is not None:
+        onStart(proc.pid)
+    if sampler is not None:
+        sampler.start(proc.pid)
+    if inputTest is not None:
+        threading.Thread(target=_feedStdin, args=(proc.stdin, inputTest), daemon=True).start()
+    stdoutChunks, stderrChunks = [], []
+    readers = [threading.Thread(target=_drain, args=(stream, sink), daemon=True)
+               for stream, sink in ((proc.stdout, stdoutChunks), (proc.stderr, stderrChunks))]
+    for reader in readers:
+        reader.start()
+    try:
+        p = psutil.Process(proc.pid)
+    except Exception:
+        p = None
+
+    # First immediate read (catches fast programs that exit in 15ms)
+    maxMemory = _readMemory(p) if p else 0
+    startPoll = time.perf_counter()
+    try:
+        while not io_stats.exited(proc, ioProbe):
+            if p:
+                maxMemory = max(maxMemory, _readMemory(p))
+            if ioProbe is not None:
+                ioProbe.poll(proc.pid)
+            if time.perf_counter() - startPoll > timeout or (cancel is not None and cancel.is_set()):
+                proc.kill()
+                io_stats.exited(proc, ioProbe, wait=True)
+                for reader in readers:
+                    reader.join()
+                return None, "", "", time.perf_counter() - startTime, 0
+            if onProgress:
+                onProgress(time.perf_counter() - startTime, maxMemory)
+            time.sleep(0.002) # Faster polling (2ms)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    execTime = time.perf_counter() - startTime
+
+    # Check one last time if still zero
+    if p and maxMemory == 0:
+        maxMemory = _readMemory(p)
+
+    for reader in readers:
+        reader.join()
+    stdout = b"".join(stdoutChunks).decode("utf-8", errors="replace")
+    stderr = b"".join(stderrChunks).decode("utf-8", errors="replace")
+    return proc.returncode, stdout, stderr, execTime, maxMemory
+
+def _scratchInput(test):
+    """
+    Per-test scratch directory for freopen-style solutions, holding the test as input.txt.
+    Loose inputs are hard-linked rather than copied where the filesystem allows it,
+    and otherwise copied inside the kernel when possible (see TestEntry.sendInput).
+    """
+    scratch = tempfile.mkdtemp(prefix="cp-run-")
+    inputCopy = os.path.join(scratch, "input.txt")
+    linked = False
+    if not test.isPacked:
+        try:
+            os.link(test.inputPath, inputCopy)
+            linked = True
+        except OSError:
+            pass
+    if not linked:
+        with open(inputCopy, "wb") as f:
+            if not test.sendInput(f.fileno()):
+                for chunk in test.iterInput():
+                    f.write(chunk)
+    return scratch, inputCopy
+
+def runSolution(executable, test, timeout=6, onProgress=None, pipe=False, cancel=None, sampleInterval=None,
+                policy=None, allocLibrary=None):
+    """
+    Run the executable on one test (a test_catalog.TestEntry) without judging it.
+    Returns (status, output, execTime, details, memory) where status is "OK",
+    "TIME LIMIT EXCEEDED", "RUNTIME ERROR" or "ERROR" and output is the stripped answer.
+    pipe=True is for binaries built with -DJUDGE_PIPE: the input goes straight to
+    stdin and stdout is the answer. Otherwise the solution may freopen input.txt /
+    Output.txt, so it runs inside its own scratch directory; either way tests
+    never share files and can run in parallel. Setting the cancel event kills the run.
+    With sampleInterval (ms), details["timeline"] holds the run's RSS/CPU/page-fault series;
+    details["io"] always holds its read/write totals (see io_stats) when they can be measured,
+    and details["blocks"] the TIME_BLOCK timings of a -DDEBUG_RECORDS build.
+    policy (an isolation.IsolationPolicy) pins and boosts the process and pre-faults its input.
+    With allocLibrary (see alloc_tracker.buildTracker), details["alloc"] holds the heap
+    peak and the call sites that held it.
+    """
+    startTime = time.perf_counter()
+    details = {}
+    stdinFile = None
+    scratch = None
+    resourceSampler = sampler.ResourceSampler(sampleInterval) if sampleInterval else None
+    ioProbe = io_stats.IoProbe()
+    allocProbe = alloc_tracker.AllocProbe(allocLibrary) if allocLibrary else None
+    core = None
+    onStart = None
+    try:
+        if policy is not None:
+            policy.prepare(test)
+            core = policy.acquireCore()
+            onStart = lambda pid: policy.apply(pid, core)
+        executable = os.path.abspath(executable)
+        inputTest = None
+        if pipe and test.isPacked:
+            stdinFile, inputTest = subprocess.PIPE, test
+        elif pipe:
+            stdinFile = open(test.inputPath, "rb")
+        else:
+            scratch, inputCopy = _scratchInput(test)
+            stdinFile = open(inputCopy, "rb")
+
+        try:
+            returncode, stdout, stderr, execTime, memoryUsed = executeProcess(
+                executable, stdinFile, timeout, onProgress, cwd=scratch, inputTest=inputTest, cancel=cancel,
+                sampler=resourceSampler, onStart=onStart, ioProbe=ioProbe, allocProbe=allocProbe
+            )
         except FileNotFoundError:
-            execTime = time.perf_counter() - startTime
             details["error"] = f"EXECUTABLE NOT FOUND: {executable}"
-            return False, "ERROR", execTime, details, 0
+            return "ERROR", "", time.perf_counter() - startTime, details, 0
         except Exception as e:
-            execTime = time.perf_counter() - startTime
             details["error"] = f"RUNTIME ERROR: {e}"
-            return False, "ERROR", execTime, details, 0
-        
-        execTime = time.perf_counter() - startTime
-        
-        if resultStderr:
-            details["stderr"] = resultStderr
+            return "ERROR", "", time.perf_counter() - startTime, details, 0
 
-        if resultReturncode != 0:
-            details["error"] = f"RUNTIME ERROR (exit code {resultReturncode})"
-            return False, "RUNTIME ERROR", execTime, details, memoryUsed
-        
-        # Prefer stdout captured from subprocess; only read Output.txt as fallback
-        # This avoids false AC/WA from a stale Output.txt left by a prior run.
-        actualOutput = resultStdout.strip()
-        if not actualOutput and os.path.exists(outputFilePath):
+        if resourceSampler is not None and len(resourceSampler.timeline):
+            details["timeline"] = resourceSampler.stop().toDict()
+            memoryUsed = max(memoryUsed, *details["timeline"]["rss"])
+        io = ioProbe.summary(execTime)
+        if io:
+            details["io"] = io
+        alloc = allocProbe.summary(executable) if allocProbe is not None else None
+        if alloc:
+            details["alloc"] = alloc
+
+        if returncode is None:
+            # Keep the timeline: a TLE's memory/CPU curve is often the interesting one
+            return "TIME LIMIT EXCEEDED", "", execTime, details or None, 0
+
+        if stderr:
+            # A -DDEBUG_RECORDS build tags its debug() / TIME_BLOCK output (see debug_records)
+            stderr, blocks = debug_records.parse(stderr)
+            if blocks:
+                details["blocks"] = blocks
+            if stderr.strip():
+                details["stderr"] = stderr
+
+        if returncode != 0:
+            details["error"] = f"RUNTIME ERROR (exit code {returncode})"
+            return "RUNTIME ERROR", "", execTime, details, memoryUsed
+
+        # Prefer stdout; a freopen-style solution leaves its answer in the scratch Output.txt instead
+        actualOutput = stdout.strip()
+        outputFilePath = os.path.join(scratch, "Output.txt") if scratch else None
+        if not actualOutput and outputFilePath and os.path.exists(outputFilePath):
             try:
                 with open(outputFilePath, 'r', encoding='utf-8') as f:
                     actualOutput = f.read().strip()
             except Exception as e:
                 details["error"] = f"ERROR READING OUTPUT FILE: {e}"
-                return False, "ERROR", execTime, details, memoryUsed
-        
-        expectedLines = [line.rstrip() for line in expectedOutput.splitlines()]
-        actualLines = [line.rstrip() for line in actualOutput.splitlines()]
+                return "ERROR", "", execTime, details, memoryUsed
+        return "OK", actualOutput, execTime, details, memoryUsed
 
-        if expectedLines == actualLines:
-            return True, "ACCEPTED", execTime, details, memoryUsed
-        elif expectedOutput.split() == actualOutput.split():
-            return True, "ACCEPTED (Token)", execTime, details, memoryUsed
-        else:
-            details["expected"] = expectedOutput
-            details["actual"] = actualOutput
-            return False, "WRONG ANSWER", execTime, details, memoryUsed
-    
     except Exception as e:
         execTime = time.perf_counter() - startTime
         details["error"] = f"ERROR: {e}"
-        return False, "ERROR", execTime, details, 0
+        return "ERROR", "", execTime, details, 0
+    finally:
+        if policy is not None:
+            policy.releaseCore(core)
+        if allocProbe is not None:
+            allocProbe.discard()
+        if stdinFile not in (None, subprocess.PIPE):
+            stdinFile.close()
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+def outputsMatch(expectedOutput, actualOutput):
+    """The checker: "ACCEPTED" on equal lines (trailing spaces ignored), "ACCEPTED (Token)" on equal tokens, else None."""
+    expectedLines = [line.rstrip() for line in expectedOutput.splitlines()]
+    actualLines = [line.rstrip() for line in actualOutput.splitlines()]
+    if expectedLines == actualLines:
+        return "ACCEPTED"
+    if expectedOutput.split() == actualOutput.split():
+        return "ACCEPTED (Token)"
+    return None
+
+def runTest(executable, test, timeout=6, onProgress=None, pipe=False, cancel=None, sampleInterval=None,
+            policy=None, allocLibrary=None):
+    """
+    Run and judge a single test case and return (success, message, execTime, details, memory).
+    Arguments are as for runSolution.
+    """
+    try:
+        expectedOutput = test.readOutput().strip()
+    except Exception as e:
+        return False, "ERROR", 0.0, {"error": f"ERROR: {e}"}, 0
+
+    status, actualOutput, execTime, details, memoryUsed = runSolution(
+        executable, test, timeout, onProgress, pipe, cancel, sampleInterval, policy, allocLibrary
+    )
+    if status != "OK":
+        return False, status, execTime, details, memoryUsed
+
+    verdict = outputsMatch(expectedOutput, actualOutput)
+    if verdict:
+        return True, verdict, execTime, details, memoryUsed
+    details["expected"] = expectedOutput
+    details["actual"] = actualOutput
+    return False, "WRONG ANSWER", execTime, details, memoryUsed
+
+def runRepeated(repeat, *args):
+    """
+    runTest, then repeat-1 more runs of a passing test for timing. execTime becomes
+    the median and details["timing"] holds the spread; a repeat that fails
+    (a flaky solution) is returned as the verdict instead.
+    """
+    result = runTest(*args)
+    success, message, execTime, details, memoryUsed = result
+    if repeat <= 1 or not success:
+        return result
+    cancel = args[5] if len(args) > 5 else None  # runTest's cancel event
+    times = [execTime]
+    for _ in range(repeat - 1):
+        if cancel is not None and cancel.is_set():
+            break
+        again = runTest(*args)
+        if not again[0]:
+            return again
+        times.append(again[2])
+        memoryUsed = max(memoryUsed, again[4])
+    median, halfWidth, cv = isolation.summarize(times)
+    details = dict(details or {})
+    details["timing"] = {"runs": len(times), "spread": halfWidth, "cv": cv, "times": times}
+    return success, message, median, details, memoryUsed
 
-def runTestsForProblem(problem, executable):
+def _completed(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+def runTestsForProblem(problem, executable, reporter=None, executor=None, stopOnSanitizer=False, fresh=False,
+                       failFast=False, jobs=1, sampleInterval=None, isolate=False, repeat=1, memProfile=False,
+                       normalize=False, recordHistory=True):
+    """
+    Run every test of the problem against the executable.
+    A long-lived caller can pass its own reporter and executor to reuse them across runs.
+    stopOnSanitizer ends the batch at the first ASan/UBSan report instead of running the rest.
+    Verdicts of unchanged binary/test pairs come from verdict_cache unless fresh is set.
+    Tests that failed in earlier runs go first; failFast ends the batch at the first non-AC.
+    jobs > 1 runs that many tests at once (each test has its own stdin/scratch dir).
+    sampleInterval (ms) records a resource timeline per test; those runs always execute.
+    isolate pins every run to a dedicated core, raises its priority and pre-faults
+    its input; repeat > 1 reruns passing tests and reports median time with a 95% band.
+    memProfile runs every test under the allocation tracker (build with alloc_tracker.SOLUTION_FLAGS
+    for source lines) and reports the top allocating call sites.
+    The machine's fingerprint goes into the report and the run history; normalize
+    also shows every time as an estimate for the reference machine.
+    recordHistory=False leaves the run history untouched (e.g. for build_matrix profiles).
+    """
     timeout = loadTimeLimit(problem)
     
     # Add .exe extension on Windows if needed
@@ -217,53 +404,156 @@ def runTestsForProblem(problem, executable):
         print(f"{RED}Error: Executable '{executable}' not found{RESET}")
         return False
     
+    allocLibrary = None
+    if memProfile and not alloc_tracker.supported():
+        print(f"{YELLOW}Warning: allocation tracking needs Linux and addr2line; running without it.{RESET}")
+    elif memProfile:
+        allocLibrary, output = alloc_tracker.buildTracker()
+        if allocLibrary is None:
+            print(f"{RED}Error: {alloc_tracker.TRACKER_SRC} failed to compile{RESET}\n{output}")
+            return False
+
     if not _hasPsutil:
         print(f"{YELLOW}Warning: 'psutil' is not installed. Memory usage will show as N/A. Run 'pip install psutil' to fix this.{RESET}")
         
-    # Find test files
-    testPattern = f"tests/{problem}*.in"
-    inputFiles = glob.glob(testPattern)
+    # Hold the suite lock for the whole batch so a concurrent fetch can't swap tests mid-run
+    with test_catalog.suiteLock():
+        # Find test files (exact matches only: problem A never picks up A1's or AB's tests)
+        tests = test_catalog.getCatalog().tests(problem)
     
-    if not inputFiles:
-        print(f"{RED}No test files found for problem {problem}{RESET}")
-        print(f"Looking for pattern: {testPattern}")
-        return False
+        if not tests:
+            print(f"{RED}No test files found for problem {problem}{RESET}")
+            print(f"Looking for: tests/{problem}<N>.in")
+            return False
     
-    inputFiles.sort()  # Ensure consistent order
-    
-    reporter = tui.TestReporter(hasPsutil=_hasPsutil)
-    reporter.printHeader(problem)
-    reporter.startTests(len(inputFiles))
+        # Tests that failed last time go first so a regression shows up immediately
+        history = run_history.load(problem)
+        tests = run_history.prioritize(tests, history)
+        retried = sum(1 for t in tests if history.get(t.name, {}).get("lastFailed"))
+
+        if reporter is None:
+            reporter = tui.TestReporter(hasPsutil=_hasPsutil)
+        reporter.printHeader(problem)
+        if retried:
+            reporter.printInfo(f"Running {retried} previously failed test(s) first")
+        # Taken before the batch: a stale calibration is re-measured on an idle machine
+        machine = fingerprint.current(executable)
+        scale = fingerprint.scaleTo(machine, fingerprint.loadReference()) if normalize else None
+        if normalize and scale is None:
+            reporter.printWarning("No reference machine to normalize to (python scripts/fingerprint.py --set-reference)")
+        reporter.startTests(len(tests), scale=scale)
     
-    for inputFile in inputFiles:
-        baseName = Path(inputFile).stem  # e.g., "B1" from "B1.in"
-        expectedFile = f"tests/{baseName}.out"
-        
-        if not os.path.exists(expectedFile):
-            reporter.addResult(baseName, False, 0.0, timeout, "MISSING OUTPUT", details={"error": "Missing expected output file"})
-            continue
-        
-        reporter.updateLiveTest(baseName, 0.0, 0)
-        success, message, execTime, details, memoryUsed = runTest(
-            executable, inputFile, expectedFile, timeout,
-            onProgress=lambda t, m: reporter.updateProgress(t, m)
-        )
-        
-        reporter.addResult(baseName, success, execTime, timeout, message, memory=memoryUsed, details=details)
-        
-    reporter.stopTests()
+        # -DJUDGE_PIPE builds talk over stdin/stdout only; others get a scratch dir per test
+        pipe = build.isPipeBuild(executable)
+        ownExecutor = None
+        if executor is None and jobs > 1:
+            executor = ownExecutor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="test")
+        cancel = threading.Event()
+        policy = isolation.IsolationPolicy(jobs) if isolate else None
+
+        def launch(test):
+            """Start a test: (cached verdict, None) or (None, future of runTest)."""
+            if not test.hasOutput:
+                return (False, "MISSING OUTPUT", 0.0, {"error": "Missing expected output file"}, 0), None
+            if not fresh and not sampleInterval and repeat <= 1 and not allocLibrary:
+                cached = verdict_cache.lookup(verdict_cache.verdictKey(executable, test, timeout))
+                if cached is not None:
+                    return cached, None
+            reporter.updateLiveTest(test.name, 0.0, 0)
+            onProgress = lambda t, m, name=test.name: reporter.updateProgress(t, m, name)
+            args = (repeat, executable, test, timeout, onProgress, pipe, cancel, sampleInterval, policy, allocLibrary)
+            if executor is None:
+                return None, _completed(runRepeated(*args))
+            return None, executor.submit(runRepeated, *args)
+
+        # Up to `jobs` tests in flight; results are reported in order so the dashboard stays stable
+        outcomes = []
+        timelines = {}
+        pending = deque()
+        upcoming = iter(enumerate(tests, 1))
+        try:
+            while True:
+                while len(pending) < jobs:
+                    nextTest = next(upcoming, None)
+                    if nextTest is None:
+                        break
+                    pending.append((*nextTest, *launch(nextTest[1])))
+                if not pending:
+                    break
+
+                position, test, cached, future = pending.popleft()
+                baseName = test.name  # e.g., "B1" from "B1.in"
+                if cached is None:
+                    result = future.result()
+                    if test.hasOutput:
+                        verdict_cache.store(verdict_cache.verdictKey(executable, test, timeout), result)
+                    success, message, execTime, details, memoryUsed = result
+                else:
+                    success, message, execTime, details, memoryUsed = cached
+                fromCache = cached is not None and test.hasOutput
+
+                # Sanitizer reports are triaged into findings instead of being dumped per test
+                findings = []
+                if details and details.get("stderr"):
+                    findings, details["stderr"] = sanitizers.parseReports(details["stderr"])
+                if findings:
+                    success = False
+                    message = f"SANITIZER: {findings[0].kind}"
+                    reporter.addFindings(baseName, findings)
+
+                reporter.addResult(baseName, success, execTime, timeout, message, memory=memoryUsed, details=details,
+                                   cached=fromCache)
+                outcomes.append((baseName, success, execTime))
+                if details and details.get("timeline"):
+                    timelines[baseName] = details["timeline"]
+
+                stopReason = None
+                if findings and stopOnSanitizer:
+                    stopReason = "first sanitizer error"
+                elif not success and failFast:
+                    stopReason = "first failure"
+                if stopReason and position < len(tests):
+                    reporter.markStopped(stopReason, len(tests) - position)
+                    break
+        finally:
+            # Drop queued tests and kill the ones still running
+            cancel.set()
+            for _, test, _, future in pending:
+                if future is not None and not future.cancel():
+                    future.exception()
+                reporter.running.pop(test.name, None)
+            if ownExecutor is not None:
+                ownExecutor.shutdown(wait=True)
+
+        reporter.stopTests()
+        if policy is not None and policy.describe():
+            reporter.printInfo(f"Isolation: {policy.describe()}")
+        reporter.printInfo(f"Machine: {fingerprint.describe(machine)}")
+        if recordHistory:
+            run_history.record(problem, outcomes, timelines, machine)
+    verdict_cache.prune()
     return reporter.passed == reporter.total
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python run_tests.py <PROBLEM> <EXECUTABLE>")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = {a for a in sys.argv[1:] if a.startswith("--")}
+    if len(args) != 2:
+        print("Usage: python run_tests.py <PROBLEM> <EXECUTABLE> [--stop-on-sanitizer] [--fresh] [--fail-fast] [--jobs=N] [--sample[=MS]] [--isolate] [--repeat=N] [--memprofile] [--normalize]")
         print("Example: python run_tests.py B bin/Code")
         sys.exit(1)
     
-    problem = sys.argv[1].upper()
-    executable = sys.argv[2]
+    problem = args[0].upper()
+    executable = args[1]
+    jobs = next((int(f.split("=", 1)[1]) for f in flags if f.startswith("--jobs=")), 1)
+    sampleInterval = next((int(f.split("=", 1)[1]) for f in flags if f.startswith("--sample=")), None)
+    if "--sample" in flags:
+        sampleInterval = sampler.DEFAULT_INTERVAL_MS
+    repeat = next((int(f.split("=", 1)[1]) for f in flags if f.startswith("--repeat=")), 1)
         
-    success = runTestsForProblem(problem, executable)
+    success = runTestsForProblem(problem, executable, stopOnSanitizer="--stop-on-sanitizer" in flags,
+                                 fresh="--fresh" in flags, failFast="--fail-fast" in flags, jobs=max(1, jobs),
+                                 sampleInterval=sampleInterval, isolate="--isolate" in flags, repeat=max(1, repeat),
+                                 memProfile="--memprofile" in flags, normalize="--normalize" in flags)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+Per-test resource timelines.
+A sampler thread polls the running solution at a fixed rate and records RSS,
+CPU% and page faults, so memory growth is visible and not just its peak.
+On Linux one /proc/<pid>/stat read yields all three; elsewhere psutil is used.
+"""
+import os
+import time
+import threading
+from collections import deque
+
+try:
+    import psutil
+    _hasPsutil = True
+except ImportError:
+    _hasPsutil = False
+
+# Errors that mean the sampled process has exited
+_GONE = (OSError, ValueError, IndexError) + ((psutil.Error,) if _hasPsutil else ())
+
+DEFAULT_INTERVAL_MS = 10
+MAX_POINTS = 64
+
+if hasattr(os, "sysconf"):
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _readProcStat(pid):
+    """(rss bytes, cpu seconds, page faults) from /proc/<pid>/stat, or None once the process has exited."""
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        # comm may contain spaces: fields start after its closing paren (field 3 = state)
+        fields = f.read().rsplit(b")", 1)[1].split()
+    if fields[0] == b"Z":
+        return None
+    minflt, majflt = int(fields[7]), int(fields[9])
+    cpu = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+    return int(fields[21]) * _PAGE_SIZE, cpu, minflt + majflt
+
+
+def _readPsutil(process):
+    memInfo = process.memory_info()
+    times = process.cpu_times()
+    faults = getattr(memInfo, "num_page_faults", 0)  # Windows only
+    return memInfo.rss, times.user + times.system, faults
+
+
+class Timeline:
+    """Compact time series of one run: parallel lists of ms offsets, RSS bytes, CPU% and cumulative faults."""
+
+    def __init__(self, intervalMs):
+        self.intervalMs = intervalMs
+        self.times = []
+        self.rss = []
+        self.cpu = []
+        self.faults = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def compact(self, maxPoints=MAX_POINTS):
+        """Downsample to at most maxPoints buckets: peak RSS, mean CPU, last fault count per bucket."""
+        n = len(self.times)
+        if n <= maxPoints:
+            return self
+        out = Timeline(self.intervalMs)
+        for b in range(maxPoints):
+            lo, hi = b * n // maxPoints, (b + 1) * n // maxPoints
+            out.times.append(self.times[hi - 1])
+            out.rss.append(max(self.rss[lo:hi]))
+            out.cpu.append(round(sum(self.cpu[lo:hi]) / (hi - lo), 1))
+            out.faults.append(self.faults[hi - 1])
+        return out
+
+    def toDict(self):
+        return {"interval": self.intervalMs, "t": self.times, "rss": self.rss, "cpu": self.cpu, "faults": self.faults}
+
+
+class ResourceSampler:
+    """Samples one process on a dedicated thread until stop() is called."""
+
+    def __init__(self, intervalMs=DEFAULT_INTERVAL_MS):
+        self.intervalMs = intervalMs
+        self.timeline = Timeline(intervalMs)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, pid):
+        useProc = os.path.exists(f"/proc/{pid}/stat")
+        if not useProc and not _hasPsutil:
+            return
+        self._thread = threading.Thread(target=self._run, args=(pid, useProc), daemon=True, name="sampler")
+        self._thread.start()
+
+    def _reader(self, pid, useProc):
+        if useProc:
+            return lambda: _readProcStat(pid)
+        process = psutil.Process(pid)
+        return lambda: _readPsutil(process)
+
+    def _run(self, pid, useProc):
+        try:
+            read = self._reader(pid, useProc)
+        except _GONE:
+            return
+        start = time.perf_counter()
+        interval = self.intervalMs / 1000
+        # CPU time only advances in clock ticks: average CPU% over a window of a few ticks
+        window = max(interval, 5 / _CLK_TCK) if useProc else interval
+        recent = deque([(start, 0.0)])
+        while True:
+            try:
+                sample = read()
+            except _GONE:
+                sample = None
+            if sample is None:
+                return  # process is gone
+            rss, cpu, faults = sample
+            now = time.perf_counter()
+            while len(recent) > 1 and now - recent[1][0] >= window:
+                recent.popleft()
+            refWall, refCpu = recent[0]
+            cpuPercent = 100 * (cpu - refCpu) / (now - refWall) if now > refWall else 0.0
+            recent.append((now, cpu))
+            tl = self.timeline
+            tl.times.append(round((now - start) * 1000, 1))
+            tl.rss.append(rss)
+            tl.cpu.append(round(cpuPercent, 1))
+            tl.faults.append(faults)
+            if self._stop.wait(interval):
+                return
+
+    def stop(self):
+        """Stop sampling and return the compacted timeline."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.timeline.compact()
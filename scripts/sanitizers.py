@@ -0,0 +1,151 @@
+"""
+AddressSanitizer / UndefinedBehaviorSanitizer report triage.
+Parses the reports a `make debug` binary writes to stderr into structured
+findings (kind, frame, source line) that can be deduplicated across tests.
+"""
+import os
+import re
+
+# Ask UBSan for a stack trace so its findings carry a frame like ASan's do
+CHILD_ENV = {"UBSAN_OPTIONS": "print_stacktrace=1"}
+
+_ASAN_HEADER = re.compile(r"^==\d+==ERROR: (\w+Sanitizer): ([\w-]+)(.*)$")
+_ASAN_END = re.compile(r"^==\d+==(ABORTING|.*exiting)")
+_UBSAN_LINE = re.compile(r"^(.+?):(\d+):(\d+): runtime error: (.*)$")
+_FRAME = re.compile(r"^\s+#\d+ 0x[0-9a-f]+ in (.+?) ((?:[A-Za-z]:)?[^\s:]+):(\d+)(?::\d+)?\s*$")
+_ANY_FRAME = re.compile(r"^\s+#\d+ 0x[0-9a-f]+")
+_ACCESS = re.compile(r"^(READ|WRITE) of size \d+")
+_SEPARATOR = re.compile(r"^=+$")
+_SYSTEM_PATHS = ("/usr/", "libsanitizer", "../../../", "<built-in>")
+
+
+def childEnv():
+    """Environment for running a solution, keeping any user-provided sanitizer options."""
+    env = dict(os.environ)
+    for key, value in CHILD_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def _relativePath(path):
+    """Debug info holds absolute paths while UBSan echoes the compile path; unify on project-relative."""
+    if path and os.path.isabs(path):
+        try:
+            rel = os.path.relpath(path)
+        except ValueError:
+            return path
+        if not rel.startswith(".."):
+            return rel
+    return path
+
+
+class Finding:
+    """One sanitizer report: what went wrong (kind) and where (frame + source line)."""
+
+    def __init__(self, tool, kind, message, file="", line=0, frame=""):
+        self.tool = tool
+        self.kind = kind
+        self.message = message
+        self.file = _relativePath(file)
+        self.line = line
+        self.frame = frame
+
+    @property
+    def key(self):
+        """Identity used to deduplicate the same issue hit by several tests."""
+        return (self.tool, self.kind, self.file, self.line)
+
+    @property
+    def location(self):
+        return f"{self.file}:{self.line}" if self.file else "?"
+
+    def sourceLine(self):
+        """The offending line of source, if the file is readable."""
+        try:
+            with open(self.file, "r", encoding="utf-8", errors="replace") as f:
+                for i, text in enumerate(f, 1):
+                    if i == self.line:
+                        return text.strip()
+        except OSError:
+            pass
+        return ""
+
+
+def _userFrame(lines):
+    """First stack frame that points into the solution rather than libc/libstdc++/the runtime."""
+    first = None
+    for line in lines:
+        m = _FRAME.match(line)
+        if not m:
+            continue
+        frame = (m.group(1), m.group(2), int(m.group(3)))
+        if first is None:
+            first = frame
+        if not any(p in frame[1] for p in _SYSTEM_PATHS):
+            return frame
+    return first or ("", "", 0)
+
+
+def _normalizeKind(message):
+    """'index 5 out of bounds for type 'int [3]'' -> 'index N out of bounds'."""
+    kind = message.split(":", 1)[0]
+    kind = re.sub(r"'[^']*'", "", kind)
+    kind = re.sub(r"\b(for|of) type\b.*$", "", kind)
+    kind = re.sub(r"-?\b(0x[0-9a-f]+|\d+)\b", "N", kind)
+    return " ".join(kind.split())
+
+
+def parseReports(stderr):
+    """
+    Extract sanitizer findings from stderr.
+    Returns (findings, remainingStderr) where the remaining text is stderr with
+    the report blocks cut out, so normal debug output still gets shown.
+    """
+    findings = []
+    remaining = []
+    lines = stderr.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        m = _ASAN_HEADER.match(line)
+        if m:
+            if remaining and _SEPARATOR.match(remaining[-1]):
+                remaining.pop()
+            tool, kind = m.group(1), m.group(2)
+            if tool == "LeakSanitizer":
+                kind = "memory-leak"
+            j = i + 1
+            while j < len(lines) and not _ASAN_END.match(lines[j]):
+                j += 1
+            if j == len(lines):
+                # LeakSanitizer reports run at exit and stop at their SUMMARY line
+                j = next((k for k in range(i + 1, len(lines)) if lines[k].startswith("SUMMARY:")), j)
+            block = lines[i + 1:j]
+            func, file, lineNo = _userFrame(block)
+            access = next((_ACCESS.match(l).group(0) for l in block if _ACCESS.match(l)), "")
+            message = f"{kind}: {access}" if access else kind
+            findings.append(Finding(tool, kind, message, file, lineNo, func))
+            i = j + 1
+            continue
+
+        m = _UBSAN_LINE.match(line)
+        if m:
+            file, lineNo, message = m.group(1), int(m.group(2)), m.group(4)
+            j = i + 1
+            while j < len(lines) and _ANY_FRAME.match(lines[j]):
+                j += 1
+            func = _userFrame(lines[i + 1:j])[0]
+            findings.append(Finding("UndefinedBehaviorSanitizer", _normalizeKind(message), message,
+                                    file, lineNo, func))
+            i = j
+            continue
+
+        if line.startswith("SUMMARY: UndefinedBehaviorSanitizer"):
+            i += 1
+            continue
+
+        remaining.append(line)
+        i += 1
+
+    return findings, "\n".join(remaining)
@@ -0,0 +1,217 @@
+"""
+Contest-start scheduler.
+Sleeps until the contest starts, then fetches every problem at once. Judges are
+slow to answer right at the start, so each problem retries with jittered
+exponential backoff, and a per-host cap keeps the burst polite. Every problem's
+tests are written to tests/ (atomically, see test_writer) as soon as it arrives.
+
+The clock and random source are injectable, and so is the fetcher (any
+fetchers.JudgeFetcher, e.g. one whose problemUrl points at a local stub server),
+so a whole contest start can be replayed without waiting or touching the network.
+"""
+import sys
+import time
+import random
+import datetime
+import threading
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import fetchers
+import test_writer
+from utils import GREEN, RED, YELLOW, BLUE, RESET
+
+DEFAULT_PROBLEMS = "A-H"
+PER_HOST = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+# Give up on a problem this many seconds after the contest started
+DEADLINE = 15 * 60
+
+
+class Clock:
+    """Wall clock. Tests substitute an object whose sleep() only advances now()."""
+
+    def now(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def parseStartTime(text, now):
+    """
+    Epoch seconds for 'now', '+90s' / '+5m', 'HH:MM[:SS]' (today, or tomorrow if
+    already past) or an ISO date-time 'YYYY-MM-DD HH:MM[:SS]' in local time.
+    """
+    text = text.strip()
+    if text == "now":
+        return now
+    if text.startswith("+"):
+        units = {"s": 1, "m": 60, "h": 3600}
+        unit = units.get(text[-1], 1)
+        return now + float(text[1:].rstrip("smh")) * unit
+    try:
+        return datetime.datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        pass
+    parts = [int(p) for p in text.split(":")]
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"Unrecognized time '{text}' (use HH:MM, YYYY-MM-DD HH:MM, +5m or now)")
+    base = datetime.datetime.fromtimestamp(now)
+    start = base.replace(hour=parts[0], minute=parts[1], second=parts[2] if len(parts) == 3 else 0, microsecond=0)
+    if start.timestamp() < now:
+        start += datetime.timedelta(days=1)
+    return start.timestamp()
+
+
+def expandProblems(spec):
+    """'A-F' -> [A..F]; 'A,B,C1,C2' -> as listed; ranges and lists can be mixed."""
+    problems = []
+    for part in spec.upper().split(","):
+        part = part.strip()
+        if len(part) == 3 and part[1] == "-" and part[0].isalpha() and part[2].isalpha():
+            problems.extend(chr(c) for c in range(ord(part[0]), ord(part[2]) + 1))
+        elif part:
+            problems.append(part)
+    return problems
+
+
+def backoffDelay(attempt, rng, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]."""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ProblemResult:
+    def __init__(self, problem, success, attempts, elapsed, message):
+        self.problem = problem
+        self.success = success
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.message = message
+
+
+class FetchScheduler:
+    """
+    Fetch a contest's problems concurrently from a start time on.
+    A problem the judge reports as missing (fetchers.NotFoundError) once another
+    one has arrived is taken as not existing (the contest is live by then) and
+    dropped instead of retried.
+    """
+
+    def __init__(self, fetcher, contestId, problems, clock=None, rng=None, perHost=PER_HOST,
+                 deadline=DEADLINE, log=print):
+        self.fetcher = fetcher
+        self.contestId = contestId
+        self.problems = problems
+        self.clock = clock or Clock()
+        self.rng = rng or random.Random()
+        self.perHost = perHost
+        self.deadline = deadline
+        self.log = log
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._arrived = threading.Event()
+        # The scheduler does the retrying; the Codeforces page fetch should fail fast
+        if hasattr(fetcher, "pageRetries"):
+            fetcher.pageRetries = 0
+
+    def _hostSlot(self, problem):
+        host = urlsplit(self.fetcher.problemUrl(self.contestId, problem)).netloc
+        with self._lock:
+            return self._hosts.setdefault(host, threading.BoundedSemaphore(self.perHost))
+
+    def waitForStart(self, startAt):
+        """Sleep until startAt, in bounded steps so suspend/resume or clock changes are noticed."""
+        while True:
+            remaining = startAt - self.clock.now()
+            if remaining <= 0:
+                return
+            self.clock.sleep(min(remaining, 30.0))
+
+    def _fetchOne(self, problem, startAt):
+        slot = self._hostSlot(problem)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with slot:
+                    data = self.fetcher.fetchProblem(self.contestId, problem)
+            except (fetchers.FetchError, OSError, http.client.HTTPException) as e:
+                elapsed = self.clock.now() - startAt
+                if isinstance(e, fetchers.NotFoundError) and self._arrived.is_set():
+                    return ProblemResult(problem, False, attempt, elapsed, "not in this contest")
+                delay = backoffDelay(attempt - 1, self.rng)
+                if elapsed + delay > self.deadline:
+                    return ProblemResult(problem, False, attempt, elapsed, str(e))
+                self.log(f"{YELLOW}{problem}{RESET}: {e} - retry {attempt} in {delay:.1f}s")
+                self.clock.sleep(delay)
+                continue
+            except Exception as e:
+                # A page the parser chokes on will not parse better next time; keep the other problems going
+                return ProblemResult(problem, False, attempt, self.clock.now() - startAt, f"{type(e).__name__}: {e}")
+
+            metadata = {
+                "contestId": self.contestId,
+                "problemLetter": problem,
+                "timeLimit": data.timeLimit,
+                "testCount": len(data.tests),
+                "url": data.url,
+            }
+            try:
+                test_writer.writeProblemTests(problem, data.tests, metadata)
+            except Exception as e:
+                return ProblemResult(problem, False, attempt, self.clock.now() - startAt, f"could not write tests: {e}")
+            self._arrived.set()
+            elapsed = self.clock.now() - startAt
+            self.log(f"{GREEN}{problem}{RESET}: {len(data.tests)} tests after {attempt} attempt(s), +{elapsed:.1f}s")
+            return ProblemResult(problem, True, attempt, elapsed, f"{len(data.tests)} tests")
+
+    def run(self, startAt):
+        """Wait for startAt, fetch every problem, and return their ProblemResults in problem order."""
+        self.waitForStart(startAt)
+        self.log(f"{BLUE}Contest {self.contestId} started{RESET}: fetching {', '.join(self.problems)}")
+        with ThreadPoolExecutor(max_workers=max(1, len(self.problems)), thread_name_prefix="schedule") as pool:
+            futures = [pool.submit(self._fetchOne, p, startAt) for p in self.problems]
+            return [f.result() for f in futures]
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) not in (3, 4):
+        print("Usage: python scheduler.py <judge> <contestId> <time> [problems]")
+        print(f"Judges: {', '.join(fetchers.FETCHERS)}")
+        print("Time: HH:MM[:SS], 'YYYY-MM-DD HH:MM', +5m or now. Problems: A-F or A,B,C1,C2 "
+              f"(default {DEFAULT_PROBLEMS})")
+        print("Example: python scheduler.py contest 2139 17:35 A-F")
+        sys.exit(1)
+
+    judge, contestId, when = args[0], args[1].strip(), args[2]
+    problems = expandProblems(args[3] if len(args) == 4 else DEFAULT_PROBLEMS)
+    try:
+        fetcher = fetchers.getFetcher(judge)
+        startAt = parseStartTime(when, time.time())
+    except (fetchers.FetchError, ValueError) as e:
+        print(f"{RED}ERROR{RESET}: {e}")
+        sys.exit(1)
+
+    print(f"{YELLOW}Waiting{RESET} until {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(startAt))} "
+          f"for {judge} {contestId}...")
+    try:
+        results = FetchScheduler(fetcher, contestId, problems).run(startAt)
+    except KeyboardInterrupt:
+        print(f"\n{RED}Cancelled{RESET}")
+        sys.exit(1)
+
+    fetched = [r for r in results if r.success]
+    for r in results:
+        if not r.success:
+            print(f"{RED}{r.problem}{RESET}: {r.message} ({r.attempts} attempt(s))")
+    print(f"{GREEN}Fetched{RESET} {len(fetched)} of {len(results)} problems")
+    sys.exit(0 if fetched else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Indexed catalog of the test cases stored in tests/.
+Scans the directory once, maps every problem to its exact test IDs and
+re-scans incrementally whenever the directory mtime changes. Tests come from
+loose {prob}{i}.in/.out files or from a packed tests/{prob}.pack (see test_pack).
+"""
+import os
+import json
+import time
+import contextlib
+
+import test_pack
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TESTS_DIR = "tests"
+_METADATA_SUFFIX = "_metadata.json"
+_LOCK_FILE = ".lock"
+
+
+@contextlib.contextmanager
+def suiteLock(exclusive=False, testsDir=TESTS_DIR):
+    """
+    Lock tests/ against concurrent fetches.
+    Writers hold it exclusively while swapping files in; the runner holds it
+    shared for a whole batch so it never sees a half-replaced suite.
+    Windows only has exclusive locks, so readers serialize there too.
+    """
+    os.makedirs(testsDir, exist_ok=True)
+    with open(os.path.join(testsDir, _LOCK_FILE), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TestEntry:
+    """
+    A single test case of a problem: input + expected output.
+    Loose tests have file paths; packed tests have a pack path and index records
+    instead. Either way, read them through iterInput/readInput/readOutput.
+    """
+
+    def __init__(self, name, index, inputPath, outputPath, inputSize, outputSize,
+                 packPath=None, inputMember=None, outputMember=None):
+        self.name = name
+        self.index = index
+        self.inputPath = inputPath
+        self.outputPath = outputPath
+        self.inputSize = inputSize
+        self.outputSize = outputSize
+        self.packPath = packPath
+        self.inputMember = inputMember
+        self.outputMember = outputMember
+
+    @property
+    def hasOutput(self):
+        return self.outputPath is not None or self.outputMember is not None
+
+    @property
+    def isPacked(self):
+        return self.packPath is not None
+
+    def _iter(self, path, member, chunkSize):
+        if self.isPacked:
+            yield from test_pack.iterMember(self.packPath, member, chunkSize)
+            return
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunkSize)
+                if not chunk:
+                    return
+                yield chunk
+
+    def iterInput(self, chunkSize=1 << 16):
+        """Stream the raw input bytes without loading the whole test."""
+        return self._iter(self.inputPath, self.inputMember, chunkSize)
+
+    def iterOutput(self, chunkSize=1 << 16):
+        return self._iter(self.outputPath, self.outputMember, chunkSize)
+
+    def sendInput(self, fd):
+        """
+        Copy the raw input into fd inside the kernel (see test_pack.sendRange).
+        False when it has to go through iterInput instead: a compressed member, or no
+        kernel copy on this platform.
+        """
+        if self.isPacked:
+            return test_pack.sendMember(self.packPath, self.inputMember, fd)
+        return test_pack.sendRange(self.inputPath, 0, os.path.getsize(self.inputPath), fd)
+
+    def readInput(self):
+        return b"".join(self.iterInput()).decode("utf-8")
+
+    def readOutput(self):
+        return b"".join(self.iterOutput()).decode("utf-8")
+
+    def __repr__(self):
+        return f"TestEntry({self.name!r})"
+
+
+def _splitStem(stem, knownProblems):
+    """
+    Split a test stem like 'A12' into (problem, index).
+    A known problem whose name is followed only by digits owns the stem, so
+    'A11' belongs to problem 'A1' when tests/A1_metadata.json exists. When a
+    shorter and a longer known problem both match ('A11' with A and A1 both
+    known) the stem is ambiguous and (None, None) is returned.
+    Without a known owner the trailing digit run is the index.
+    """
+    owners = [prob for prob in knownProblems
+              if len(stem) > len(prob) and stem.startswith(prob) and stem[len(prob):].isdigit()]
+    if len(owners) > 1:
+        return None, None
+    if owners:
+        return owners[0], int(stem[len(owners[0]):])
+
+    cut = len(stem)
+    while cut > 0 and stem[cut - 1].isdigit():
+        cut -= 1
+    if cut == 0 or cut == len(stem):
+        return None, None
+    return stem[:cut], int(stem[cut:])
+
+
+class TestCatalog:
+    """
+    In-memory index of tests/ keyed by problem.
+    Every query calls refresh(), which only stats the directory; the directory is
+    re-listed (one scandir pass) only when its mtime changed since the last scan.
+
+    A problem is known when it has a metadata file or a pack. Loose tests of an
+    unknown problem split at their trailing digits, so without A1_metadata.json
+    'A11' is test 11 of A, never test 1 of A1: a problem whose name ends in a
+    digit needs its metadata file (fetch and addtest write one).
+    """
+
+    def __init__(self, testsDir=TESTS_DIR):
+        self.testsDir = testsDir
+        self._dirMtime = None
+        self._files = {}      # file name -> (mtimeNs, size)
+        self._metadata = {}   # problem -> (mtimeNs, dict)
+        self._packs = {}      # problem -> (mtimeNs, pack index)
+        self._tests = {}      # problem -> [TestEntry] sorted by index
+
+    def refresh(self, force=False):
+        """Re-scan tests/ if it changed since the last scan. Returns True if it did."""
+        try:
+            mtime = os.stat(self.testsDir).st_mtime_ns
+        except OSError:
+            self._dirMtime = None
+            self._files, self._metadata, self._packs, self._tests = {}, {}, {}, {}
+            return True
+
+        if not force and mtime == self._dirMtime:
+            return False
+
+        files = {}
+        with os.scandir(self.testsDir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                files[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        self._loadMetadata(files)
+        self._loadPacks(files)
+        self._files = files
+        self._dirMtime = mtime
+        self._index()
+        return True
+
+    def _loadMetadata(self, files):
+        """Parse metadata files, reusing the cached copy of unchanged ones."""
+        metadata = {}
+        for name, (mtimeNs, _) in files.items():
+            if not name.endswith(_METADATA_SUFFIX):
+                continue
+            prob = name[:-len(_METADATA_SUFFIX)]
+            cached = self._metadata.get(prob)
+            if cached and cached[0] == mtimeNs:
+                metadata[prob] = cached
+                continue
+            try:
+                with open(os.path.join(self.testsDir, name), "r", encoding="utf-8") as f:
+                    metadata[prob] = (mtimeNs, json.load(f))
+            except (OSError, ValueError):
+                metadata[prob] = (mtimeNs, {})
+        self._metadata = metadata
+
+    def _loadPacks(self, files):
+        """Read pack indexes, reusing the cached copy of unchanged packs."""
+        packs = {}
+        for name, (mtimeNs, _) in files.items():
+            if not name.endswith(test_pack.PACK_SUFFIX):
+                continue
+            prob = name[:-len(test_pack.PACK_SUFFIX)]
+            cached = self._packs.get(prob)
+            if cached and cached[0] == mtimeNs:
+                packs[prob] = cached
+                continue
+            try:
+                packs[prob] = (mtimeNs, test_pack.readIndex(os.path.join(self.testsDir, name)))
+            except (OSError, test_pack.PackError):
+                continue
+        self._packs = packs
+
+    def _index(self):
+        known = set(self._metadata) | set(self._packs)
+        tests = {}
+        for name, (_, size) in self._files.items():
+            if not name.endswith(".in"):
+                continue
+            stem = name[:-3]
+            prob, index = _splitStem(stem, known)
+            if prob is None:
+                continue
+            outName = stem + ".out"
+            outInfo = self._files.get(outName)
+            tests.setdefault(prob, []).append(TestEntry(
+                stem,
+                index,
+                os.path.join(self.testsDir, name),
+                os.path.join(self.testsDir, outName) if outInfo else None,
+                size,
+                outInfo[1] if outInfo else 0,
+            ))
+
+        # Packed tests fill in whatever has no loose copy: a loose file always wins
+        for prob, (_, index) in self._packs.items():
+            packPath = os.path.join(self.testsDir, prob + test_pack.PACK_SUFFIX)
+            entries = tests.setdefault(prob, [])
+            loose = {e.name for e in entries}
+            for t in index.get("tests", []):
+                if t["name"] in loose:
+                    continue
+                out = t.get("out")
+                entries.append(TestEntry(t["name"], t["index"], None, None, t["in"][2],
+                                         out[2] if out else 0, packPath, t["in"], out))
+
+        for entries in tests.values():
+            entries.sort(key=lambda e: e.index)
+        self._tests = tests
+
+    def problems(self):
+        """All problems that have tests or metadata."""
+        self.refresh()
+        return sorted(set(self._tests) | set(self._metadata) | set(self._packs))
+
+    def tests(self, problem):
+        """Test entries that belong to exactly this problem, in numeric order."""
+        self.refresh()
+        return list(self._tests.get(problem, []))
+
+    def testCount(self, problem):
+        return len(self.tests(problem))
+
+    def metadata(self, problem):
+        """Parsed {problem}_metadata.json (or the metadata stored in its pack), or an empty dict."""
+        self.refresh()
+        cached = self._metadata.get(problem)
+        if cached:
+            return dict(cached[1])
+        packed = self._packs.get(problem)
+        return dict(packed[1].get("metadata", {})) if packed else {}
+
+    def packPath(self, problem):
+        """Path of the problem's pack, or None if it has none."""
+        self.refresh()
+        if problem in self._packs:
+            return os.path.join(self.testsDir, problem + test_pack.PACK_SUFFIX)
+        return None
+
+    def files(self, problem):
+        """Every file on disk that belongs to the problem (loose tests, its pack and metadata)."""
+        paths = []
+        for e in self.tests(problem):
+            if e.isPacked:
+                continue
+            paths.append(e.inputPath)
+            if e.outputPath:
+                paths.append(e.outputPath)
+        if problem in self._packs:
+            paths.append(os.path.join(self.testsDir, problem + test_pack.PACK_SUFFIX))
+        if problem in self._metadata:
+            paths.append(os.path.join(self.testsDir, problem + _METADATA_SUFFIX))
+        return paths
+
+    def nextIndex(self, problem):
+        """Smallest index after every existing test of the problem."""
+        return max((e.index for e in self.tests(problem)), default=0) + 1
+
+
+_catalog = None
+
+
+def getCatalog():
+    """Process-wide catalog shared by the runner, the dashboard and listtests."""
+    global _catalog
+    if _catalog is None:
+        _catalog = TestCatalog()
+    return _catalog
@@ -0,0 +1,192 @@
+"""
+Packed test suites: every test of a problem in one indexed file, tests/{prob}.pack.
+
+Layout: an 8-byte magic, the offset and length of the index (two little-endian
+uint64), the member data, then the index itself as JSON at the end of the file.
+Each member is compressed on its own with the pack's codec (zstd or gzip), or
+kept raw when that would not shrink it, so any single test can be read or
+streamed without touching the others.
+"""
+import os
+import json
+import stat
+import zlib
+import struct
+
+try:
+    import zstandard
+    _hasZstd = True
+except ImportError:
+    _hasZstd = False
+
+MAGIC = b"CPTPACK1"
+PACK_SUFFIX = ".pack"
+CODECS = ("zstd", "gzip", "none")
+_HEADER = struct.Struct("<8sQQ")
+_CHUNK = 1 << 16
+
+
+class PackError(Exception):
+    """A file is not a valid test pack."""
+
+
+def defaultCodec():
+    return "zstd" if _hasZstd else "gzip"
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    if codec == "gzip":
+        c = zlib.compressobj(9, zlib.DEFLATED, 31)
+        return c.compress(data) + c.flush()
+    return data
+
+
+def readIndex(path):
+    """The index of a pack: {'metadata': {...}, 'tests': [{'name', 'index', 'in', 'out'}]}."""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise PackError(f"{path}: truncated header")
+        magic, offset, length = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise PackError(f"{path}: not a test pack")
+        f.seek(offset)
+        raw = f.read(length)
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        raise PackError(f"{path}: corrupt index ({e})")
+
+
+def iterMember(path, member, chunkSize=_CHUNK):
+    """
+    Stream one member's decompressed bytes in chunks.
+    member is an index record [offset, storedLength, rawLength, codec].
+    """
+    offset, length, _, codec = member
+    if codec == "zstd" and not _hasZstd:
+        raise PackError(f"{path}: member is zstd-compressed but 'zstandard' is not installed")
+    decompressor = None
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(31)
+    elif codec == "zstd":
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunkSize, remaining))
+            if not chunk:
+                raise PackError(f"{path}: truncated member")
+            remaining -= len(chunk)
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            if chunk:
+                yield chunk
+    if codec == "gzip":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def readMember(path, member):
+    return b"".join(iterMember(path, member))
+
+
+def sendRange(path, offset, length, fd):
+    """
+    Copy length bytes of a file, from offset, into fd without passing them through
+    Python: os.splice when fd is a pipe, os.sendfile otherwise. Returns False,
+    having written nothing, where the platform cannot (no such call, or e.g.
+    macOS sendfile, which only writes to sockets); the caller then streams instead.
+    """
+    splice = hasattr(os, "splice") and stat.S_ISFIFO(os.fstat(fd).st_mode)
+    if not splice and not hasattr(os, "sendfile"):
+        return False
+    position, end = offset, offset + length
+    with open(path, "rb") as f:
+        source = f.fileno()
+        while position < end:
+            try:
+                if splice:
+                    sent = os.splice(source, fd, end - position, offset_src=position)
+                else:
+                    sent = os.sendfile(fd, source, position, end - position)
+            except OSError:
+                if position > offset:
+                    raise  # part of the data is already in fd
+                return False
+            if sent == 0:
+                raise PackError(f"{path}: truncated at byte {position}")
+            position += sent
+    return True
+
+
+def sendMember(path, member, fd):
+    """sendRange for a member stored raw; False for compressed members, which must be streamed."""
+    offset, length, _, codec = member
+    return codec == "none" and sendRange(path, offset, length, fd)
+
+
+class PackWriter:
+    """
+    Write a pack sequentially: add() members one at a time, then close() writes the index.
+    Only one test is held in memory at a time.
+    """
+
+    def __init__(self, path, codec=None, metadata=None, sync=False):
+        codec = codec or defaultCodec()
+        if codec not in CODECS:
+            raise PackError(f"Unknown codec '{codec}'. Choose from: {', '.join(CODECS)}")
+        if codec == "zstd" and not _hasZstd:
+            raise PackError("zstd packs need 'zstandard'. Run 'pip install zstandard' or use gzip.")
+        self.path = path
+        self.codec = codec
+        self.sync = sync
+        self.metadata = dict(metadata or {})
+        self.tests = []
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, 0, 0))
+
+    def _writeMember(self, data):
+        stored, codec = data, "none"
+        if self.codec != "none":
+            packed = _compress(data, self.codec)
+            # Tiny samples often grow when compressed: keep those raw
+            if len(packed) < len(data):
+                stored, codec = packed, self.codec
+        offset = self._file.tell()
+        self._file.write(stored)
+        return [offset, len(stored), len(data), codec]
+
+    def add(self, name, index, inputData, outputData=None):
+        """Append one test; outputData is None for a test without expected output."""
+        self.tests.append({
+            "name": name,
+            "index": index,
+            "in": self._writeMember(inputData),
+            "out": self._writeMember(outputData) if outputData is not None else None,
+        })
+
+    def close(self):
+        raw = json.dumps({"metadata": self.metadata, "tests": self.tests}).encode()
+        offset = self._file.tell()
+        self._file.write(raw)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, offset, len(raw)))
+        if self.sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        if excType is None:
+            self.close()
+        else:
+            self._file.close()
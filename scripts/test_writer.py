@@ -0,0 +1,183 @@
+"""
+Shared writer that turns parsed sample tests into tests/ files.
+Used by every fetch backend and the Competitive Companion listener so they
+all produce the same layout: {prob}{i}.in, {prob}{i}.out, {prob}_metadata.json.
+packProblem/unpackProblem convert a problem between that layout and a
+single tests/{prob}.pack (see test_pack).
+
+Writes are staged: the whole problem is written into a hidden directory inside
+tests/ first, then swapped in with renames under the suite lock, so a crash
+mid-write leaves the old suite intact and a running batch never sees half of it.
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+import test_catalog
+import test_pack
+from utils import GREEN, RED, RESET
+
+TESTS_DIR = test_catalog.TESTS_DIR
+
+
+def _writeFile(path, text, sync):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _writeChunks(path, chunks, sync):
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _syncDir(path):
+    """Persist renames in a directory (no-op where directories can't be opened, e.g. Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def replaceProblemFiles(problemLetter, stage, sync=False):
+    """
+    Replace every file of a problem (loose tests, pack, metadata) with new ones.
+    stage(stagingDir) writes the new files into a hidden staging directory; they
+    are then swapped in under the exclusive suite lock. With sync=True the
+    directory is fsync'ed after the swap.
+    """
+    os.makedirs(TESTS_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".staging-{problemLetter}-", dir=TESTS_DIR)
+    try:
+        stage(staging)
+        staged = sorted(os.listdir(staging))
+        with test_catalog.suiteLock(exclusive=True):
+            # Remove existing test files for this problem to prevent stale data
+            keep = {os.path.join(TESTS_DIR, f) for f in staged}
+            for oldFile in test_catalog.getCatalog().files(problemLetter):
+                if oldFile not in keep:
+                    try:
+                        os.remove(oldFile)
+                    except OSError:
+                        pass
+            # Metadata goes last so the problem never looks complete before its tests are
+            staged.sort(key=lambda f: f.endswith("_metadata.json"))
+            for fileName in staged:
+                os.replace(os.path.join(staging, fileName), os.path.join(TESTS_DIR, fileName))
+            if sync:
+                _syncDir(TESTS_DIR)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def writeProblemTests(problemLetter, tests, metadata, sync=False):
+    """
+    Replace the tests of one problem.
+    tests is a list of (input, output) strings; metadata is written to
+    {prob}_metadata.json with testCount filled in. With sync=True every file
+    and the directory are fsync'ed before returning. Returns the written test names.
+    """
+    names = [f"{problemLetter}{i}" for i in range(1, len(tests) + 1)]
+    metadata = dict(metadata)
+    metadata.setdefault("problemLetter", problemLetter)
+    metadata["testCount"] = len(tests)
+
+    def stage(staging):
+        for name, (inp, out) in zip(names, tests):
+            _writeFile(os.path.join(staging, f"{name}.in"), inp.rstrip() + "\n", sync)
+            _writeFile(os.path.join(staging, f"{name}.out"), out.rstrip() + "\n", sync)
+        _writeFile(os.path.join(staging, f"{problemLetter}_metadata.json"),
+                   json.dumps(metadata, indent=2), sync)
+
+    replaceProblemFiles(problemLetter, stage, sync)
+    return names
+
+
+def packProblem(problemLetter, codec=None, sync=False):
+    """
+    Import a problem's tests (loose files and any existing pack) into tests/{prob}.pack.
+    The loose files and the metadata file are replaced by the pack. Returns the packed test count.
+    """
+    catalog = test_catalog.getCatalog()
+    with test_catalog.suiteLock():
+        tests = catalog.tests(problemLetter)
+        metadata = catalog.metadata(problemLetter)
+    if not tests:
+        return 0
+    metadata.setdefault("problemLetter", problemLetter)
+    metadata["testCount"] = len(tests)
+
+    def stage(staging):
+        path = os.path.join(staging, problemLetter + test_pack.PACK_SUFFIX)
+        with test_pack.PackWriter(path, codec, metadata, sync) as writer:
+            for t in tests:
+                output = b"".join(t.iterOutput()) if t.hasOutput else None
+                writer.add(t.name, t.index, b"".join(t.iterInput()), output)
+
+    replaceProblemFiles(problemLetter, stage, sync)
+    return len(tests)
+
+
+def unpackProblem(problemLetter, sync=False):
+    """Export a packed problem back to loose .in/.out files and its metadata file. Returns the test count."""
+    catalog = test_catalog.getCatalog()
+    with test_catalog.suiteLock():
+        tests = catalog.tests(problemLetter)
+        metadata = catalog.metadata(problemLetter)
+    if not any(t.isPacked for t in tests):
+        return 0
+
+    def stage(staging):
+        for t in tests:
+            _writeChunks(os.path.join(staging, f"{t.name}.in"), t.iterInput(), sync)
+            if t.hasOutput:
+                _writeChunks(os.path.join(staging, f"{t.name}.out"), t.iterOutput(), sync)
+        if metadata:
+            _writeFile(os.path.join(staging, f"{problemLetter}_metadata.json"),
+                       json.dumps(metadata, indent=2), sync)
+
+    replaceProblemFiles(problemLetter, stage, sync)
+    return len(tests)
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) not in (2, 3) or args[0] not in ("pack", "unpack"):
+        print("Usage: python test_writer.py pack <PROBLEM> [zstd|gzip|none]")
+        print("       python test_writer.py unpack <PROBLEM>")
+        sys.exit(1)
+
+    problem = args[1].upper()
+    try:
+        if args[0] == "pack":
+            count = packProblem(problem, args[2] if len(args) == 3 else None)
+            done = f"Packed {count} tests into {TESTS_DIR}/{problem}{test_pack.PACK_SUFFIX}"
+        else:
+            count = unpackProblem(problem)
+            done = f"Unpacked {count} tests of {problem} into {TESTS_DIR}/"
+    except (OSError, test_pack.PackError) as e:
+        print(f"{RED}ERROR{RESET}: {e}")
+        sys.exit(1)
+
+    if not count:
+        print(f"{RED}Error: No {'test files' if args[0] == 'pack' else 'packed tests'} found for problem {problem}{RESET}")
+        sys.exit(1)
+    print(f"{GREEN}{done}{RESET}")
+
+
+if __name__ == "__main__":
+    main()
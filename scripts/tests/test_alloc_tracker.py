@@ -0,0 +1,19 @@
+"""Call-site symbolization from addr2line -p output."""
+import subprocess
+
+import alloc_tracker
+
+ADDR2LINE = (
+    "0x0000000000001234: main at /work/src/F.cpp:5 (discriminator 7)\n"
+    "0x0000000000001300: main at /work/src/F.cpp:5\n"
+    "0x0000000000001400: std::vector<int>::push_back at /usr/include/c++/12/bits/stl_vector.h:1287\n"
+    " (inlined by) solve() at /work/src/F.cpp:9 (discriminator 1)\n"
+)
+
+
+def test_discriminators_do_not_split_a_line(monkeypatch):
+    monkeypatch.setattr(alloc_tracker.subprocess, "run",
+                        lambda *a, **k: subprocess.CompletedProcess(a, 0, ADDR2LINE, ""))
+    symbols = alloc_tracker.symbolize("bin/F", [0x1235, 0x1301, 0x1401])
+    assert symbols[0x1235] == symbols[0x1301] == [("main", "/work/src/F.cpp", "5")]
+    assert symbols[0x1401][1] == ("solve()", "/work/src/F.cpp", "9")
@@ -0,0 +1,19 @@
+"""Flag stamps describe only the binary they were written for."""
+import build
+
+
+def test_stamp_is_dropped_when_binary_is_rebuilt_elsewhere(tmp_path):
+    src = tmp_path / "D.cpp"
+    exe = tmp_path / "D"
+    src.write_text("int main() {}\n")
+    exe.write_bytes(b"pipe build")
+    flags = build.flagsFor(str(src)) + [build.PIPE_DEFINE]
+    build.markBuilt(str(exe), flags)
+    assert build.isPipeBuild(str(exe))
+    assert build.isUpToDate(str(src), str(exe), flags)
+
+    # e.g. make recompiles without -DJUDGE_PIPE and leaves the stamp alone
+    exe.write_bytes(b"freopen build from make")
+    assert not build.isPipeBuild(str(exe))
+    assert build.builtFlags(str(exe)) is None
+    assert not build.isUpToDate(str(src), str(exe), flags)
@@ -0,0 +1,39 @@
+"""Which tests belong to which problem when problem names are prefixes of each other."""
+import json
+
+import test_catalog
+
+
+def _touch(directory, *names):
+    for name in names:
+        (directory / name).write_text("1\n")
+
+
+def _metadata(directory, *problems):
+    for problem in problems:
+        (directory / f"{problem}_metadata.json").write_text(json.dumps({"timeLimit": 1}))
+
+
+def test_known_problem_keeps_its_tests(tmp_path):
+    _metadata(tmp_path, "B1")
+    _touch(tmp_path, "B11.in", "B11.out", "B12.in", "B12.out")
+    catalog = test_catalog.TestCatalog(str(tmp_path))
+    assert [e.name for e in catalog.tests("B1")] == ["B11", "B12"]
+    assert catalog.tests("B") == []
+
+
+def test_unknown_problem_splits_at_trailing_digits(tmp_path):
+    # Without A1_metadata.json, A11 is test 11 of A; A1 does not also claim it
+    _touch(tmp_path, "A1.in", "A1.out", "A11.in", "A11.out")
+    catalog = test_catalog.TestCatalog(str(tmp_path))
+    assert [(e.name, e.index) for e in catalog.tests("A")] == [("A1", 1), ("A11", 11)]
+    assert catalog.tests("A1") == []
+
+
+def test_ambiguous_stem_belongs_to_nobody(tmp_path):
+    # A11 could be test 11 of A or test 1 of A1, and both are known
+    _metadata(tmp_path, "A", "A1")
+    _touch(tmp_path, "A2.in", "A2.out", "A11.in", "A11.out", "A12.in", "A12.out")
+    catalog = test_catalog.TestCatalog(str(tmp_path))
+    assert [e.name for e in catalog.tests("A")] == ["A2"]
+    assert catalog.tests("A1") == []
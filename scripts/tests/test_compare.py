@@ -0,0 +1,22 @@
+"""A/B comparison verdicts over repeated rounds."""
+import compare
+import run_tests
+import test_catalog
+
+
+def test_failing_later_round_is_reported(tmp_path, monkeypatch):
+    (tmp_path / "C1.in").write_text("1\n")
+    (tmp_path / "C1.out").write_text("1\n")
+    test = test_catalog.TestEntry("C1", 1, str(tmp_path / "C1.in"), str(tmp_path / "C1.out"), 2, 2)
+    rounds = {"bin/A": iter(["OK", "TIME LIMIT EXCEEDED"]), "bin/B": iter(["OK", "OK"])}
+
+    def runSolution(executable, test, timeout, pipe=False, policy=None):
+        status = next(rounds[executable])
+        return status, "1" if status == "OK" else "", 0.1, {}, 1024
+
+    monkeypatch.setattr(run_tests, "runSolution", runSolution)
+    result = compare.compareOnTest([("A", "bin/A"), ("B", "bin/B")], test, 1.0, 5, None)
+    assert result.a.status == "TIME LIMIT EXCEEDED"
+    assert result.b.status == "OK"
+    assert not result.agree
+    assert result.verdicts == ("TIME LIMIT EXCEEDED", "ACCEPTED")
@@ -0,0 +1,27 @@
+"""JSON diagnostics are used only when the compiler accepts the flag."""
+import os
+import stat
+
+import pytest
+
+import diagnostics
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake compilers are shell scripts")
+
+
+def _fakeCompiler(directory, name, acceptsJson):
+    path = directory / name
+    check = 'case "$*" in *-fdiagnostics-format=json*) exit 1;; esac\n' if not acceptsJson else ""
+    path.write_text("#!/bin/sh\n" + check + "exit 0\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_probe_decides_not_the_name(tmp_path):
+    # An Apple-style g++ that is clang underneath, and a clang wrapper that does accept it
+    assert not diagnostics.supportsJson(_fakeCompiler(tmp_path, "g++", acceptsJson=False))
+    assert diagnostics.supportsJson(_fakeCompiler(tmp_path, "clang++", acceptsJson=True))
+
+
+def test_missing_compiler_falls_back_to_text(tmp_path):
+    assert not diagnostics.supportsJson(str(tmp_path / "no-such-compiler"))
@@ -0,0 +1,30 @@
+"""Every judge backend parses a saved problem page, with no network."""
+import os
+
+import pytest
+
+import fetchers
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("judge, page, tests, timeLimit", [
+    ("contest", "codeforces_problem.html", [("2\n1 2\n3 4", "3\n7"), ("1\n-5 5", "0")], "2"),
+    ("atcoder", "atcoder_task.html", [("1\n2 3\ntest", "6 test"), ("72\n128 256\nmyonmyon", "456 myonmyon")], "2"),
+    ("cses", "cses_task.html", [("3", "3 10 5 16 8 4 2 1")], "1.00"),
+    ("codechef", "codechef_problem.json", [("3\n1 2\n100 200\n10 40", "3\n300\n50")], "1"),
+])
+def test_parse(judge, page, tests, timeLimit):
+    data = fetchers.getFetcher(judge).parse(_fixture(page))
+    assert data.tests == tests
+    assert data.timeLimit == timeLimit
+
+
+def test_codechef_rejects_non_json():
+    with pytest.raises(fetchers.FetchError):
+        fetchers.getFetcher("codechef").parse("<html>Just a moment...</html>")
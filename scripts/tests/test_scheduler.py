@@ -0,0 +1,108 @@
+"""Contest-start scheduling against stubbed judges: a patched Codeforces fetch and a local HTTP server."""
+import os
+import time
+import threading
+import http.server
+
+import cf_fetch
+import fetchers
+import scheduler
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.time += max(0.0, seconds)
+
+
+def test_missing_codeforces_problem_is_dropped(tmp_path, monkeypatch):
+    with open(os.path.join(FIXTURES, "codeforces_problem.html"), "r", encoding="utf-8") as f:
+        page = f.read()
+    monkeypatch.chdir(tmp_path)
+    fetcher = fetchers.CodeforcesFetcher("contest")
+    clock = FakeClock()
+    run = scheduler.FetchScheduler(fetcher, "2139", ["A", "G"], clock=clock, log=lambda *_: None)
+
+    def fetchPage(typeParam, contestId, problem, maxRetries=2, raiseNotFound=False):
+        if problem == "A":
+            return page
+        run._arrived.wait(5)
+        assert raiseNotFound
+        raise fetchers.NotFoundError(f"Problem {contestId}{problem} not found")
+
+    monkeypatch.setattr(cf_fetch, "fetchPage", fetchPage)
+    a, g = run.run(startAt=0)
+    assert a.success and os.path.exists(os.path.join("tests", "A1.in"))
+    assert not g.success and g.message == "not in this contest" and g.attempts == 1
+    assert clock.now() < scheduler.DEADLINE
+
+
+class StubJudge(http.server.BaseHTTPRequestHandler):
+    """A: served at once; B: busy (503) on the first try; C: a page the parser crashes on; Z: not in the contest."""
+    page = ""
+    hits = {}
+
+    def do_GET(self):
+        problem = self.path.rsplit("/", 1)[-1]
+        StubJudge.hits[problem] = StubJudge.hits.get(problem, 0) + 1
+        if problem == "Z":
+            time.sleep(0.2)  # answer after A has arrived, as a live contest would
+            status, body = 404, "Not Found"
+        elif problem == "B" and StubJudge.hits[problem] == 1:
+            status, body = 503, "Busy"
+        elif problem == "C":
+            status, body = 200, "<crash>"
+        else:
+            status, body = 200, StubJudge.page
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubFetcher(fetchers.CsesFetcher):
+    def __init__(self, base):
+        self.base = base
+
+    def problemUrl(self, contestId, problemId):
+        return f"{self.base}/{contestId}/{problemId}"
+
+    def parse(self, page):
+        if page == "<crash>":
+            raise IndexError("unexpected page layout")
+        return super().parse(page)
+
+
+def test_contest_replay_against_stub_server(tmp_path, monkeypatch):
+    with open(os.path.join(FIXTURES, "cses_task.html"), "r", encoding="utf-8") as f:
+        StubJudge.page = f.read()
+    StubJudge.hits = {}
+    monkeypatch.chdir(tmp_path)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubJudge)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = StubFetcher(f"http://127.0.0.1:{server.server_address[1]}")
+        run = scheduler.FetchScheduler(fetcher, "1", ["A", "B", "C", "Z"], clock=FakeClock(), log=lambda *_: None)
+        a, b, c, z = run.run(startAt=0)
+    finally:
+        server.shutdown()
+        server.server_close()
+        fetchers.sharedClient.close()
+
+    assert a.success and a.attempts == 1
+    assert b.success and b.attempts == 2
+    assert not c.success and c.message.startswith("IndexError") and c.attempts == 1
+    assert not z.success and z.message == "not in this contest"
+    written = sorted(f for f in os.listdir("tests") if not f.startswith("."))
+    assert written == ["A1.in", "A1.out", "A_metadata.json", "B1.in", "B1.out", "B_metadata.json"]
@@ -2,8 +2,14 @@
 Terminal UI module for the competitive programming test runner.
 Sleek, minimal, cyber-circuit aesthetic.
 """
+import os
 import sys
+import math
 import difflib
+import statistics
+
+import io_stats
+import debug_records
 
 VERSION = "1.0"
 
@@ -31,6 +37,413 @@ def formatMemory(bytesVal):
         return f"{bytesVal / (1024 * 1024):.2f} MB"
 
 
+def formatSeconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    elif seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    else:
+        return f"{seconds * 1e6:.1f}µs"
+
+
+_SPARKS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values, width=20):
+    """Unicode sparkline of a series, resampled to at most `width` characters."""
+    if not values:
+        return ""
+    if len(values) > width:
+        values = [max(values[i * len(values) // width:(i + 1) * len(values) // width]) for i in range(width)]
+    lo, hi = min(values), max(values)
+    span = hi - lo or 1
+    return "".join(_SPARKS[int((v - lo) / span * (len(_SPARKS) - 1))] for v in values)
+
+
+def buildTimelineTable(timelines):
+    """RSS / CPU / page-fault sparklines for every sampled test: {testCase: timeline dict}."""
+    table = Table(
+        title="[bold #e0e0e0]Resource Timelines[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Test Case", style="bold #e0e0e0", no_wrap=True)
+    table.add_column("RSS", style="#00e5ff", no_wrap=True)
+    table.add_column("Peak", justify="right", style="#e0e0e0", no_wrap=True)
+    table.add_column("CPU %", style="#00ff41", no_wrap=True)
+    table.add_column("Faults", justify="right", style="#84967e", no_wrap=True)
+
+    for testCase, timeline in timelines.items():
+        faults = timeline["faults"]
+        table.add_row(
+            testCase,
+            sparkline(timeline["rss"]),
+            formatMemory(max(timeline["rss"])),
+            sparkline(timeline["cpu"]),
+            str(faults[-1] - faults[0]) if faults else "—"
+        )
+
+    return table
+
+
+def buildIoTable(ioByTest):
+    """Bytes and syscalls per test: {testCase: details["io"]} (see io_stats)."""
+    table = Table(
+        title="[bold #e0e0e0]I/O[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Test Case", style="bold #e0e0e0", no_wrap=True)
+    table.add_column("Read", justify="right", no_wrap=True)
+    table.add_column("Written", justify="right", no_wrap=True)
+    table.add_column("Writes", justify="right", no_wrap=True)
+    table.add_column("Avg write", justify="right", no_wrap=True)
+    table.add_column("Out MB/s", justify="right", no_wrap=True)
+
+    for testCase, io in ioByTest.items():
+        flagged = io_stats.smallWrites(io)
+        average = io["written"] / io["writes"] if io["writes"] else 0
+        style = "#ff9100" if flagged else "#e0e0e0"
+        table.add_row(
+            testCase,
+            formatMemory(io["read"]),
+            formatMemory(io["written"]),
+            f"[{style}]{io['writes']}[/]",
+            f"[{style}]{average:.0f} B[/]",
+            f"{io['writeRate']:.1f}"
+        )
+
+    return table
+
+
+def buildBlockTable(blocks):
+    """TIME_BLOCK totals across the test set: [debug_records.BlockStats], largest total first."""
+    table = Table(
+        title="[bold #e0e0e0]Time blocks[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Block", style="bold #e0e0e0")
+    table.add_column("Calls", justify="right", no_wrap=True)
+    table.add_column("Tests", justify="right", no_wrap=True)
+    table.add_column("Total", justify="right", no_wrap=True)
+    table.add_column("Mean", justify="right", no_wrap=True)
+    table.add_column("Max", justify="right", no_wrap=True)
+
+    grandTotal = sum(block.total for block in blocks) or 1
+    for block in blocks:
+        # A single call over the TL the block was given is what the text-mode timer warned about
+        maxStyle = "#ff1744" if block.max > block.limit else "#e0e0e0"
+        table.add_row(
+            block.label,
+            str(block.calls),
+            str(block.tests),
+            f"{formatSeconds(block.total)} [#666666]({block.total / grandTotal:.0%})[/]",
+            formatSeconds(block.mean),
+            f"[{maxStyle}]{formatSeconds(block.max)}[/] [#666666]({block.slowestTest})[/]"
+        )
+
+    return table
+
+
+def buildHotTable(functions, total, unit):
+    """Hottest functions of a profile: [(name, self, total)] by self weight (see profiler)."""
+    table = Table(
+        title="[bold #e0e0e0]Hot functions[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Function", style="bold #e0e0e0")
+    table.add_column("Self", justify="right", no_wrap=True)
+    table.add_column("Self %", justify="right", no_wrap=True)
+    table.add_column("Total %", justify="right", no_wrap=True)
+
+    total = total or 1
+    for name, selfWeight, totalWeight in functions:
+        share = selfWeight / total
+        style = "#ff1744" if share >= 0.3 else "#ff9100" if share >= 0.1 else "#e0e0e0"
+        table.add_row(
+            name,
+            f"{selfWeight:.3g} {unit}",
+            f"[{style}]{share:.1%}[/]",
+            f"{totalWeight / total:.1%}"
+        )
+
+    return table
+
+
+def buildAllocTable(testCase, alloc):
+    """Heap at its peak for one test, by call site: details["alloc"] (see alloc_tracker)."""
+    table = Table(
+        title=f"[bold #e0e0e0]Heap at peak - {testCase}: {formatMemory(alloc['peak'])} heap, "
+              f"{formatMemory(alloc['static'])} static arrays[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Call site", style="bold #e0e0e0")
+    table.add_column("Via", style="#666666")
+    table.add_column("At peak", justify="right", no_wrap=True)
+    table.add_column("Allocs", justify="right", no_wrap=True)
+    table.add_column("Allocated", justify="right", no_wrap=True)
+
+    peak = alloc["peak"] or 1
+    for site in alloc["sites"]:
+        share = site["bytes"] / peak
+        style = "#ff1744" if share >= 0.5 else "#ff9100" if share >= 0.2 else "#e0e0e0"
+        table.add_row(
+            site["where"],
+            site["kind"],
+            f"[{style}]{formatMemory(site['bytes']) if site['bytes'] else '0'} ({share:.0%})[/]",
+            str(site["count"]),
+            formatMemory(site["total"])
+        )
+
+    return table
+
+
+def buildScaleTable(measurements, fit, maxN, timeLimit, width=30):
+    """
+    Measured vs fitted time per input size (see complexity), with a bar per row
+    on a log scale ('█' measured, '│' fitted) and the fit extrapolated to maxN.
+    """
+    table = Table(
+        title=f"[bold #e0e0e0]Scaling - best fit {fit.name}[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("n", justify="right", style="bold #e0e0e0", no_wrap=True)
+    table.add_column("Time", justify="right", no_wrap=True)
+    table.add_column("Fit", justify="right", style="#84967e", no_wrap=True)
+    table.add_column("Memory", justify="right", style="#e0e0e0", no_wrap=True)
+    table.add_column("log time", no_wrap=True)
+
+    rows = [(m.n, m.time, m.memory) for m in measurements]
+    if maxN > rows[-1][0]:
+        rows.append((maxN, None, None))
+    predictions = [fit.predict(n) for n, _, _ in rows]
+    values = [v for v in [t for _, t, _ in rows] + predictions + [timeLimit] if v and v > 0]
+    lo, hi = math.log(min(values)), math.log(max(values))
+    span = hi - lo or 1
+
+    def column(value):
+        return int((math.log(value) - lo) / span * (width - 1)) if value > 0 else 0
+
+    limitCol = column(timeLimit)
+    for (n, measured, memory), predicted in zip(rows, predictions):
+        cells = [" "] * width
+        if measured:
+            for i in range(column(measured) + 1):
+                cells[i] = "█"
+        cells[limitCol] = "[#ff1744]┆[/]" if cells[limitCol] == " " else "[#ff1744]█[/]"
+        cells[column(predicted)] = "[#00e5ff]│[/]"
+        if measured is None:
+            color = "#ff1744" if predicted > timeLimit else "#ff9100" if predicted > timeLimit / 2 else "#00ff41"
+            timeStr = f"[{color}]~{predicted:.3f}s[/]"
+        else:
+            timeStr = f"{measured:.3f}s"
+        table.add_row(
+            f"{n:,}",
+            timeStr,
+            f"{predicted:.3f}s",
+            formatMemory(memory) if memory else "—",
+            "[#00ff41]" + "".join(cells) + "[/]"
+        )
+
+    return table
+
+
+_SHORT_VERDICTS = {"OK": "OK", "ACCEPTED": "AC", "WRONG ANSWER": "WA", "TIME LIMIT EXCEEDED": "TLE",
+                   "RUNTIME ERROR": "RE", "ERROR": "ERR"}
+
+
+def buildCompareTable(comparisons, labelA, labelB):
+    """
+    Per-test median times, speedup of B over A with its 95% CI, B/A memory ratio,
+    whether the outputs agree, and each side's verdict on tests with expected output.
+    """
+    table = Table(
+        title=f"[bold #e0e0e0]{labelA} vs {labelB}[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Test", style="bold #e0e0e0", no_wrap=True)
+    table.add_column(labelA, justify="right", no_wrap=True)
+    table.add_column(labelB, justify="right", no_wrap=True)
+    table.add_column("Speedup (95% CI)", justify="right", no_wrap=True)
+    table.add_column("Memory", justify="right", style="#e0e0e0", no_wrap=True)
+    table.add_column("Outputs", no_wrap=True)
+    table.add_column("Judged", no_wrap=True)
+
+    for c in comparisons:
+        speedup = c.speedup
+        if speedup is None:
+            speedupStr = "[#666666]—[/]"
+        else:
+            value, low, high = speedup
+            # Only call it a win or a loss when the whole interval is on one side of 1x
+            color = "#00ff41" if low > 1 else "#ff1744" if high < 1 else "#e0e0e0"
+            speedupStr = f"[{color}]{value:.2f}x[/] [#666666]({low:.2f}-{high:.2f})[/]"
+        ratio = c.memoryRatio
+        if c.agree:
+            outputs = "[#00ff41]agree[/]"
+        else:
+            outputs = f"[bold #ff1744]DIFFER[/] [#666666]({_SHORT_VERDICTS.get(c.a.status, c.a.status)}" \
+                      f" / {_SHORT_VERDICTS.get(c.b.status, c.b.status)})[/]"
+        if c.verdicts:
+            verdicts = " / ".join(
+                f"[{'#00ff41' if v == 'ACCEPTED' else '#ff1744'}]{_SHORT_VERDICTS.get(v, v)}[/]" for v in c.verdicts
+            )
+        else:
+            verdicts = "[#666666]—[/]"
+        table.add_row(
+            c.name,
+            f"{statistics.median(c.a.times):.3f}s" if c.a.times else "—",
+            f"{statistics.median(c.b.times):.3f}s" if c.b.times else "—",
+            speedupStr,
+            f"{ratio:.2f}x" if ratio else "[#666666]N/A[/]",
+            outputs,
+            verdicts
+        )
+
+    return table
+
+
+def buildMatrixTable(runs):
+    """
+    Verdict and time of every test under each build profile, side by side.
+    runs maps profile names (first one is the baseline) to TestReporter.results;
+    tests whose verdict depends on the profile are marked, totals compare to the baseline.
+    """
+    table = Table(
+        title="[bold #e0e0e0]Build Matrix[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Test", style="bold #e0e0e0", no_wrap=True)
+    for name in runs:
+        table.add_column(name, justify="right", no_wrap=True)
+    table.add_column("", no_wrap=True)
+
+    byTest = {}
+    for name, results in runs.items():
+        for success, testCase, execTime, timeout, message, memory in results:
+            byTest.setdefault(testCase, {})[name] = (success, execTime, timeout, message)
+
+    for testCase, cells in byTest.items():
+        row = []
+        verdicts = set()
+        for name in runs:
+            if name not in cells:
+                row.append("[#666666]—[/]")
+                continue
+            success, execTime, timeout, message = cells[name]
+            verdict = _SHORT_VERDICTS.get(message.split(" (")[0].split(":")[0], message)
+            verdicts.add(verdict)
+            color = "#ff1744" if not success or execTime >= timeout else "#ff9100" if execTime >= timeout / 2 else "#e0e0e0"
+            row.append(f"[{'#00ff41' if success else '#ff1744'}]{verdict}[/] [{color}]{execTime:.3f}s[/]")
+        differs = "[bold #ff9100]differs[/]" if len(verdicts) > 1 else ""
+        table.add_row(testCase, *row, differs)
+
+    baseline = None
+    totals = []
+    for results in runs.values():
+        total = sum(execTime for _, _, execTime, _, _, _ in results)
+        passed = sum(1 for success, *_ in results if success)
+        cell = f"{passed}/{len(results)} [#e0e0e0]{total:.3f}s[/]" if results else "[#666666]—[/]"
+        if baseline is None:
+            baseline = total
+        elif results and baseline > 0:
+            cell += f" [#666666]({total / baseline:.2f}x)[/]"
+        totals.append(cell)
+    table.add_section()
+    table.add_row("Total", *totals, "")
+    return table
+
+
+def buildDiagnosticsTable(diagnostics):
+    """Compact table of compiler diagnostics with file:line:col locations (clickable in most terminals)."""
+    kindStyles = {"error": "bold #ff1744", "fatal error": "bold #ff1744", "warning": "#ff9100", "note": "#666666"}
+    table = Table(
+        title="[bold #e0e0e0]Compiler Diagnostics[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    table.add_column("Kind", width=8)
+    table.add_column("Location", style="#e0e0e0", no_wrap=True)
+    table.add_column("Message")
+
+    for d in diagnostics:
+        style = kindStyles.get(d["kind"], "#e0e0e0")
+        location = f"{d['file']}:{d['line']}:{d['column']}"
+        message = Text(d["message"], style="#e0e0e0" if d["kind"] != "note" else "#666666")
+        if d.get("option"):
+            message.append(f" [{d['option']}]", style="#666666")
+        table.add_row(Text(d["kind"], style=style), location, message)
+
+    return table
+
+
+def buildProfileTables(record, history):
+    """Tables for a compile profile: where the time went, which headers cost it, and the trend."""
+    costs = Table(
+        title=f"[bold #e0e0e0]Compile Profile - {record['src']}[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    costs.add_column("Phase / Pass / Header", style="#e0e0e0")
+    costs.add_column("Wall", justify="right")
+    costs.add_column("Share", justify="right", style="#666666")
+
+    total = record["wall"] or 1.0
+    for name, wall in record["phases"].items():
+        costs.add_row(f"[bold]phase {name}[/]", f"{wall:.2f}s", f"{wall / total:.0%}")
+    for name, wall in record["top"].items():
+        costs.add_row(f"  {name}", f"[#ff9100]{wall:.2f}s[/]", f"{wall / total:.0%}")
+    for header, wall in record["headers"]:
+        costs.add_row(f"[#00e5ff]#include {header}[/]", f"{wall:.2f}s", f"{wall / total:.0%}")
+    costs.add_row("[bold]total[/]", f"[bold]{record['wall']:.2f}s[/]", "")
+
+    trend = Table(
+        title="[bold #e0e0e0]Build Trend[/]",
+        border_style="#00e5ff",
+        header_style="bold #00e5ff",
+        box=box.SQUARE
+    )
+    trend.add_column("When", style="#666666")
+    trend.add_column("Wall", justify="right")
+    trend.add_column("Parsing", justify="right")
+    trend.add_column("Binary", justify="right", style="#e0e0e0")
+    trend.add_column("Δ Wall", justify="right")
+
+    previous = None
+    for entry in history:
+        delta = ""
+        if previous is not None:
+            diff = entry["wall"] - previous["wall"]
+            style = "#ff1744" if diff > 0.05 * previous["wall"] else "#00ff41" if diff < -0.05 * previous["wall"] else "#666666"
+            delta = f"[{style}]{diff:+.2f}s[/]"
+        trend.add_row(
+            entry["timestamp"],
+            f"{entry['wall']:.2f}s",
+            f"{entry['phases'].get('parsing', 0.0):.2f}s",
+            formatMemory(entry["binarySize"]),
+            delta
+        )
+        previous = entry
+
+    return costs, trend
+
+
 class TestReporter:
     def __init__(self, hasPsutil=True):
         self.console = Console()
@@ -40,10 +453,17 @@ class TestReporter:
         self.total = 0
         self.panelsToPrint = []
         self.results = []
-        self.currentTest = None
-        self.currentTime = 0.0
-        self.currentMemory = 0
+        self.running = {}  # testCase -> [elapsed, memory] for every test in flight
         self.live = None
+        self.findings = {}
+        self.stopNote = None
+        self.cachedTests = set()
+        self.timelines = {}
+        self.timings = {}  # testCase -> details["timing"] of repeated runs
+        self.io = {}  # testCase -> details["io"]
+        self.blocks = {}  # testCase -> details["blocks"] of a -DDEBUG_RECORDS build
+        self.allocs = {}  # testCase -> details["alloc"] of a --memprofile run
+        self.scale = None  # (reference name, factor) when times are also shown for a reference machine
 
     def printInfo(self, msg):
         self.console.print(f"[#666666]{msg}[/]")
@@ -59,29 +479,39 @@ class TestReporter:
         self.console.print(f"[bold #00e5ff]CODE_RUNNER_v{VERSION} - RUNNING: Problem {problem}[/]")
         self.console.print(f"[#666666]" + "—" * 40 + "[/]")
 
-    def startTests(self, totalTests):
+    def startTests(self, totalTests, scale=None):
         self.total = totalTests
+        self.scale = scale
         self.passed = 0
         self.failed = 0
         self.results = []
         self.panelsToPrint = []
-        self.currentTest = None
-        self.currentTime = 0.0
-        self.currentMemory = 0
+        self.running = {}
+        self.findings = {}
+        self.stopNote = None
+        self.cachedTests = set()
+        self.timelines = {}
+        self.timings = {}  # testCase -> details["timing"] of repeated runs
+        self.io = {}
+        self.blocks = {}
+        self.allocs = {}
+        self._startDisplay()
+
+    def _startDisplay(self):
         self.live = Live(self._generateTable(), refresh_per_second=10, console=self.console)
         self.live.start()
 
     def updateLiveTest(self, testCase, execTime, memory):
-        self.currentTest = testCase
-        self.currentTime = execTime
-        self.currentMemory = memory
+        self.running[testCase] = [execTime, memory]
         if self.live:
             self.live.update(self._generateTable())
 
-    def updateProgress(self, execTime, memory):
+    def updateProgress(self, execTime, memory, testCase=None):
         """Update elapsed time during polling; auto_refresh (10 fps) handles display."""
-        self.currentTime = execTime
-        self.currentMemory = memory
+        if testCase is None and self.running:
+            testCase = next(reversed(self.running))
+        if testCase in self.running:
+            self.running[testCase] = [execTime, memory]
 
     def _timeStyle(self, execTime, timeout, success):
         """Return a color based on how close execTime is to the timeout limit."""
@@ -105,13 +535,24 @@ class TestReporter:
         table.add_column("Status", width=12, justify="center")
         table.add_column("Test Case", style="bold #e0e0e0")
         table.add_column("Time", justify="right")
+        if self.scale:
+            table.add_column(f"≈ {self.scale[0]}", justify="right")
         table.add_column("Memory", justify="right", style="#e0e0e0")
+        if self.allocs:
+            table.add_column("Top allocator", style="#666666", no_wrap=True)
         table.add_column("Details")
 
         for success, testCase, execTime, timeout, message, memory in self.results:
             timeStr = f"{execTime:.3f}s"
             memStr = formatMemory(memory) if self.hasPsutil else "N/A"
             timeStyle = self._timeStyle(execTime, timeout, success)
+            timing = self.timings.get(testCase)
+            nearTag = ""
+            if timing:
+                timeStr += f" ±{timing['spread']:.3f}"
+                # The verdict could flip on another run when the band reaches the limit
+                if success and timeout > 0 and execTime + timing["spread"] >= timeout:
+                    nearTag = " [#ff9100](near limit)[/]"
             if success:
                 statusStr = "[bold #0a0a0a on #00ff41] PASS [/]"
                 msgStyle = "#00ff41"
@@ -119,28 +560,48 @@ class TestReporter:
                 statusStr = "[bold #e0e0e0 on #ff1744] FAIL [/]"
                 msgStyle = "#ff1744"
 
+            cachedTag = " [#666666](cached)[/]" if testCase in self.cachedTests else ""
+            if io_stats.smallWrites(self.io.get(testCase)):
+                cachedTag += " [#ff9100](slow I/O)[/]"
+            allocCell = [self._topAllocator(testCase)] if self.allocs else []
+            scaledCell = []
+            if self.scale:
+                # Colored against the same limit: the judge's verdict is what the estimate is for
+                scaled = execTime * self.scale[1]
+                scaledCell = [f"[{self._timeStyle(scaled, timeout, success)}]{scaled:.3f}s[/]"]
             table.add_row(
                 statusStr,
                 testCase,
                 f"[{timeStyle}]{timeStr}[/]",
+                *scaledCell,
                 memStr,
-                f"[{msgStyle}]{message}[/]"
+                *allocCell,
+                f"[{msgStyle}]{message}[/]{cachedTag}{nearTag}"
             )
 
-        if self.currentTest:
-            timeStr = f"{self.currentTime:.3f}s"
-            memStr = formatMemory(self.currentMemory) if self.hasPsutil else "N/A"
+        for testCase, (execTime, memory) in list(self.running.items()):
+            timeStr = f"{execTime:.3f}s"
+            memStr = formatMemory(memory) if self.hasPsutil else "N/A"
             statusStr = "[bold #0a0a0a on #ff9100] RUNNING [/]"
             table.add_row(
                 statusStr,
-                self.currentTest,
+                testCase,
                 f"[#ff9100]{timeStr}[/]",
+                *([""] if self.scale else []),
                 memStr,
+                *([""] if self.allocs else []),
                 "[#ff9100]Executing...[/]"
             )
 
         return table
 
+    def _topAllocator(self, testCase):
+        alloc = self.allocs.get(testCase)
+        if not alloc or not alloc["sites"] or not alloc["peak"]:
+            return ""
+        site = alloc["sites"][0]
+        return f"{os.path.basename(site['where'])} {site['bytes'] / alloc['peak']:.0%}"
+
     def _buildWrongAnswerPanel(self, expected, actual):
         expectedLines = expected.split('\n')
         actualLines = actual.split('\n')
@@ -184,6 +645,41 @@ class TestReporter:
 
         return table
 
+    def addFindings(self, testCase, findings):
+        """Record sanitizer findings; the same issue from several tests is kept once."""
+        for finding in findings:
+            entry = self.findings.setdefault(finding.key, [finding, []])
+            if testCase not in entry[1]:
+                entry[1].append(testCase)
+
+    def markStopped(self, reason, skipped):
+        """Note that the batch ended early, leaving `skipped` tests unrun."""
+        self.stopNote = f"Stopped at {reason} - {skipped} test(s) skipped"
+
+    def _buildFindingsTable(self):
+        table = Table(
+            title="[bold #e0e0e0]Sanitizer Findings[/]",
+            border_style="#ff9100",
+            header_style="bold #ff9100",
+            box=box.SQUARE
+        )
+        table.add_column("Issue", style="bold #ff1744")
+        table.add_column("Location", style="#e0e0e0", no_wrap=True)
+        table.add_column("Frame", style="#84967e")
+        table.add_column("Source")
+        table.add_column("Tests", style="#00e5ff")
+
+        for finding, testCases in self.findings.values():
+            table.add_row(
+                finding.message,
+                finding.location,
+                finding.frame,
+                Text(finding.sourceLine(), style="#e0e0e0"),
+                ", ".join(testCases)
+            )
+
+        return table
+
     def _printTimingSummary(self):
         """Print fastest / slowest / average timing across all tests."""
         if not self.results:
@@ -200,10 +696,26 @@ class TestReporter:
             f"Slowest: [#ff9100]{slowest:.3f}s[/] ({slowestName})  "
             f"Avg: [#e0e0e0]{avg:.3f}s[/][/]"
         )
+        if self.scale:
+            name, factor = self.scale
+            self.printInfo(f"On {name}: slowest ≈ {slowest * factor:.3f}s (local times × {factor:.2f}, "
+                           f"from calibration scores)")
 
-    def addResult(self, testCase, success, execTime, timeout, message, memory=0, details=None):
-        self.currentTest = None
+    def addResult(self, testCase, success, execTime, timeout, message, memory=0, details=None, cached=False):
+        self.running.pop(testCase, None)
         self.results.append((success, testCase, execTime, timeout, message, memory))
+        if cached:
+            self.cachedTests.add(testCase)
+        if details and details.get("timeline"):
+            self.timelines[testCase] = details["timeline"]
+        if details and details.get("timing"):
+            self.timings[testCase] = details["timing"]
+        if details and details.get("io"):
+            self.io[testCase] = details["io"]
+        if details and details.get("blocks"):
+            self.blocks[testCase] = details["blocks"]
+        if details and details.get("alloc"):
+            self.allocs[testCase] = details["alloc"]
 
         if success:
             self.passed += 1
@@ -243,6 +755,7 @@ class TestReporter:
             self.live.update(self._generateTable())
 
     def stopTests(self):
+        self.running = {}
         if self.live:
             self.live.stop()
             self.live = None
@@ -254,7 +767,48 @@ class TestReporter:
             self.console.print(panel)
             self.console.print()
 
+        if self.findings:
+            self.console.print(self._buildFindingsTable())
+            self.console.print()
+
+        if self.timelines:
+            self.console.print(buildTimelineTable(self.timelines))
+            self.console.print()
+
+        # I/O only earns a table when it could matter: many tiny writes or a megabyte of output
+        heavyIo = {t: io for t, io in self.io.items() if io_stats.smallWrites(io) or io["written"] >= 1 << 20}
+        if heavyIo:
+            self.console.print(buildIoTable(heavyIo))
+            self.console.print()
+
+        if self.blocks:
+            self.console.print(buildBlockTable(debug_records.aggregate(self.blocks)))
+            self.console.print()
+
+        # The test with the largest heap is the one an MLE comes from
+        if self.allocs:
+            testCase = max(self.allocs, key=lambda t: self.allocs[t]["peak"])
+            self.console.print(buildAllocTable(testCase, self.allocs[testCase]))
+            self.printInfo("The Memory column includes the tracker's own bookkeeping; heap + static arrays is what the solution needs")
+            self.console.print()
+
         self._printTimingSummary()
+        if self.cachedTests:
+            self.printInfo(f"{len(self.cachedTests)} of {len(self.results)} verdicts reused from cache (--fresh re-runs them)")
+        if self.timings:
+            noisiest = max(self.timings, key=lambda t: self.timings[t]["cv"])
+            runs = max(t["runs"] for t in self.timings.values())
+            self.printInfo(f"Times are medians of up to {runs} runs, ± the 95% band. "
+                           f"Noisiest: {noisiest} (CV {self.timings[noisiest]['cv']:.1%})")
+
+        chatty = {t: io_stats.smallWrites(io) for t, io in self.io.items() if io_stats.smallWrites(io)}
+        if chatty:
+            testCase, (writes, average) = max(chatty.items(), key=lambda item: item[1][0])
+            self.printWarning(f"Slow I/O on {len(chatty)} test(s) ({testCase}: {writes} writes of {average:.0f} B on average). "
+                              f"Avoid endl/flush and keep sync_with_stdio(false); debug() output to stderr counts too")
+
+        if self.stopNote:
+            self.printWarning(self.stopNote)
 
         if self.passed == self.total and self.total > 0:
             self.console.print(f"[bold #0a0a0a on #00ff41] ✔ All {self.total} tests passed! [/]")
@@ -265,3 +819,37 @@ class TestReporter:
                 f"[bold #0a0a0a on #e0e0e0] {self.total} total [/]"
             )
         self.console.print()
+
+
+class QuietReporter(TestReporter):
+    """
+    Collects results like TestReporter but draws nothing, for callers that run the
+    suite several times and print one combined report (see build_matrix).
+    """
+
+    def __init__(self, hasPsutil=True):
+        super().__init__(hasPsutil)
+        self.details = {}  # testCase -> details of the run, kept for failure notes
+
+    def printInfo(self, msg):
+        pass
+
+    def printWarning(self, msg):
+        pass
+
+    def printHeader(self, problem):
+        pass
+
+    def startTests(self, totalTests, scale=None):
+        super().startTests(totalTests, scale)
+        self.details = {}
+
+    def _startDisplay(self):
+        self.live = None
+
+    def addResult(self, testCase, success, execTime, timeout, message, memory=0, details=None, cached=False):
+        super().addResult(testCase, success, execTime, timeout, message, memory, details, cached)
+        self.details[testCase] = details or {}
+
+    def stopTests(self):
+        self.running = {}
@@ -14,3 +14,43 @@ RED    = '\033[0;31m'
 YELLOW = '\033[1;33m'
 BLUE   = '\033[0;34m'
 RESET  = '\033[0m'
+
+# Per-checkout cache for diagnostics, run history and other derived data
+CACHE_DIR = ".cache"
+
+# Starting point of every new solution (interactive `new`, companion_listen --auto)
+TEMPLATE = """\
+#include <bits/stdc++.h>
+#ifdef LOCAL
+#include "debug.cpp"
+#define TIME_BLOCK(name, t) \\
+    if (bool _once = false) \\
+    {                       \\
+    }                       \\
+    else                    \\
+        for (__DEBUG_UTIL__::LabeledTimer _t(name, t); !_once; _once = true)
+#else
+#define debug(...) void(0)
+#define debugArr(...) void(0)
+#define TIME_BLOCK(name, t) if (true)
+#endif // Debugging locally
+using namespace std;
+#define ll long long int
+#define endl "\\n"
+
+int main()
+{
+    ios_base::sync_with_stdio(false);
+    cin.tie(nullptr);
+#if defined(LOCAL) && !defined(JUDGE_PIPE)
+    freopen("input.txt", "r", stdin);
+    freopen("Output.txt", "w", stdout);
+#endif
+    int t = 1;
+    // cin >> t;
+    while (t--)
+    {
+    }
+    return 0;
+}
+"""
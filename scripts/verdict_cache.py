@@ -0,0 +1,138 @@
+"""
+Memoized test verdicts.
+A verdict is fully determined by the binary, the test's input and expected
+output, the checker and the time limit, so re-running an unchanged binary on an
+unchanged test returns the stored result instead of executing it again.
+Entries live in .cache/verdicts/ and are evicted least-recently-used once the
+directory grows past MAX_BYTES.
+"""
+import os
+import json
+import hashlib
+import threading
+
+from utils import CACHE_DIR
+
+VERDICT_DIR = os.path.join(CACHE_DIR, "verdicts")
+MAX_BYTES = 64 * 1024 * 1024
+# Bump when runTest's comparison changes so old verdicts stop matching
+CHECKER_ID = "lines-then-tokens/1"
+# Verdicts that depend on more than the key (machine load, I/O errors) are never stored
+_CACHEABLE = ("ACCEPTED", "ACCEPTED (Token)", "WRONG ANSWER", "RUNTIME ERROR")
+
+_digests = {}  # (identity, mtimeNs, size) -> hex digest
+_lock = threading.Lock()
+
+
+def _memoDigest(identity, path, chunks):
+    st = os.stat(path)
+    memoKey = (identity, st.st_mtime_ns, st.st_size)
+    with _lock:
+        digest = _digests.get(memoKey)
+    if digest is None:
+        h = hashlib.sha256()
+        for chunk in chunks():
+            h.update(chunk)
+        digest = h.hexdigest()
+        with _lock:
+            _digests[memoKey] = digest
+    return digest
+
+
+def _fileChunks(path):
+    def chunks():
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    return
+                yield chunk
+    return chunks
+
+
+def binaryDigest(executable):
+    """Content hash of the executable, recomputed only when its mtime or size changes."""
+    return _memoDigest(("bin", executable), executable, _fileChunks(executable))
+
+
+def testDigest(test):
+    """Content hash of a test's input and expected output (loose or packed)."""
+    def chunks():
+        yield from test.iterInput()
+        yield b"\0"
+        yield from test.iterOutput()
+    if test.isPacked:
+        return _memoDigest(("pack", test.packPath, test.name, tuple(test.inputMember)), test.packPath, chunks)
+    # The output file is part of the identity: replacing only the .out must miss
+    st = os.stat(test.outputPath)
+    identity = ("loose", test.inputPath, st.st_mtime_ns, st.st_size)
+    return _memoDigest(identity, test.inputPath, chunks)
+
+
+def verdictKey(executable, test, timeout):
+    h = hashlib.sha256()
+    for part in (binaryDigest(executable), testDigest(test), CHECKER_ID, repr(float(timeout))):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entryPath(key):
+    return os.path.join(VERDICT_DIR, key[:2], key + ".json")
+
+
+def lookup(key):
+    """The stored (success, message, execTime, details, memory) for a key, or None."""
+    path = _entryPath(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        # Touch for LRU: mtime is the last-used time
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry["success"], entry["message"], entry["execTime"], entry["details"], entry["memory"]
+
+
+def store(key, result):
+    success, message, execTime, details, memory = result
+    if message not in _CACHEABLE:
+        return
+    # Timelines and repeat timings describe particular runs, not the verdict
+    details = {k: v for k, v in (details or {}).items() if k not in ("timeline", "timing")}
+    path = _entryPath(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpPath = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump({"success": success, "message": message, "execTime": execTime,
+                       "details": details, "memory": memory}, f)
+        os.replace(tmpPath, path)
+    except OSError:
+        pass
+
+
+def prune(maxBytes=MAX_BYTES):
+    """Delete least-recently-used entries until the cache fits in maxBytes. Returns bytes freed."""
+    entries = []
+    total = 0
+    for root, _, files in os.walk(VERDICT_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+    freed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total - freed <= maxBytes:
+            break
+        try:
+            os.remove(path)
+            freed += size
+        except OSError:
+            pass
+    return freed
@@ -0,0 +1,121 @@
+"""
+Long-lived worker pool owned by the interactive shell.
+Keeps compile workers, test workers and a preloaded TestReporter warm across
+commands, so repeated compiles/tests in a session pay only for g++ and the
+solution itself. Background jobs (pre-builds, fetches) are tracked by label so
+the dashboard can show them and later commands can wait on them.
+"""
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import build
+import run_tests
+import test_catalog
+import tui
+
+
+class WorkerPool:
+    def __init__(self, compileWorkers=2, testWorkers=None):
+        # Tests are isolated from each other, so `test --jobs=N` can use every core
+        testWorkers = testWorkers or os.cpu_count() or 1
+        self.compileExecutor = ThreadPoolExecutor(max_workers=compileWorkers, thread_name_prefix="compile")
+        self.testExecutor = ThreadPoolExecutor(max_workers=testWorkers, thread_name_prefix="test")
+        self.fetchExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fetch")
+        self.jobs = []  # [label, future, summarize] of background jobs not yet reported as finished
+        self.reporter = tui.TestReporter(hasPsutil=run_tests._hasPsutil)
+        # Scan tests/ once up front so the first dashboard draw is free
+        test_catalog.getCatalog().refresh()
+        self._closed = False
+
+    def compile(self, src, target, debug=False, force=False, extraFlags=(), baseFlags=None):
+        """Queue a compile of src into bin/<target>. Returns a Future of build.CompileResult."""
+        return self.compileExecutor.submit(build.compileSource, src, target, debug, force, extraFlags, baseFlags)
+
+    def prebuild(self, src, target):
+        """
+        Warm the precompiled header and build src in the background, then warm the
+        debug PCH too, so the first `test` or `debug` finds everything ready.
+        """
+        def job():
+            build.warmPch(build.flagsFor(src))
+            result = build.compileSource(src, target)
+            if not self._closed:
+                self.compileExecutor.submit(build.warmPch, build.flagsFor(src, debug=True))
+            return result
+
+        def summarize(result):
+            if result.success:
+                return True, f"bin/{target} ready"
+            return False, f"compile errors (see 'compile {os.path.basename(src)}')"
+        return self.background(f"build {target}", self.compileExecutor.submit(job), summarize)
+
+    def fetch(self, fetchType, fetchId, problem):
+        """Fetch a problem's tests in a background process; its output is captured, not printed."""
+        script = "scripts/cf_fetch.py" if fetchType in ("contest", "gym", "problemset") else "scripts/fetchers.py"
+
+        def job():
+            return subprocess.run([sys.executable, script, fetchType, fetchId, problem],
+                                  capture_output=True, text=True, encoding="utf-8", errors="replace")
+
+        def summarize(result):
+            count = test_catalog.getCatalog().testCount(problem)
+            if result.returncode == 0 and count:
+                return True, f"{count} tests ready"
+            lines = re.sub(r"\x1b\[[0-9;]*m", "", result.stdout + result.stderr).strip().splitlines()
+            return False, lines[-1] if lines else f"exit code {result.returncode}"
+        return self.background(f"fetch {problem}", self.fetchExecutor.submit(job), summarize)
+
+    def background(self, label, future, summarize=None):
+        """Track a job for the dashboard; summarize(result) -> (ok, text) once it finishes."""
+        self.jobs.append([label, future, summarize])
+        return future
+
+    def jobStatus(self):
+        """
+        [(label, ok, text)] for background jobs, ok being None while running.
+        Finished jobs are reported once and then forgotten.
+        """
+        status = []
+        remaining = []
+        for label, future, summarize in self.jobs:
+            if not future.done():
+                status.append((label, None, "running"))
+                remaining.append([label, future, summarize])
+            elif future.cancelled():
+                status.append((label, False, "cancelled"))
+            elif future.exception() is not None:
+                status.append((label, False, f"failed: {future.exception()}"))
+            else:
+                ok, text = summarize(future.result()) if summarize else (True, "done")
+                status.append((label, ok, text))
+        self.jobs = remaining
+        return status
+
+    def isRunning(self, label):
+        return any(jobLabel == label and not future.done() for jobLabel, future, _ in self.jobs)
+
+    def waitFor(self, label):
+        """Block until the background jobs with this label finish (their errors surface on the dashboard)."""
+        for jobLabel, future, _ in list(self.jobs):
+            if jobLabel == label:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+
+    def runTests(self, problem, executable, **options):
+        """Run the problem's suite on the warm test workers with the shared reporter."""
+        return run_tests.runTestsForProblem(
+            problem, executable, reporter=self.reporter, executor=self.testExecutor, **options
+        )
+
+    def shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.compileExecutor.shutdown(wait=True, cancel_futures=True)
+        self.testExecutor.shutdown(wait=True, cancel_futures=True)
+        self.fetchExecutor.shutdown(wait=True, cancel_futures=True)
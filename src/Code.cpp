@@ -24,7 +24,7 @@ int main()
 {
 	ios_base::sync_with_stdio(false);
 	cin.tie(nullptr);
-#ifdef LOCAL
+#if defined(LOCAL) && !defined(JUDGE_PIPE)
 	freopen("input.txt", "r", stdin);
 	freopen("Output.txt", "w", stdout);
 #endif